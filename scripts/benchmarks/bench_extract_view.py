@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark: extract_view extractors must scale linearly.
+
+Builds a synthetic domain-context diagram with --shapes shapes: a domain
+container holding logical components (each with a data concept; half of
+them plain shapes classified by containment in the domain), adjacent
+domains outside it and two labeled flows per component. parse_drawio and
+each extractor are timed on it at every scale factor. Scanning every edge
+once per component makes the flow extractors O(shapes x edges), so the run
+fails (exit 1) if the time per shape at the largest scale exceeds the
+smallest by more than --tolerance.
+
+Usage:
+    python3 scripts/benchmarks/bench_extract_view.py
+    python3 scripts/benchmarks/bench_extract_view.py --shapes 10000 --scales 1 2
+    python3 scripts/benchmarks/bench_extract_view.py --depth 50   # deep group nesting
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import extract_view  # noqa: E402
+
+FUNCTION = "shape=mxgraph.archimate3.application;appType=func;archiType=rounded;fillColor=#99ffff"
+DATA = "shape=mxgraph.archimate3.application;appType=passive;fillColor=#99ffff"
+FLOW = "edgeStyle=orthogonalEdgeStyle;endArrow=block;dashed=1"
+
+
+def build_domain_diagram(path, shapes, depth=0):
+    """Write a domain-context diagram with roughly `shapes` vertices.
+
+    depth > 0 nests the components inside that many groups, so every
+    containment check has a long parent chain to resolve.
+    """
+    components = max(1, round(shapes / 2.1))
+    adjacent = max(1, components // 10)
+    cells = [
+        '<mxCell id="0"/><mxCell id="1" parent="0"/>',
+        f'<mxCell id="dom" value="Bench Domain" style="{FUNCTION}" vertex="1" parent="1">'
+        f'<mxGeometry x="0" y="0" width="20000" height="20000" as="geometry"/></mxCell>',
+    ]
+    parent = "dom"
+    for g in range(depth):
+        cells.append(
+            f'<mxCell id="g{g}" value="" style="group" vertex="1" connectable="0" parent="{parent}">'
+            f'<mxGeometry x="1" y="1" width="19000" height="19000" as="geometry"/></mxCell>'
+        )
+        parent = f"g{g}"
+    for i in range(components):
+        x, y = (i % 100) * 150 + 50, (i // 100) * 150 + 50
+        geometry = f'<mxGeometry x="{x}" y="{y}" width="120" height="100" as="geometry"/>'
+        if i % 2:
+            # Plain function shape: classified by containment in the domain
+            cells.append(f'<mxCell id="lc{i}" value="Component {i}" style="{FUNCTION}" '
+                         f'vertex="1" parent="{parent}">{geometry}</mxCell>')
+        else:
+            cells.append(
+                f'<object id="lc{i}" label="Component {i}" specialization="Logical Component">'
+                f'<mxCell style="{FUNCTION}" vertex="1" parent="{parent}">{geometry}</mxCell></object>'
+            )
+        cells.append(
+            f'<mxCell id="dc{i}" value="Concept {i}" style="{DATA}" vertex="1" parent="lc{i}">'
+            f'<mxGeometry x="10" y="30" width="80" height="40" as="geometry"/></mxCell>'
+        )
+    for j in range(adjacent):
+        cells.append(
+            f'<mxCell id="adj{j}" value="Adjacent domain {j}" style="{FUNCTION}" vertex="1" parent="1">'
+            f'<mxGeometry x="{25000 + j * 200}" y="0" width="150" height="100" as="geometry"/></mxCell>'
+        )
+    edge = 0
+    for i in range(components):
+        targets = [f"lc{(i + 1) % components}", f"adj{i % adjacent}"]
+        for target in targets:
+            cells.append(
+                f'<mxCell id="e{edge}" value="Event {edge}" style="{FLOW}" edge="1" parent="1" '
+                f'source="lc{i}" target="{target}"><mxGeometry relative="1" as="geometry"/></mxCell>'
+            )
+            edge += 1
+    path.write_text(
+        '<mxfile><diagram name="Bench"><mxGraphModel><root>'
+        + "".join(cells)
+        + "</root></mxGraphModel></diagram></mxfile>"
+    )
+    return components * 2 + adjacent + depth + 1
+
+
+def time_run(path, repeats):
+    """Best-of-N seconds for parse_drawio and each extractor."""
+    timings = {}
+
+    def best(label, fn):
+        runs = []
+        for _ in range(repeats):
+            gc.collect()
+            start = time.perf_counter()
+            value = fn()
+            runs.append(time.perf_counter() - start)
+        timings[label] = min(runs)
+        return value
+
+    diagram = best("parse_drawio", lambda: extract_view.parse_drawio(path))[0]
+    for view_type, extractor in extract_view.EXTRACTORS.items():
+        best(view_type, lambda: extractor(diagram, {}))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check extract_view scales linearly with diagram size")
+    parser.add_argument("--shapes", type=int, default=5000, help="Diagram shapes at the largest scale")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4],
+                        help="Divisors of --shapes to time (largest diagram = --shapes)")
+    parser.add_argument("--depth", type=int, default=0,
+                        help="Group nesting depth around the components")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per measurement (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Max allowed growth of time-per-shape from smallest to largest diagram")
+    args = parser.parse_args()
+
+    sizes = sorted(args.shapes // s for s in args.scales)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = Path(tmp) / f"bench-{size}.drawio"
+            vertices = build_domain_diagram(path, size, args.depth)
+            results.append((vertices, time_run(path, args.repeats)))
+
+    labels = list(results[0][1])
+    print(f"{'':20s}" + "".join(f"{v:>10d}" for v, _ in results) + "   shapes")
+    for label in labels:
+        print(f"  {label:18s}" + "".join(f"{t[label] * 1000:9.1f}ms" for _, t in results))
+
+    failed = []
+    for label in labels:
+        small = results[0][1][label] / results[0][0]
+        large = results[-1][1][label] / results[-1][0]
+        growth = large / small if small else 1.0
+        if growth > args.tolerance:
+            failed.append(f"{label} ({growth:.1f}x)")
+
+    print()
+    if failed:
+        print(f"FAILED - time per shape grew more than {args.tolerance:.1f}x: {', '.join(failed)}")
+        return 1
+    print(f"PASSED - all extractors within {args.tolerance:.1f}x time per shape")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
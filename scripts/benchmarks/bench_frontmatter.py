@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the header-only frontmatter reader against python-frontmatter.
+
+Builds a synthetic registry of N Markdown files (YAML header plus a
+multi-KB body of prose and a mermaid diagram) in a temp directory and
+times metadata extraction with:
+
+  - frontmatter.load                  (python-frontmatter, whole file)
+  - read_frontmatter, CSafeLoader      (header only, libyaml)
+  - read_frontmatter, SafeLoader       (header only, pure Python)
+
+Usage:
+    python3 scripts/benchmarks/bench_frontmatter.py
+    python3 scripts/benchmarks/bench_frontmatter.py --files 10000 --body-kb 8
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import frontmatter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from registry_core import read_frontmatter  # noqa: E402
+
+HEADER = """---
+type: component
+name: Synthetic Component {i}
+description: Generated element {i} for benchmarking the registry loader.
+owner: Team {team}
+status: active
+domain: domain-{domain}
+sourcing: in-house
+owns_data_aggregates:
+  - Aggregate {i}a
+  - Aggregate {i}b
+realized_by_software_systems:
+  - System {i}
+---
+"""
+
+PARAGRAPH = ("The component coordinates lifecycle events across bounded contexts, "
+             "publishing integration events and maintaining read models. ")
+
+DIAGRAM = """
+```mermaid
+flowchart LR
+  A[Client] --> B[Gateway] --> C[Service] --> D[(Store)]
+```
+"""
+
+
+def build_registry(root, files, body_kb):
+    """Write a synthetic registry of `files` entries under root."""
+    paragraph_count = max(1, (body_kb * 1024) // len(PARAGRAPH))
+    body = "\n# Overview\n\n" + "\n\n".join([PARAGRAPH] * paragraph_count) + DIAGRAM
+    paths = []
+    for i in range(files):
+        folder = root / "application" / f"type-{i % 10}"
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"component-{i}.md"
+        path.write_text(HEADER.format(i=i, team=i % 7, domain=i % 12) + body)
+        paths.append(path)
+    return paths
+
+
+def time_it(label, paths, load):
+    start = time.perf_counter()
+    names = [load(p).metadata["name"] for p in paths]
+    elapsed = time.perf_counter() - start
+    print(f"  {label:38s} {elapsed:7.3f}s  ({elapsed / len(paths) * 1e6:6.1f} us/file)")
+    return elapsed, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark frontmatter readers")
+    parser.add_argument("--files", type=int, default=10000, help="Number of registry files")
+    parser.add_argument("--body-kb", type=int, default=8, help="Markdown body size per file (KB)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"Building synthetic registry: {args.files} files, ~{args.body_kb} KB bodies...")
+        paths = build_registry(Path(tmp), args.files, args.body_kb)
+
+        print("\nMetadata extraction:")
+        baseline, expected = time_it("python-frontmatter (frontmatter.load)", paths, frontmatter.load)
+        fast, names_fast = time_it("read_frontmatter (CSafeLoader)", paths,
+                                   lambda p: read_frontmatter(p, use_libyaml=True))
+        slow, names_slow = time_it("read_frontmatter (SafeLoader)", paths,
+                                   lambda p: read_frontmatter(p, use_libyaml=False))
+
+        if names_fast != expected or names_slow != expected:
+            print("\nERROR: readers disagree on parsed metadata")
+            return 1
+
+        print(f"\nSpeedup vs python-frontmatter: {baseline / fast:.1f}x (CSafeLoader), "
+              f"{baseline / slow:.1f}x (SafeLoader)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
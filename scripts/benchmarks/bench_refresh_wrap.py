@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark: wrapping plain mxCells must scale linearly.
+
+Builds a legacy diagram of --shapes plain vertex mxCells (all matching a
+synthetic registry of the same size, half of them by a differently cased
+label) chained by edges, and times refresh_diagram(wrap_cells=True) on a
+fresh copy at every scale factor. Any per-cell scan of the registry or
+the cell list makes the pass quadratic, so the run fails (exit 1) if the
+time per shape at the largest scale exceeds the smallest by more than
+--tolerance. Every run also checks that ids and edge endpoints survived.
+
+Usage:
+    python3 scripts/benchmarks/bench_refresh_wrap.py
+    python3 scripts/benchmarks/bench_refresh_wrap.py --shapes 40000 --scales 1 4
+    python3 scripts/benchmarks/bench_refresh_wrap.py --compressed
+"""
+
+import argparse
+import gc
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import refresh_diagrams  # noqa: E402
+
+
+def build_registry(shapes):
+    return {f"System {i}": {"file": f"system-{i}.md", "owner": f"Team {i % 7}", "sourcing": "build"}
+            for i in range(shapes)}
+
+
+def build_model(shapes):
+    """mxGraphModel XML with `shapes` plain vertices and an edge between neighbours."""
+    cells = ['<mxCell id="0"/><mxCell id="1" parent="0"/>']
+    for i in range(shapes):
+        label = f"System {i}" if i % 2 else f"SYSTEM  {i}"
+        cells.append(
+            f'<mxCell id="v{i}" value="{label}" style="rounded=1" vertex="1" parent="1">'
+            f'<mxGeometry x="{i % 100 * 150}" y="{i // 100 * 100}" width="120" height="60" as="geometry"/>'
+            f'</mxCell>'
+        )
+        if i:
+            cells.append(
+                f'<mxCell id="e{i}" style="endArrow=block" edge="1" parent="1" '
+                f'source="v{i - 1}" target="v{i}"><mxGeometry relative="1" as="geometry"/></mxCell>'
+            )
+    return "<mxGraphModel><root>" + "".join(cells) + "</root></mxGraphModel>"
+
+
+def write_diagram(path, model, compressed):
+    content = refresh_diagrams.encode_diagram_content(model) if compressed else model
+    path.write_text(f'<mxfile><diagram name="Legacy">{content}</diagram></mxfile>')
+
+
+def check_wrapped(path, shapes, compressed):
+    """Every vertex is now an object with its original id; edges are untouched."""
+    diagram = ET.parse(path).getroot().find("diagram")
+    model = ET.fromstring(refresh_diagrams.decode_diagram_content(diagram.text)) if compressed else diagram
+    objects = {o.get("id") for o in model.iter("object")}
+    edges = [c for c in model.iter("mxCell") if c.get("edge") == "1"]
+    if objects != {f"v{i}" for i in range(shapes)}:
+        return "wrapped ids do not match the original vertices"
+    if any(e.get("source") not in objects or e.get("target") not in objects for e in edges):
+        return "an edge lost its source or target"
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check --wrap-plain-cells scales linearly")
+    parser.add_argument("--shapes", type=int, default=20000, help="Plain shapes at the largest scale")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4],
+                        help="Divisors of --shapes to time (largest diagram = --shapes)")
+    parser.add_argument("--compressed", action="store_true", help="Store the tab in compressed form")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Max allowed growth of time-per-shape from smallest to largest diagram")
+    args = parser.parse_args()
+
+    sizes = sorted(args.shapes // s for s in args.scales)
+    per_shape = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            registry = build_registry(size)
+            model = build_model(size)
+            path = Path(tmp) / f"legacy-{size}.drawio"
+            best = None
+            for _ in range(args.repeats):
+                write_diagram(path, model, args.compressed)
+                gc.collect()
+                start = time.perf_counter()
+                result = refresh_diagrams.refresh_diagram(path, registry, wrap_cells=True)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+            problem = check_wrapped(path, size, args.compressed)
+            if problem or len(result["updates"]) != size:
+                print(f"FAILED - {size} shapes: {problem or 'not every shape was wrapped'}")
+                return 1
+            per_shape.append(best / size)
+            print(f"  {size:7d} shapes  {best:7.3f}s  ({best / size * 1e6:6.1f} us/shape)")
+
+    growth = per_shape[-1] / per_shape[0]
+    print(f"\nTime per shape grew {growth:.2f}x (tolerance {args.tolerance:.1f}x)")
+    if growth > args.tolerance:
+        print("FAILED - wrapping plain cells grows faster than linearly")
+        return 1
+    print("PASSED - wrapping plain cells scales linearly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs parallel registry scans.
+
+Builds a synthetic registry (see bench_frontmatter.build_registry) and
+times registry_core.load_registry with the on-disk cache disabled, for
+each requested worker count.
+
+Usage:
+    python3 scripts/benchmarks/bench_registry_scan.py
+    python3 scripts/benchmarks/bench_registry_scan.py --files 20000 --jobs 1 8 32
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import registry_core  # noqa: E402
+from bench_frontmatter import build_registry  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel registry scans")
+    parser.add_argument("--files", type=int, default=20000, help="Number of registry files")
+    parser.add_argument("--body-kb", type=int, default=4, help="Markdown body size per file (KB)")
+    parser.add_argument("--jobs", type=int, nargs="+",
+                        default=sorted({1, 2, 4, registry_core.default_jobs()}),
+                        help="Worker counts to compare")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "registry"
+        print(f"Building synthetic registry: {args.files} files, ~{args.body_kb} KB bodies...")
+        build_registry(root, args.files, args.body_kb)
+
+        print("\nload_registry(use_cache=False):")
+        baseline = None
+        expected = None
+        for jobs in args.jobs:
+            start = time.perf_counter()
+            registry = registry_core.load_registry(root, use_cache=False, jobs=jobs, quiet=True)
+            elapsed = time.perf_counter() - start
+            names = [e["name"] for e in registry]
+            if expected is None:
+                expected = names
+            elif names != expected:
+                print(f"\nERROR: --jobs {jobs} returned a different element order")
+                return 1
+            baseline = baseline or elapsed
+            print(f"  jobs={jobs:<3d} {elapsed:7.3f}s  speedup {baseline / elapsed:5.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Regression benchmark: validation time must grow linearly with model size.
+
+For each scale factor k, builds a synthetic registry of k * --registry
+elements and a diagram of k * --shapes shapes in which every shape is
+unregistered or registered in the wrong layer — the worst case for error
+reporting. A per-error scan of the registry makes validation
+O(shapes x registry), i.e. quadratic in k. validate.validate() is timed
+at each scale (registry memo warm) and the run fails (exit 1) if the time
+per unit of input at the largest scale exceeds the smallest by more than
+--tolerance. Every cache validate() writes is kept inside the temporary
+model, so nothing is left in the checkout's .cache/.
+
+Usage:
+    python3 scripts/benchmarks/bench_validate_scaling.py
+    python3 scripts/benchmarks/bench_validate_scaling.py --registry 5000 --shapes 2000 --scales 1 4
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import drawio_io  # noqa: E402
+import validate  # noqa: E402
+
+
+def build_registry(root, count):
+    folder = root / "registry" / "technology" / "nodes"
+    folder.mkdir(parents=True)
+    for i in range(count):
+        (folder / f"node-{i}.md").write_text(f"---\nname: Element {i}\n---\n")
+
+
+def build_diagram(path, shapes):
+    """One tab of application shapes; even ones are registered as technology."""
+    cells = []
+    for i in range(shapes):
+        name = f"Element {i}" if i % 2 == 0 else f"Missing {i}"
+        cells.append(
+            f'<mxCell id="c{i}" value="{name}" '
+            f'style="shape=mxgraph.archimate3.application;appType=comp" vertex="1" parent="1">'
+            f'<mxGeometry x="{i % 100 * 10}" y="{i // 100 * 10}" width="10" height="10" as="geometry"/>'
+            f'</mxCell>'
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        '<mxfile><diagram name="Bench"><mxGraphModel><root>'
+        '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+        + "".join(cells)
+        + "</root></mxGraphModel></diagram></mxfile>"
+    )
+
+
+def time_validate(repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        validate.validate(use_cache=True, jobs=1)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check validate.py scales linearly with model size")
+    parser.add_argument("--registry", type=int, default=2500, help="Registry elements at scale 1")
+    parser.add_argument("--shapes", type=int, default=1000, help="Diagram shapes at scale 1")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Scale factors applied to both registry and diagram")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per scale (best is kept)")
+    parser.add_argument("--tolerance", type=float, default=2.0,
+                        help="Max allowed growth of time-per-unit from smallest to largest scale")
+    args = parser.parse_args()
+
+    print("validate(): registry + diagram size vs time")
+    per_unit = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for k in args.scales:
+            root = Path(tmp) / f"scale-{k}"
+            registry_count = args.registry * k
+            shapes = args.shapes * k
+            build_registry(root, registry_count)
+
+            validate.REPO_ROOT = root
+            validate.REGISTRY_DIR = root / "registry"
+            validate.VIEWS_DIR = root / "views"
+            drawio_io.CACHE_DIR = root / ".cache" / "drawio"
+            build_diagram(validate.VIEWS_DIR / "bench-domain" / "landscape.drawio", shapes)
+
+            time_validate(1)  # warm the in-process registry memo
+            elapsed = time_validate(args.repeats)
+            units = registry_count + shapes
+            per_unit.append(elapsed / units)
+            print(f"  x{k:<3d} {registry_count:7d} elements, {shapes:6d} shapes  "
+                  f"{elapsed:7.3f}s  ({elapsed / units * 1e6:6.1f} us/unit)")
+
+    growth = per_unit[-1] / per_unit[0]
+    print(f"\nTime per unit grew {growth:.2f}x from x{args.scales[0]} to x{args.scales[-1]} "
+          f"(tolerance {args.tolerance:.1f}x)")
+    if growth > args.tolerance:
+        print("FAILED - validation time grows faster than linearly with model size")
+        return 1
+    print("PASSED - validation time grows linearly with model size")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
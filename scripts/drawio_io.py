@@ -0,0 +1,221 @@
+"""
+Shared draw.io file I/O.
+
+A <diagram> tab stores its mxGraphModel either inline or, in draw.io's
+default "compressed" form, as text: the model XML deflated (raw, no zlib
+header), base64-encoded and URL-encoded. This module decodes both forms
+for extract_view.py, validate.py and refresh_diagrams.py.
+
+Decoded tab XML is cached by the SHA-256 of the encoded payload, in
+memory for the current process and as files under .cache/drawio/, so a
+tab is inflated once no matter how many tools read it. Entries are
+content-addressed: an edited tab has a new hash, so nothing goes stale,
+but old versions pile up. Both caches are therefore capped and evict the
+least recently used entries: the memory cache at MEMO_MAX_BYTES, the disk
+cache at CACHE_MAX_BYTES (hits refresh a file's mtime).
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import urllib.parse
+import xml.etree.ElementTree as ET
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+from registry_core import write_atomically
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# On-disk cache of decoded tabs; set to None to keep the cache in memory only
+CACHE_DIR: Path | None = REPO_ROOT / ".cache" / "drawio"
+
+# Size cap of the on-disk cache; pruning evicts down to CACHE_PRUNE_TO of it
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_PRUNE_TO = 0.75
+
+# Size cap of the in-memory cache, counted in characters of decoded XML
+MEMO_MAX_BYTES = 32 * 1024 * 1024
+
+# Decoded XML (or None if the payload is not a compressed model) by content
+# hash, least recently used first, and the total size of its values
+_DECODED: OrderedDict[str, str | None] = OrderedDict()
+_memo = {"bytes": 0}
+
+stats = {"inflated": 0, "memory_hits": 0, "disk_hits": 0}
+
+# Bytes written to the disk cache since it was last pruned (None: not yet
+# pruned in this process). The directory is only rescanned after the
+# first write or once a share of the cap has been written since.
+_disk = {"written": None}
+
+
+def content_hash(encoded: str) -> str:
+    """SHA-256 hex digest of an encoded tab payload."""
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _remember(digest: str, xml_str: str | None):
+    """Add a decoded payload to the memory cache, evicting the oldest entries."""
+    if digest in _DECODED:
+        _DECODED.move_to_end(digest)
+        return
+    _DECODED[digest] = xml_str
+    _memo["bytes"] += len(digest) + len(xml_str or "")
+    while _memo["bytes"] > MEMO_MAX_BYTES and len(_DECODED) > 1:
+        old_digest, old_xml = _DECODED.popitem(last=False)
+        _memo["bytes"] -= len(old_digest) + len(old_xml or "")
+
+
+def _inflate(encoded: str) -> str:
+    """Decode draw.io's compressed form; raises on anything else."""
+    # URL decode, base64 decode, then raw deflate
+    decoded_bytes = base64.b64decode(urllib.parse.unquote(encoded))
+    return zlib.decompress(decoded_bytes, -zlib.MAX_WBITS).decode("utf-8")
+
+
+def inflate(encoded: str) -> str | None:
+    """Return the XML of a compressed tab payload, or None if it is not one."""
+    encoded = encoded.strip()
+    digest = content_hash(encoded)
+    if digest in _DECODED:
+        stats["memory_hits"] += 1
+        _DECODED.move_to_end(digest)
+        return _DECODED[digest]
+
+    cache_dir = CACHE_DIR
+    cached = cache_dir / f"{digest}.xml" if cache_dir else None
+    if cached is not None:
+        try:
+            xml_str = cached.read_text(encoding="utf-8")
+            os.utime(cached)  # mark as recently used for pruning
+            stats["disk_hits"] += 1
+            _remember(digest, xml_str)
+            return xml_str
+        except OSError:
+            pass
+
+    try:
+        xml_str = _inflate(encoded)
+    except Exception:
+        _remember(digest, None)
+        return None
+    stats["inflated"] += 1
+    _remember(digest, xml_str)
+
+    if cached is not None:
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            write_atomically(cached, xml_str)
+            written = (_disk["written"] or 0) + cached.stat().st_size
+            if _disk["written"] is None or written > CACHE_MAX_BYTES * (1 - CACHE_PRUNE_TO):
+                prune_cache(cache_dir)
+            else:
+                _disk["written"] = written
+        except OSError:
+            # The cache is an optimisation; a read-only checkout still works
+            pass
+    return xml_str
+
+
+def prune_cache(cache_dir: Path | None = None, max_bytes: int | None = None) -> int:
+    """Evict least recently used decoded tabs once the cache exceeds max_bytes.
+
+    Files are removed oldest mtime first until the total is at most
+    CACHE_PRUNE_TO of the cap. Returns the number of files removed.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    _disk["written"] = 0
+    if cache_dir is None:
+        return 0
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".xml"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return 0
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    target = max_bytes * CACHE_PRUNE_TO
+    for _, size, path in sorted(entries):
+        if total <= target:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue  # already evicted by a concurrent run
+        total -= size
+        removed += 1
+    return removed
+
+
+def deflate(xml_str: str) -> str:
+    """Encode tab XML in draw.io's compressed form.
+
+    The result is remembered so decoding it again in this process is free.
+    """
+    compressed = zlib.compress(xml_str.encode("utf-8"), 9)
+    # Remove zlib header (first 2 bytes) and checksum (last 4 bytes)
+    b64 = base64.b64encode(compressed[2:-4]).decode("utf-8")
+    encoded = urllib.parse.quote(b64, safe="")
+    _remember(content_hash(encoded), xml_str)
+    return encoded
+
+
+def decode_diagram_content(encoded: str) -> str:
+    """Decode draw.io's compressed diagram content (input returned as-is if not encoded)."""
+    xml_str = inflate(encoded)
+    return encoded if xml_str is None else xml_str
+
+
+def encode_diagram_content(xml_str: str) -> str:
+    """Encode diagram content back to draw.io's compressed format."""
+    try:
+        return deflate(xml_str)
+    except Exception as e:
+        print(f"  WARNING: Could not encode diagram: {e}")
+        return xml_str
+
+
+def is_compressed(diagram: ET.Element) -> bool:
+    """True if a <diagram> tab holds its model as compressed text."""
+    return bool(diagram.text and diagram.text.strip()) and diagram.find("mxGraphModel") is None
+
+
+def tab_model(diagram: ET.Element) -> ET.Element | None:
+    """The mxGraphModel of a <diagram> tab, inline or decompressed.
+
+    Compressed tabs are parsed into a fresh tree on every call, so callers
+    may modify it. Returns None for an empty or undecodable tab.
+    """
+    model = diagram.find(".//mxGraphModel")
+    if model is not None or not is_compressed(diagram):
+        return model
+    xml_str = inflate(diagram.text)
+    if xml_str is None:
+        return None
+    try:
+        root = ET.fromstring(xml_str)
+    except ET.ParseError:
+        return None
+    return root if root.tag == "mxGraphModel" else root.find(".//mxGraphModel")
+
+
+def clear_memo():
+    """Forget decoded payloads held in memory (tests, long-running watchers)."""
+    _DECODED.clear()
+    _memo["bytes"] = 0
+    _disk["written"] = None
+    for key in stats:
+        stats[key] = 0
@@ -17,19 +17,40 @@ Usage:
     python3 scripts/extract_view.py <path-to.drawio>
     python3 scripts/extract_view.py <path-to.drawio> --type domain-context
     python3 scripts/extract_view.py <path-to.drawio> --output /custom/path.yaml
-
-Output is written next to the .drawio file as <filename>.extracted.yaml
+    python3 scripts/extract_view.py <path-to.drawio> --verbose   # show detection features
+    python3 scripts/extract_view.py --all views/ [-j 4]    # batch mode
+    python3 scripts/extract_view.py 'views/*/context*.drawio' other.drawio
+
+Output is written next to the .drawio file as <filename>.extracted.yaml,
+and only when its content changed. Batch mode loads the domain reference
+once (per worker process) and ends with a summary report.
+
+Each output starts with a stamp comment recording the source hash,
+EXTRACTOR_VERSION, the reference file hash and the view type; when all
+match, the file is not re-extracted (--force overrides). The YAML also
+carries a provenance block (source file, hash, lines, bytes, tabs).
+
+Only the YAML body decides whether an output is rewritten: when a new
+reference or extractor version re-extracts a file to the same body, the
+file is left alone and its new stamp is recorded under .cache/extract_view/.
 """
 
 import argparse
+import glob
+import hashlib
 import re
 import sys
+import time
 import xml.etree.ElementTree as ET
-from collections import defaultdict
+from collections import Counter, defaultdict
+from operator import itemgetter
 from pathlib import Path
 
 import yaml
 
+import drawio_io
+from registry_core import file_sha256, pool_size, run_jobs, write_atomically
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 DEFAULT_REFERENCE = REPO_ROOT / "domains" / "example" / "domain-reference.yaml"
 
@@ -38,15 +59,31 @@ DEFAULT_REFERENCE = REPO_ROOT / "domains" / "example" / "domain-reference.yaml"
 # XML parsing helpers
 # ---------------------------------------------------------------------------
 
-def parse_drawio(file_path):
-    """Parse a .drawio file and return list of diagrams with elements and edges."""
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+def source_stats(data):
+    """Line count, byte size and SHA-256 of a source file's raw bytes."""
+    # Same count as iterating the file in text mode (universal newlines)
+    lines = data.count(b"\n") + data.count(b"\r") - data.count(b"\r\n")
+    if data and not data.endswith((b"\n", b"\r")):
+        lines += 1
+    return {"lines": lines, "bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+
+
+def parse_drawio(file_path, stats=None):
+    """Parse a .drawio file and return list of diagrams with elements and edges.
+
+    The file is read once. If a stats dict is given, it is filled with the
+    file's lines, bytes, sha256, parsed tab count and parse_seconds.
+    """
+    start = time.perf_counter()
+    with open(file_path, "rb") as f:
+        data = f.read()
+    root = ET.fromstring(data)
     diagrams = []
 
     for diagram in root.findall(".//diagram"):
         tab_name = diagram.get("name", "Page-1")
-        model = diagram.find(".//mxGraphModel")
+        # Inline model, or draw.io's default compressed tab content
+        model = drawio_io.tab_model(diagram)
         if model is None:
             continue
 
@@ -117,8 +154,12 @@ def parse_drawio(file_path):
             "tab_name": tab_name,
             "cells": cells,
             "edges": edges,
+            "edge_index": build_edge_index(cells, edges),
         })
 
+    if stats is not None:
+        stats.update(source_stats(data), tabs=len(diagrams),
+                     parse_seconds=time.perf_counter() - start)
     return diagrams
 
 
@@ -240,56 +281,136 @@ def get_edge_type(style):
 # Domain reference loading
 # ---------------------------------------------------------------------------
 
-def load_domain_reference(ref_path):
-    """Load domain reference YAML for enrichment."""
+def load_domain_reference(ref_path, quiet=False):
+    """Load domain reference YAML for enrichment, with its lookup index built.
+
+    Conflicting or duplicate labels/aliases are reported as warnings
+    unless quiet (batch workers, whose parent reports them once).
+    """
     if not ref_path or not Path(ref_path).exists():
         return None
     with open(ref_path) as f:
-        return yaml.safe_load(f)
+        ref = yaml.safe_load(f)
+    if isinstance(ref, dict) and not quiet:
+        report_reference_issues(ref_path, ref)
+    return ref
+
+
+def report_reference_issues(ref_path, ref):
+    """Print the reference's conflicting or duplicate labels as warnings."""
+    for issue in get_reference_index(ref)["issues"] if ref else ():
+        print(f"  WARNING: {Path(ref_path).name}: {issue}")
+
+
+def _component_enrichment(lc):
+    desc = lc.get("description") or ""
+    result = {"type": "component", "description": desc.strip()}
+    if lc.get("sourcing"):
+        result["sourcing"] = lc["sourcing"]
+    if lc.get("sub_components"):
+        result["sub_components"] = lc["sub_components"]
+    return result
+
+
+def _group_enrichment(dc):
+    return {
+        "type": "data_concept",
+        "identifier": dc.get("identifier"),
+        "logical_component": dc.get("logical_component"),
+        "aggregates": dc.get("data_aggregates", []),
+    }
+
+
+def _aggregate_enrichment(dc):
+    return {
+        "type": "data_concept",
+        "group": dc.get("name"),
+        "group_identifier": dc.get("identifier"),
+        "logical_component": dc.get("logical_component"),
+    }
+
+
+def _boundary_enrichment(ib):
+    return {
+        "type": "integration_boundary",
+        "partner_api": ib.get("partner_api"),
+        "external_partners": ib.get("external_partners", []),
+    }
+
+
+def build_reference_index(ref):
+    """Compile a domain reference into a label -> enrichment map.
+
+    Labels are registered in the order enrich_element has always searched
+    (logical components, data concept groups with their aggregates,
+    integration boundaries), so when two entries claim the same label the
+    first one wins. Such conflicts, and labels repeated within one entry,
+    are collected in "issues".
+    """
+    lookup = {}
+    owners = {}
+    issues = []
+
+    def add(label, owner, enrichment):
+        if not isinstance(label, str):
+            return
+        if label not in lookup:
+            lookup[label] = enrichment
+            owners[label] = owner
+        elif owners[label] == owner:
+            issues.append(f"'{label}' is listed more than once for {owner}")
+        else:
+            issues.append(f"'{label}' is claimed by both {owners[label]} and {owner}; "
+                          f"using {owners[label]}")
+
+    for lc in ref.get("logical_components") or []:
+        owner = f"logical component '{lc.get('name')}'"
+        enrichment = _component_enrichment(lc)
+        for label in [lc.get("name")] + (lc.get("aliases") or []):
+            add(label, owner, enrichment)
+
+    for dc in ref.get("data_concept_groups") or []:
+        owner = f"data concept group '{dc.get('name')}'"
+        add(dc.get("name"), owner, _group_enrichment(dc))
+        aggregate = _aggregate_enrichment(dc)
+        for label in dc.get("data_aggregates") or []:
+            add(label, owner, aggregate)
+
+    for ib in ref.get("integration_boundaries") or []:
+        owner = f"integration boundary '{ib.get('name')}'"
+        enrichment = _boundary_enrichment(ib)
+        for label in [ib.get("name")] + (ib.get("aliases") or []):
+            add(label, owner, enrichment)
+
+    return {"lookup": lookup, "issues": issues}
+
+
+# Lookup indexes of recently used references: id(ref) -> (ref, index). The
+# ref is held so its id cannot be reused while the entry exists.
+_REF_INDEX = {}
+_REF_INDEX_MAX = 4
+
+
+def get_reference_index(ref):
+    """The reference's lookup index, built on first use.
+
+    The index is memoized beside the reference, which is left unmodified.
+    """
+    entry = _REF_INDEX.get(id(ref))
+    if entry is None or entry[0] is not ref:
+        if len(_REF_INDEX) >= _REF_INDEX_MAX:
+            del _REF_INDEX[next(iter(_REF_INDEX))]
+        entry = _REF_INDEX[id(ref)] = (ref, build_reference_index(ref))
+    return entry[1]
 
 
 def enrich_element(label, ref):
     """Look up an element in the domain reference and return enrichment data."""
     if not ref:
         return None
-
-    # Check logical components
-    for lc in ref.get("logical_components", []):
-        names = [lc["name"]] + lc.get("aliases", [])
-        if label in names:
-            desc = lc.get("description") or ""
-            result = {"type": "component", "description": desc.strip()}
-            if lc.get("sourcing"):
-                result["sourcing"] = lc["sourcing"]
-            if lc.get("sub_components"):
-                result["sub_components"] = lc["sub_components"]
-            return result
-
-    # Check data concept groups
-    for dc in ref.get("data_concept_groups", []):
-        if label == dc["name"] or label in dc.get("data_aggregates", []):
-            result = {"type": "data_concept"}
-            if label == dc["name"]:
-                result["identifier"] = dc.get("identifier")
-                result["logical_component"] = dc.get("logical_component")
-                result["aggregates"] = dc.get("data_aggregates", [])
-            else:
-                result["group"] = dc["name"]
-                result["group_identifier"] = dc.get("identifier")
-                result["logical_component"] = dc.get("logical_component")
-            return result
-
-    # Check integration boundaries
-    for ib in ref.get("integration_boundaries", []):
-        names = [ib["name"]] + ib.get("aliases", [])
-        if label in names:
-            return {
-                "type": "integration_boundary",
-                "partner_api": ib.get("partner_api"),
-                "external_partners": ib.get("external_partners", []),
-            }
-
-    return None
+    enrichment = get_reference_index(ref)["lookup"].get(label)
+    # Callers extend the result, so hand out a copy
+    return dict(enrichment) if enrichment else None
 
 
 # ---------------------------------------------------------------------------
@@ -308,6 +429,120 @@ def build_containment_tree(cells):
     return children_of
 
 
+def build_layout_index(cells):
+    """Memo tables for parent-chain lookups in one diagram.
+
+    "ancestors" maps a container id to {parent id: whether walking up from
+    that parent reaches the container}. "offsets" maps a parent id to the
+    summed geometry of that parent and its positioned ancestors. Both are
+    filled on demand by _reaches() / _chain_offset(): each link of a chain
+    is resolved once and shared by every cell below it, so repeated
+    containment and position checks cost O(1) amortized instead of
+    O(depth) each.
+    """
+    return {"cells": cells, "ancestors": defaultdict(dict), "offsets": {}}
+
+
+def get_layout_index(diagram):
+    """The diagram's layout index, built on first use."""
+    if "layout_index" not in diagram:
+        diagram["layout_index"] = build_layout_index(diagram["cells"])
+    return diagram["layout_index"]
+
+
+def _reaches(parent_id, ancestor_id, layout):
+    """Whether walking up the parent chain from parent_id reaches ancestor_id."""
+    cells = layout["cells"]
+    memo = layout["ancestors"][ancestor_id]
+    path = []
+    on_path = set()
+    current = parent_id
+    while True:
+        if current in memo:
+            found = memo[current]
+            break
+        if not current or current in ("0", "1"):
+            found = False
+            break
+        if current == ancestor_id:
+            found = True
+            break
+        if current in on_path or current not in cells:
+            # A parent cycle or a dangling parent id ends the walk
+            found = False
+            break
+        path.append(current)
+        on_path.add(current)
+        current = cells[current]["parent"]
+    for pid in path:
+        memo[pid] = found
+    return found
+
+
+def _chain_offset(parent_id, layout):
+    """Summed x, y of parent_id and its ancestors, stopping at the first without geometry."""
+    cells = layout["cells"]
+    memo = layout["offsets"]
+    path = []
+    on_path = set()
+    current = parent_id
+    while current not in memo:
+        cell = cells.get(current)
+        if not current or current in ("0", "1") or not cell or not cell.get("geometry"):
+            base = (0, 0)
+            break
+        if current in on_path:
+            # Parent cycle: positions depend on where the walk starts, so
+            # fall back to the uncached walk
+            return None
+        path.append(current)
+        on_path.add(current)
+        current = cell["parent"]
+    else:
+        base = memo[current]
+    x, y = base
+    for pid in reversed(path):
+        geo = cells[pid]["geometry"]
+        x, y = geo["x"] + x, geo["y"] + y
+        memo[pid] = (x, y)
+    return x, y
+
+
+def build_edge_index(cells, edges):
+    """Build a per-diagram adjacency index over edges.
+
+    "links" has one entry per edge, in order, with endpoint ids and labels
+    resolved once (label None when the endpoint cell does not exist).
+    "outgoing" / "incoming" map a cell id to the positions of the links
+    it is the source / target of, so per-cell flow lookups touch only that
+    cell's edges instead of scanning the whole diagram.
+    """
+    links = []
+    outgoing = defaultdict(list)
+    incoming = defaultdict(list)
+    for pos, edge in enumerate(edges):
+        source = edge.get("source", "")
+        target = edge.get("target", "")
+        links.append({
+            "edge": edge,
+            "source": source,
+            "target": target,
+            "label": edge.get("label", ""),
+            "source_label": cells[source]["label"] if source in cells else None,
+            "target_label": cells[target]["label"] if target in cells else None,
+        })
+        outgoing[source].append(pos)
+        incoming[target].append(pos)
+    return {"links": links, "outgoing": dict(outgoing), "incoming": dict(incoming)}
+
+
+def get_edge_index(diagram):
+    """The diagram's edge index, built on first use for hand-built diagram dicts."""
+    if "edge_index" not in diagram:
+        diagram["edge_index"] = build_edge_index(diagram["cells"], diagram["edges"])
+    return diagram["edge_index"]
+
+
 def resolve_label(cell_id, cells):
     """Get the display label for a cell, checking group children if needed."""
     cell = cells.get(cell_id)
@@ -323,45 +558,85 @@ def resolve_label(cell_id, cells):
 # View type detection
 # ---------------------------------------------------------------------------
 
-def detect_view_type(diagram):
-    """Auto-detect the view type from diagram content."""
-    cells = diagram["cells"]
-    styles = [c["style"] for c in cells.values()]
-    labels = [c["label"].lower() for c in cells.values()]
-    all_styles = " ".join(styles)
+SECURITY_KEYWORDS = ["trust boundary", "untrusted", "dmz", "pii", "gdpr",
+                     "data classification", "security zone", "waf",
+                     "authentication", "authorization"]
+
+# Style substrings counted per cell: feature name -> substring
+_STYLE_FEATURES = {
+    "archimate": "mxgraph.archimate3",
+    "functions": "appType=func",
+    "interfaces": "appType=interface",
+    "data_objects": "appType=passive",
+    "composition": "startArrow=diamondThin",
+    "generalization": "endArrow=block;endFill=0",
+    "dashed": "dashed",
+}
+
+
+def view_type_features(diagram):
+    """Count every view-type indicator in one pass over the cells.
 
+    Styles repeat heavily, so each distinct style is inspected once and
+    weighted by its cell count. Labels are scanned as one newline-joined
+    string, which keeps keyword matches within a single label.
+    """
+    cells = diagram["cells"].values()
+    features = {"cells": len(cells)}
+
+    styles = Counter(map(itemgetter("style"), cells))
+    for name in _STYLE_FEATURES:
+        features[name] = 0
+    for style, count in styles.items():
+        for name, needle in _STYLE_FEATURES.items():
+            if needle in style:
+                features[name] += count
+
+    labels = "\n".join(map(itemgetter("label"), cells)).lower()
+    features["dc_markers"] = labels.count("[dc]")
+    features["rm_markers"] = labels.count("(rm)")
+    features["security_keywords"] = [kw for kw in SECURITY_KEYWORDS if kw in labels]
+    return features
+
+
+def classify_view_type(features):
+    """Pick a view type from view_type_features() output."""
     # Security indicators
-    security_keywords = ["trust boundary", "untrusted", "dmz", "pii", "gdpr",
-                         "data classification", "security zone", "waf",
-                         "authentication", "authorization"]
-    if any(kw in " ".join(labels) for kw in security_keywords):
+    if features["security_keywords"]:
         return "security"
 
     # Data aggregate indicators
-    if any("[dc]" in l for l in labels) or any("(rm)" in l for l in labels):
+    if features["dc_markers"] or features["rm_markers"]:
         return "data-aggregate"
 
-    # Data architecture indicators (UML relationships without containment)
-    has_composition = "startArrow=diamondThin" in all_styles
-    has_generalization = "endArrow=block;endFill=0" in all_styles and "dashed" not in all_styles
-    if has_composition or has_generalization:
-        archimate_count = sum(1 for s in styles if "mxgraph.archimate3" in s)
-        if archimate_count > 0 and has_composition:
-            return "data-architecture"
+    # Data architecture indicators (UML composition between ArchiMate shapes)
+    if features["composition"] and features["archimate"]:
+        return "data-architecture"
 
     # Domain context indicators
-    has_functions = sum(1 for s in styles if "appType=func" in s)
-    has_interfaces = sum(1 for s in styles if "appType=interface" in s)
-    has_data_objects = sum(1 for s in styles if "appType=passive" in s)
-    if has_functions >= 3 and has_interfaces >= 1:
+    if features["functions"] >= 3 and features["interfaces"] >= 1:
         return "domain-context"
 
     # Default
-    if "mxgraph.archimate3" in all_styles:
+    if features["archimate"]:
         return "domain-context"
     return "generic"
 
 
+def format_features(features):
+    """One-line rendering of a feature vector for --verbose output."""
+    parts = [f"{name}={value}" for name, value in features.items()
+             if name != "security_keywords"]
+    if features["security_keywords"]:
+        parts.append("security_keywords=" + ",".join(features["security_keywords"]))
+    return " ".join(parts)
+
+
+def detect_view_type(diagram):
+    """Auto-detect the view type from diagram content."""
+    return classify_view_type(view_type_features(diagram))
+
+
 # ---------------------------------------------------------------------------
 # Extractors per view type
 # ---------------------------------------------------------------------------
@@ -369,7 +644,8 @@ def detect_view_type(diagram):
 def extract_domain_context(diagram, ref):
     """Extract domain context view into structured dict."""
     cells = diagram["cells"]
-    edges = diagram["edges"]
+    edge_index = get_edge_index(diagram)
+    layout = get_layout_index(diagram)
     children_of = build_containment_tree(cells)
 
     result = {
@@ -422,9 +698,9 @@ def extract_domain_context(diagram, ref):
         if spec == "Logical Component" or (
             shape == "archimate.function"
             and label != (domain_container or {}).get("label", "")
-            and _is_inside_domain(cell, domain_container, cells, children_of)
+            and _is_inside_domain(cell, domain_container, cells, layout)
         ):
-            lc = _extract_component(cid, cell, cells, edges, children_of, ref)
+            lc = _extract_component(cid, cell, cells, edge_index, children_of, ref)
             if lc:
                 components.append(lc)
 
@@ -436,7 +712,7 @@ def extract_domain_context(diagram, ref):
 
         # External systems (components outside domain)
         elif shape == "archimate.component" and not _is_inside_domain(
-            cell, domain_container, cells, children_of
+            cell, domain_container, cells, layout
         ):
             entry = {"name": label}
             if cell["has_metadata"]:
@@ -455,10 +731,10 @@ def extract_domain_context(diagram, ref):
         elif shape == "archimate.function" and (
             "AA" in label or "domain" in label.lower()
         ) and label != (domain_container or {}).get("label", ""):
-            if not _is_inside_domain(cell, domain_container, cells, children_of):
+            if not _is_inside_domain(cell, domain_container, cells, layout):
                 adj = {"name": label}
                 # Collect flows to/from this domain
-                adj_flows = _extract_flows_for(cid, cells, edges)
+                adj_flows = _extract_flows_for(cid, edge_index)
                 if adj_flows["incoming"]:
                     adj["receives"] = adj_flows["incoming"]
                 if adj_flows["outgoing"]:
@@ -477,35 +753,29 @@ def extract_domain_context(diagram, ref):
         result["adjacent_domains"] = adjacent_domains
 
     # Cross-domain data flows (edges between major areas)
-    cross_flows = _extract_cross_domain_flows(cells, edges)
+    cross_flows = _extract_cross_domain_flows(edge_index)
     if cross_flows:
         result["data_flows"] = cross_flows
 
     return result
 
 
-def _is_inside_domain(cell, domain_container, cells, children_of):
+def _is_inside_domain(cell, domain_container, cells, layout):
     """Check if a cell is inside the domain container via parent chain."""
     if not domain_container:
         return False
-    dc_id = domain_container["id"]
-    current = cell["parent"]
-    visited = set()
-    while current and current not in ("0", "1") and current not in visited:
-        visited.add(current)
-        if current == dc_id:
-            return True
-        parent_cell = cells.get(current)
-        if parent_cell:
-            current = parent_cell["parent"]
-        else:
-            break
+    if _reaches(cell["parent"], domain_container["id"], layout):
+        return True
     # Also check by geometry (spatial containment)
     if cell.get("geometry") and domain_container.get("geometry"):
-        cg = cell["geometry"]
         dg = domain_container["geometry"]
-        # Resolve absolute position by walking parent chain
-        abs_x, abs_y = _absolute_position(cell, cells)
+        # Resolve absolute position from the memoized parent chain
+        offset = _chain_offset(cell.get("parent", ""), layout)
+        if offset is None:
+            abs_x, abs_y = _absolute_position(cell, cells)
+        else:
+            abs_x = cell["geometry"]["x"] + offset[0]
+            abs_y = cell["geometry"]["y"] + offset[1]
         if (dg["x"] <= abs_x <= dg["x"] + dg["w"] and
                 dg["y"] <= abs_y <= dg["y"] + dg["h"]):
             return True
@@ -530,7 +800,7 @@ def _absolute_position(cell, cells):
     return x, y
 
 
-def _extract_component(cid, cell, cells, edges, children_of, ref):
+def _extract_component(cid, cell, cells, edge_index, children_of, ref):
     """Extract a component with its data concepts and flows."""
     lc = {"name": cell["label"]}
 
@@ -558,7 +828,7 @@ def _extract_component(cid, cell, cells, edges, children_of, ref):
         lc["sub_components"] = sub_components
 
     # Find flows
-    flows = _extract_flows_for(cid, cells, edges)
+    flows = _extract_flows_for(cid, edge_index)
     if flows["incoming"]:
         lc["incoming_flows"] = flows["incoming"]
     if flows["outgoing"]:
@@ -642,41 +912,41 @@ def _extract_integration_area(cid, cell, cells, children_of, ref):
     return ia
 
 
-def _extract_flows_for(cell_id, cells, edges):
+def _extract_flows_for(cell_id, edge_index):
     """Extract incoming and outgoing labeled flows for a cell."""
     incoming = []
     outgoing = []
+    links = edge_index["links"]
 
-    # Also check if cell is inside a group — need to match group-level edges too
-    for edge in edges:
-        label = edge.get("label", "")
-        source = edge.get("source", "")
-        target = edge.get("target", "")
-
-        if source == cell_id and label:
-            target_label = cells.get(target, {}).get("label", target)
+    for pos in edge_index["outgoing"].get(cell_id, ()):
+        link = links[pos]
+        if link["label"]:
+            # Unknown endpoints are reported by id
+            target_label = link["target"] if link["target_label"] is None else link["target_label"]
             if target_label:
-                outgoing.append({"to": target_label, "data": label})
-        elif target == cell_id and label:
-            source_label = cells.get(source, {}).get("label", source)
+                outgoing.append({"to": target_label, "data": link["label"]})
+
+    for pos in edge_index["incoming"].get(cell_id, ()):
+        link = links[pos]
+        # A self-loop is only an outgoing flow
+        if link["label"] and link["source"] != cell_id:
+            source_label = link["source"] if link["source_label"] is None else link["source_label"]
             if source_label:
-                incoming.append({"from": source_label, "data": label})
+                incoming.append({"from": source_label, "data": link["label"]})
 
     return {"incoming": incoming, "outgoing": outgoing}
 
 
-def _extract_cross_domain_flows(cells, edges):
+def _extract_cross_domain_flows(edge_index):
     """Extract all labeled data flows."""
     flows = []
     seen = set()
-    for edge in edges:
-        label = edge.get("label", "")
+    for link in edge_index["links"]:
+        label = link["label"]
         if not label:
             continue
-        source = edge.get("source", "")
-        target = edge.get("target", "")
-        source_label = cells.get(source, {}).get("label", "")
-        target_label = cells.get(target, {}).get("label", "")
+        source_label = link["source_label"] or ""
+        target_label = link["target_label"] or ""
         if source_label and target_label:
             key = (source_label, target_label, label)
             if key not in seen:
@@ -696,7 +966,7 @@ def _extract_cross_domain_flows(cells, edges):
 def extract_data_aggregate(diagram, ref):
     """Extract data concept aggregate model into structured dict."""
     cells = diagram["cells"]
-    edges = diagram["edges"]
+    edge_index = get_edge_index(diagram)
     children_of = build_containment_tree(cells)
 
     result = {
@@ -750,36 +1020,18 @@ def extract_data_aggregate(diagram, ref):
             if aggregates:
                 lc["aggregate_boundaries"] = aggregates
 
-            # Find services realized
-            for edge in edges:
-                if edge.get("source") == cid:
-                    target = cells.get(edge.get("target", ""))
-                    if target and get_shape_type(target["style"]) == "archimate.service":
-                        services.append(target["label"])
-                elif edge.get("target") == cid:
-                    source = cells.get(edge.get("source", ""))
-                    # Realization: component → service (dashed arrow)
-                    pass
-
-            # Also find services that point to this LC
-            for edge in edges:
-                source_cell = cells.get(edge.get("source", ""))
-                target_cell = cells.get(edge.get("target", ""))
-                if source_cell and source_cell["id"] == cid:
-                    if target_cell and get_shape_type(target_cell["style"]) == "archimate.service":
-                        if target_cell["label"] not in services:
-                            services.append(target_cell["label"])
-                if target_cell and get_shape_type(target_cell["style"]) == "archimate.service":
-                    if source_cell and source_cell["id"] == cid:
-                        if target_cell["label"] not in services:
-                            services.append(target_cell["label"])
+            # Find services realized (component → service)
+            for pos in edge_index["outgoing"].get(cid, ()):
+                target = cells.get(edge_index["links"][pos]["target"])
+                if target and get_shape_type(target["style"]) == "archimate.service":
+                    services.append(target["label"])
 
             if services:
                 lc["realizes_services"] = services
 
             # Entity relationships within this component
             relationships = _extract_relationships_in_scope(
-                cid, cells, edges, children_of
+                cid, edge_index, children_of
             )
             if relationships:
                 lc["relationships"] = relationships
@@ -829,28 +1081,32 @@ def _collect_aggregate_children(parent_id, cells, children_of, owned, read_model
             _collect_aggregate_children(child_id, cells, children_of, owned, read_models, aggregates, exclude_id=exclude_id)
 
 
-def _extract_relationships_in_scope(scope_id, cells, edges, children_of):
+def _extract_relationships_in_scope(scope_id, edge_index, children_of):
     """Extract entity relationships within a logical component scope."""
     # Get all cell IDs in scope
     in_scope = set()
     _get_all_descendants(scope_id, children_of, in_scope)
 
+    # Edges touching the scope, in diagram order
+    positions = set()
+    for cid in in_scope:
+        positions.update(edge_index["outgoing"].get(cid, ()))
+        positions.update(edge_index["incoming"].get(cid, ()))
+
     relationships = []
-    for edge in edges:
-        source = edge.get("source", "")
-        target = edge.get("target", "")
-        if source in in_scope or target in in_scope:
-            source_label = cells.get(source, {}).get("label", "")
-            target_label = cells.get(target, {}).get("label", "")
-            if source_label and target_label:
-                rel_type = get_edge_type(edge["style"])
-                if rel_type != "association" or edge.get("label"):
-                    relationships.append({
-                        "from": source_label,
-                        "to": target_label,
-                        "type": rel_type,
-                        **({"label": edge["label"]} if edge.get("label") else {}),
-                    })
+    for pos in sorted(positions):
+        link = edge_index["links"][pos]
+        source_label = link["source_label"] or ""
+        target_label = link["target_label"] or ""
+        if source_label and target_label:
+            rel_type = get_edge_type(link["edge"]["style"])
+            if rel_type != "association" or link["label"]:
+                relationships.append({
+                    "from": source_label,
+                    "to": target_label,
+                    "type": rel_type,
+                    **({"label": link["label"]} if link["label"] else {}),
+                })
     return relationships
 
 
@@ -928,7 +1184,7 @@ def extract_data_architecture(diagram, ref):
 def extract_security(diagram, ref):
     """Extract security architecture view."""
     cells = diagram["cells"]
-    edges = diagram["edges"]
+    edge_index = get_edge_index(diagram)
     children_of = build_containment_tree(cells)
 
     result = {
@@ -1033,16 +1289,14 @@ def extract_security(diagram, ref):
                 result["external_actors"].append({"name": label})
 
     # Data flows — only include labeled edges (these carry architectural meaning)
-    for edge in edges:
-        source_id = edge.get("source", "")
-        target_id = edge.get("target", "")
-        if source_id in legend_ids or target_id in legend_ids:
+    for link in edge_index["links"]:
+        if link["source"] in legend_ids or link["target"] in legend_ids:
             continue
-        source = cells.get(source_id, {}).get("label", "")
-        target = cells.get(target_id, {}).get("label", "")
+        source = link["source_label"] or ""
+        target = link["target_label"] or ""
         if source and target:
             flow = {"from": source, "to": target}
-            label = edge.get("label", "")
+            label = link["label"]
             if label:
                 flow["data"] = label
             result["data_flows"].append(flow)
@@ -1060,7 +1314,7 @@ def extract_security(diagram, ref):
 def extract_generic(diagram, ref):
     """Generic extraction for unrecognized view types."""
     cells = diagram["cells"]
-    edges = diagram["edges"]
+    edge_index = get_edge_index(diagram)
 
     result = {
         "view_type": "generic",
@@ -1083,13 +1337,13 @@ def extract_generic(diagram, ref):
             entry["metadata"] = cell["metadata"]
         result["elements"].append(entry)
 
-    for edge in edges:
-        source = cells.get(edge.get("source", ""), {}).get("label", "")
-        target = cells.get(edge.get("target", ""), {}).get("label", "")
+    for link in edge_index["links"]:
+        source = link["source_label"] or ""
+        target = link["target_label"] or ""
         if source and target:
             conn = {"from": source, "to": target}
-            if edge.get("label"):
-                conn["label"] = edge["label"]
+            if link["label"]:
+                conn["label"] = link["label"]
             result["connections"].append(conn)
 
     return result
@@ -1108,80 +1362,386 @@ EXTRACTORS = {
 }
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Extract structured YAML from draw.io files")
-    parser.add_argument("drawio_file", help="Path to .drawio file")
-    parser.add_argument("--type", choices=list(EXTRACTORS.keys()) + ["auto"],
-                        default="auto", help="View type (default: auto-detect)")
-    parser.add_argument("--output", help="Output YAML path (default: alongside .drawio)")
-    parser.add_argument("--reference", default=str(DEFAULT_REFERENCE),
-                        help="Path to domain reference YAML")
-    args = parser.parse_args()
+class CleanDumper(yaml.SafeDumper):
+    """YAML dumper that writes multi-line strings as literal blocks."""
 
-    drawio_path = Path(args.drawio_file)
-    if not drawio_path.exists():
-        print(f"Error: {drawio_path} not found", file=sys.stderr)
-        sys.exit(1)
 
-    # Load reference
-    ref = load_domain_reference(args.reference)
+def _str_representer(dumper, data):
+    if "\n" in data:
+        return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data)
+
+
+CleanDumper.add_representer(str, _str_representer)
 
-    # Parse
-    print(f"Parsing {drawio_path.name}...")
-    diagrams = parse_drawio(drawio_path)
-    print(f"  Found {len(diagrams)} tab(s): {', '.join(d['tab_name'] for d in diagrams)}")
+
+def dump_yaml(output_data):
+    """Render extraction output as YAML text."""
+    return yaml.dump(output_data, Dumper=CleanDumper,
+                     default_flow_style=False, sort_keys=False,
+                     allow_unicode=True, width=120)
+
+
+def provenance(drawio_path, stats):
+    """Per-file provenance block for the output, from parse_drawio stats.
+
+    Parse time is left out so identical input yields identical YAML.
+    """
+    return {
+        "file": drawio_path.name,
+        "sha256": stats["sha256"],
+        "lines": stats["lines"],
+        "bytes": stats["bytes"],
+        "tabs": stats["tabs"],
+    }
+
+
+def extract_file(drawio_path, ref, view_type="auto", log=None, verbose=False, stats=None):
+    """Extract every tab of one .drawio file; returns the YAML-ready data.
+
+    With verbose (and log), each auto-detected tab's feature vector is
+    logged. A stats dict, if given, receives parse_drawio's file stats.
+    """
+    stats = {} if stats is None else stats
+    diagrams = parse_drawio(drawio_path, stats)
+    if log:
+        log(f"  Found {len(diagrams)} tab(s): {', '.join(d['tab_name'] for d in diagrams)}")
 
     all_results = []
 
     for diagram in diagrams:
         # Detect or use specified type
-        if args.type == "auto":
-            view_type = detect_view_type(diagram)
-            print(f"  Tab '{diagram['tab_name']}' → detected as: {view_type}")
+        if view_type == "auto":
+            features = view_type_features(diagram)
+            tab_type = classify_view_type(features)
+            if log:
+                log(f"  Tab '{diagram['tab_name']}' → detected as: {tab_type}")
+                if verbose:
+                    log(f"    features: {format_features(features)}")
         else:
-            view_type = args.type
+            tab_type = view_type
 
-        extractor = EXTRACTORS.get(view_type, extract_generic)
+        extractor = EXTRACTORS.get(tab_type, extract_generic)
         result = extractor(diagram, ref)
 
         # Add file metadata
         result["source_file"] = drawio_path.name
-        result["source_lines"] = sum(1 for _ in open(drawio_path))
+        result["source_lines"] = stats["lines"]
 
         all_results.append(result)
 
     # Output
     if len(all_results) == 1:
-        output_data = all_results[0]
-    else:
-        output_data = {"tabs": all_results}
+        all_results[0]["provenance"] = provenance(drawio_path, stats)
+        return all_results[0]
+    return {"provenance": provenance(drawio_path, stats), "tabs": all_results}
 
-    # Determine output path
-    if args.output:
-        output_path = Path(args.output)
-    else:
-        output_path = drawio_path.with_suffix(".extracted.yaml")
 
-    # Custom YAML representer for clean output
-    class CleanDumper(yaml.SafeDumper):
-        pass
+# Bump whenever extractor output changes for the same input, so outputs
+# stamped by an older version are regenerated
+EXTRACTOR_VERSION = 2
+
+STAMP_PREFIX = "# extract_view:"
+
+# Stamps of outputs whose body a re-extraction left unchanged, keyed by
+# output path; they apply only while the output still holds that body
+STAMP_CACHE_DIR = REPO_ROOT / ".cache" / "extract_view"
 
-    def str_representer(dumper, data):
-        if "\n" in data:
-            return dumper.represent_scalar("tag:yaml.org,2002:str", data, style="|")
-        return dumper.represent_scalar("tag:yaml.org,2002:str", data)
 
-    CleanDumper.add_representer(str, str_representer)
+def make_stamp(stats, ref_hash, view_type):
+    """First line of an extracted YAML: what it was generated from (a YAML comment).
 
-    yaml_output = yaml.dump(output_data, Dumper=CleanDumper,
-                            default_flow_style=False, sort_keys=False,
-                            allow_unicode=True, width=120)
+    stats are parse_drawio's file stats; their counts are repeated here so
+    skipped files can still be reported without reading the source. A
+    missing reference (ref_hash None) is stamped as "none".
+    """
+    return (f"{STAMP_PREFIX} source={stats['sha256']} extractor={EXTRACTOR_VERSION} "
+            f"reference={ref_hash or 'none'} type={view_type} tabs={stats['tabs']} "
+            f"lines={stats['lines']} bytes={stats['bytes']}")
 
-    output_path.write_text(yaml_output)
-    yaml_lines = yaml_output.count("\n")
-    print(f"\nOutput: {output_path}")
-    print(f"  {result['source_lines']} lines XML → {yaml_lines} lines YAML "
-          f"({round(yaml_lines / max(result['source_lines'], 1) * 100)}% of original)")
+
+def parse_stamp(line):
+    """Fields of a stamp line, or None if it is not one."""
+    if not line.startswith(STAMP_PREFIX):
+        return None
+    return dict(field.split("=", 1) for field in line[len(STAMP_PREFIX):].split() if "=" in field)
+
+
+def body_sha256(body):
+    """SHA-256 of an output's YAML body (everything after the stamp line)."""
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def stamp_cache_path(output_path):
+    """Where a newer stamp for output_path is recorded."""
+    key = hashlib.sha256(str(Path(output_path).resolve()).encode("utf-8")).hexdigest()[:32]
+    return STAMP_CACHE_DIR / f"{key}.stamp"
+
+
+def read_stamp(output_path):
+    """The stamp that applies to an existing output, or None.
+
+    That is the output's first line, unless a newer stamp was recorded for
+    the body the output still holds.
+    """
+    try:
+        cached = parse_stamp(stamp_cache_path(output_path).read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError):
+        cached = None
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            stamp = parse_stamp(f.readline())
+            if cached is not None and cached.pop("body", None) == body_sha256(f.read()):
+                return cached
+    except (OSError, UnicodeDecodeError):
+        return None
+    return stamp
+
+
+def write_output(output_path, header, body):
+    """Write the stamp header and YAML body unless the output already holds body.
+
+    An unchanged body is not rewritten; a new header is then recorded in
+    STAMP_CACHE_DIR instead (best effort). Returns True if written.
+    """
+    cache_path = stamp_cache_path(output_path)
+    try:
+        with open(output_path, encoding="utf-8") as f:
+            old_header = f.readline().rstrip("\n")
+            old_body = f.read()
+    except (OSError, UnicodeDecodeError):
+        old_header = old_body = None
+    if old_body != body or parse_stamp(old_header) is None:
+        Path(output_path).write_text(header + "\n" + body, encoding="utf-8")
+        cache_path.unlink(missing_ok=True)
+        return True
+    try:
+        if old_header == header:
+            cache_path.unlink(missing_ok=True)
+        else:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_atomically(cache_path, f"{header} body={body_sha256(body)}\n")
+    except OSError:
+        pass  # the output is current either way; the next run re-extracts it
+    return False
+
+
+def default_output_path(drawio_path):
+    """Output is written next to the .drawio file as <filename>.extracted.yaml."""
+    return drawio_path.with_suffix(".extracted.yaml")
+
+
+def _is_glob(arg):
+    return any(ch in arg for ch in "*?[")
+
+
+def collect_drawio_files(paths):
+    """Expand files, directories (searched recursively) and glob patterns into .drawio files."""
+    files = []
+    for arg in paths:
+        path = Path(arg)
+        if path.is_dir():
+            found = sorted(path.rglob("*.drawio"))
+        elif _is_glob(arg):
+            found = sorted(Path(p) for p in glob.glob(arg, recursive=True))
+        else:
+            found = [path]
+        files.extend(f for f in found if f.name != "_template.drawio")
+    # Keep the first occurrence of each file
+    return list(dict.fromkeys(files))
+
+
+def is_up_to_date(drawio_path, output_path, ref_hash, view_type="auto"):
+    """The output's stamp if it matches the current source, extractor and reference, else None."""
+    stamp = read_stamp(output_path)
+    if (stamp and stamp.get("source") == file_sha256(drawio_path)
+            and stamp.get("extractor") == str(EXTRACTOR_VERSION)
+            and stamp.get("reference") == (ref_hash or "none") and stamp.get("type") == view_type):
+        return stamp
+    return None
+
+
+# Per-process reference for batch workers, loaded once per worker and only
+# when some file actually needs extracting
+_WORKER_REF_PATH = None
+_WORKER_REF_HASH = None
+_WORKER_REF = None
+
+
+def _init_worker(ref_path):
+    global _WORKER_REF_PATH, _WORKER_REF_HASH, _WORKER_REF
+    _WORKER_REF_PATH = ref_path
+    _WORKER_REF_HASH = file_sha256(ref_path)
+    _WORKER_REF = None
+
+
+def _worker_ref():
+    global _WORKER_REF
+    if _WORKER_REF is None:
+        _WORKER_REF = load_domain_reference(_WORKER_REF_PATH, quiet=True) or {}
+    return _WORKER_REF
+
+
+def extract_to_file(drawio_path, ref, ref_hash, view_type="auto", output_path=None,
+                    force=False, log=None, verbose=False):
+    """Extract one file to YAML unless its stamp shows the output is current.
+
+    ref may be a zero-argument callable, called only if extraction runs.
+    verbose always extracts (like force), so the features behind each
+    tab's view type are logged even when the output is current; an
+    unchanged output is still not rewritten. Returns a summary dict; status is "skipped" (stamp matched, nothing
+    parsed), "unchanged" (re-extracted, same YAML body) or "written". File
+    stats come from the parse, or from the stamp when skipped.
+    """
+    start = time.perf_counter()
+    output_path = output_path or default_output_path(drawio_path)
+    summary = {"file": str(drawio_path), "output": str(output_path)}
+
+    stamp = None if force or verbose else is_up_to_date(drawio_path, output_path, ref_hash, view_type)
+    if stamp:
+        summary.update(status="skipped", tabs=int(stamp.get("tabs", 0)),
+                       source_lines=int(stamp.get("lines", 0)),
+                       source_bytes=int(stamp.get("bytes", 0)),
+                       parse_seconds=0.0, seconds=time.perf_counter() - start)
+        return summary
+
+    if callable(ref):
+        ref = ref()
+    stats = {}
+    output_data = extract_file(drawio_path, ref, view_type, log=log, verbose=verbose, stats=stats)
+    yaml_output = dump_yaml(output_data)
+    header = make_stamp(stats, ref_hash, view_type)
+    written = write_output(output_path, header, yaml_output)
+    summary.update(
+        status="written" if written else "unchanged",
+        tabs=stats["tabs"],
+        source_lines=stats["lines"],
+        source_bytes=stats["bytes"],
+        parse_seconds=stats["parse_seconds"],
+        yaml_lines=yaml_output.count("\n"),
+        seconds=time.perf_counter() - start,
+    )
+    return summary
+
+
+def _extract_one(job):
+    """Batch worker: extract one file and write its output if changed."""
+    drawio_path, view_type, force = job
+    try:
+        return extract_to_file(drawio_path, _worker_ref, _WORKER_REF_HASH, view_type, force=force)
+    except Exception as e:
+        return {
+            "file": str(drawio_path),
+            "output": str(default_output_path(drawio_path)),
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "tabs": 0,
+            "source_lines": 0,
+            "source_bytes": 0,
+            "parse_seconds": 0.0,
+            "seconds": 0.0,
+        }
+
+
+def extract_all(drawio_files, ref_path, view_type="auto", jobs=1, force=False):
+    """Extract many files with the reference loaded once (per worker process).
+
+    Returns one summary dict per file, in input order.
+    """
+    jobs_list = [(path, view_type, force) for path in drawio_files]
+    summaries = run_jobs(_extract_one, jobs_list, jobs, _init_worker, (ref_path,))
+    if any(s["status"] in ("written", "unchanged") for s in summaries):
+        # Workers load the reference quietly; its warnings are printed once,
+        # here (a serial run already holds the reference in this process)
+        if pool_size(jobs, len(jobs_list)) == 1:
+            ref = _WORKER_REF
+        else:
+            ref = load_domain_reference(ref_path, quiet=True)
+        report_reference_issues(ref_path, ref)
+    return summaries
+
+
+def run_batch(paths, ref_path, view_type="auto", jobs=1, force=False):
+    """Batch mode: extract every file and print a summary report."""
+    drawio_files = collect_drawio_files(paths)
+    if not drawio_files:
+        print("No .drawio files found")
+        return 0
+
+    workers = pool_size(jobs, len(drawio_files))
+    print(f"Extracting {len(drawio_files)} file(s)"
+          + (f" with {workers} worker(s)" if workers > 1 else "") + "...")
+    start = time.perf_counter()
+    summaries = extract_all(drawio_files, ref_path, view_type, jobs, force)
+    elapsed = time.perf_counter() - start
+
+    for summary in summaries:
+        if summary["status"] == "error":
+            print(f"  ERROR     {summary['file']}: {summary['error']}")
+        elif summary["status"] == "written":
+            print(f"  written   {summary['output']} ({summary['tabs']} tab(s), "
+                  f"{summary['seconds'] * 1000:.0f} ms)")
+
+    counts = {status: sum(1 for s in summaries if s["status"] == status)
+              for status in ("written", "unchanged", "skipped", "error")}
+    print("\n" + "=" * 60)
+    print(f"Files: {len(summaries)}, tabs: {sum(s['tabs'] for s in summaries)}, "
+          f"source: {sum(s['source_lines'] for s in summaries)} lines, "
+          f"{sum(s['source_bytes'] for s in summaries) / 1e6:.1f} MB")
+    print(f"Written: {counts['written']}, unchanged: {counts['unchanged']}, "
+          f"up to date (skipped): {counts['skipped']}, errors: {counts['error']}")
+    print(f"Time: {elapsed:.2f}s (parsing: {sum(s['parse_seconds'] for s in summaries):.2f}s)")
+    return 1 if counts["error"] else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract structured YAML from draw.io files")
+    parser.add_argument("drawio_files", nargs="*", metavar="drawio_file",
+                        help="Path(s) to .drawio files, directories or glob patterns")
+    parser.add_argument("--all", metavar="DIR",
+                        help="Extract every .drawio file under DIR (e.g. views/)")
+    parser.add_argument("--type", choices=list(EXTRACTORS.keys()) + ["auto"],
+                        default="auto", help="View type (default: auto-detect)")
+    parser.add_argument("--output", help="Output YAML path (default: alongside .drawio; single file only)")
+    parser.add_argument("--reference", default=str(DEFAULT_REFERENCE),
+                        help="Path to domain reference YAML")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Parallel worker processes in batch mode (default: 1)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-extract even if the output's stamp says it is up to date")
+    parser.add_argument("-v", "--verbose", action="store_true",
+                        help="Show the features behind each tab's detected view type "
+                             "(re-extracts even if the output is up to date)")
+    args = parser.parse_args()
+
+    paths = list(args.drawio_files) + ([args.all] if args.all else [])
+    if not paths:
+        parser.error("give a .drawio file, or --all DIR")
+
+    if args.all or len(paths) > 1 or Path(paths[0]).is_dir() or _is_glob(paths[0]):
+        if args.output:
+            parser.error("--output only applies to a single .drawio file")
+        sys.exit(run_batch(paths, args.reference, args.type, args.jobs, args.force))
+
+    drawio_path = Path(paths[0])
+    if not drawio_path.exists():
+        print(f"Error: {drawio_path} not found", file=sys.stderr)
+        sys.exit(1)
+
+    # Parse (skipped when the output's stamp matches); the reference is
+    # only loaded if extraction runs
+    print(f"Parsing {drawio_path.name}...")
+    summary = extract_to_file(drawio_path, lambda: load_domain_reference(args.reference),
+                              file_sha256(args.reference), args.type,
+                              output_path=Path(args.output) if args.output else None,
+                              force=args.force, log=print, verbose=args.verbose)
+    if summary["status"] == "skipped":
+        print(f"\nOutput: {summary['output']} (up to date, use --force to re-extract)")
+        return
+
+    print(f"\nOutput: {summary['output']}" + (" (unchanged)" if summary["status"] == "unchanged" else ""))
+    print(f"  {summary['source_lines']} lines XML → {summary['yaml_lines']} lines YAML "
+          f"({round(summary['yaml_lines'] / max(summary['source_lines'], 1) * 100)}% of original)")
 
 
 if __name__ == "__main__":
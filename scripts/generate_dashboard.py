@@ -9,24 +9,54 @@ Creates an interactive dashboard with:
 - Validation issues
 - Model coverage metrics
 
+The page is rendered from scripts/templates/dashboard.html. Orphan and
+error lists are written to dashboard-data.js beside it and loaded lazily,
+one page of rows at a time. Each run's summary is appended to
+dashboard-history.jsonl and recent runs are drawn as trend sparklines.
+
 Usage:
-    python scripts/generate_dashboard.py                  # Generate dashboard.html
+    python scripts/generate_dashboard.py                  # Generate dashboard.html + dashboard-data.js
     python scripts/generate_dashboard.py -o docs/         # Custom output directory
+    python scripts/generate_dashboard.py --no-history     # Snapshot only, no trends
 """
 
 import argparse
+import html
 import json
-import subprocess
+import os
+import re
 import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 
-import frontmatter
+import registry_core
+import validate
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 REGISTRY_DIR = REPO_ROOT / "registry"
 VIEWS_DIR = REPO_ROOT / "views"
+TEMPLATE_PATH = Path(__file__).resolve().parent / "templates" / "dashboard.html"
+
+# Sidecar holding the orphan/error lists, written next to dashboard.html
+DATA_FILENAME = "dashboard-data.js"
+# Rows per page in the orphan and error lists
+PAGE_SIZE = 50
+
+# Run history: one JSON line per run, appended next to dashboard.html
+HISTORY_FILENAME = "dashboard-history.jsonl"
+# Runs shown in the trend sparklines
+HISTORY_WINDOW = 90
+# Compact the history once the file grows past this many bytes
+HISTORY_COMPACT_BYTES = 4 * 1024 * 1024
+# Runs kept at full resolution by compaction; older ones are thinned
+HISTORY_FULL_RUNS = 90
+# Older runs are kept one per ISO week up to this age, then one per month
+HISTORY_WEEKLY_DAYS = 2 * 365
+
+_SLOT = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# Compiled templates by path
+_TEMPLATES = {}
 
 # Known domains
 KNOWN_DOMAINS = [
@@ -39,59 +69,48 @@ KNOWN_DOMAINS = [
 LAYER_ORDER = ["strategy", "motivation", "business", "application", "technology", "implementation"]
 
 
-def load_registry():
+def load_registry(use_cache=True, jobs=None):
     """Load all registry entries with metadata."""
-    elements = []
-    if not REGISTRY_DIR.exists():
-        return elements
+    return registry_core.load_registry(REGISTRY_DIR, REPO_ROOT, use_cache=use_cache,
+                                       jobs=jobs, quiet=True)
 
-    for md_file in REGISTRY_DIR.rglob("*.md"):
-        if md_file.name == "_template.md":
-            continue
-        try:
-            post = frontmatter.load(md_file)
-            if "name" not in post.metadata:
-                continue
-
-            rel = md_file.relative_to(REGISTRY_DIR)
-            parts = rel.parts
-            layer = parts[0] if len(parts) > 1 else "unknown"
-            element_type = parts[1] if len(parts) > 2 else "unknown"
-
-            elements.append({
-                "name": post.metadata["name"].strip(),
-                "owner": post.metadata.get("owner", ""),
-                "domain": post.metadata.get("domain", ""),
-                "status": post.metadata.get("status", ""),
-                "specialization": post.metadata.get("specialization", ""),
-                "sourcing": post.metadata.get("sourcing", ""),
-                "layer": layer,
-                "element_type": element_type,
-                "file": str(md_file.relative_to(REPO_ROOT)),
-            })
-        except Exception:
-            pass
-
-    return elements
-
-
-def run_validator():
-    """Run the validator and get JSON output."""
+
+def run_validator(elements, use_cache=True):
+    """Validate the already-loaded registry in-process; returns the JSON report dict."""
     try:
-        result = subprocess.run(
-            ["python3", str(REPO_ROOT / "scripts" / "validate.py"), "--format", "json"],
-            capture_output=True,
-            text=True,
-            cwd=REPO_ROOT,
-        )
-        return json.loads(result.stdout)
+        return validate.validate(elements, use_cache=use_cache).to_dict()
     except Exception as e:
         return {"status": "ERROR", "error": str(e)}
 
 
-def calculate_domain_stats(elements):
-    """Calculate statistics per domain."""
-    stats = defaultdict(lambda: {
+def scan_views(views_dir=None):
+    """One walk of views/: per-domain counts of .drawio and .extracted.yaml files.
+
+    The domain is a file's top-level folder under views/.
+    """
+    views_dir = VIEWS_DIR if views_dir is None else views_dir
+    inventory = defaultdict(lambda: {"drawio": 0, "extracted": 0})
+    for dirpath, _dirnames, filenames in os.walk(views_dir):
+        rel = Path(dirpath).relative_to(views_dir)
+        if not rel.parts:
+            continue
+        counts = inventory[rel.parts[0]]
+        for name in filenames:
+            if name.endswith(".drawio"):
+                counts["drawio"] += 1
+            elif name.endswith(".extracted.yaml"):
+                counts["extracted"] += 1
+    return dict(inventory)
+
+
+def build_domain_index(elements, views_dir=None):
+    """Per-domain and per-layer aggregates from one pass over the elements.
+
+    Domain stats group falsy domains under "unassigned"; element types are
+    keyed by the raw domain, as maturity scoring looks them up. View files
+    come from a single walk of views/ (see scan_views).
+    """
+    domains = defaultdict(lambda: {
         "total": 0,
         "by_layer": defaultdict(int),
         "by_type": defaultdict(int),
@@ -99,54 +118,65 @@ def calculate_domain_stats(elements):
         "vendor_count": 0,
         "owners": set(),
     })
+    layers = defaultdict(lambda: {"total": 0, "by_type": defaultdict(int)})
+    element_types = defaultdict(set)
 
     for elem in elements:
-        domain = elem["domain"] or "unassigned"
-        stats[domain]["total"] += 1
-        stats[domain]["by_layer"][elem["layer"]] += 1
-        stats[domain]["by_type"][elem["element_type"]] += 1
+        stats = domains[elem["domain"] or "unassigned"]
+        stats["total"] += 1
+        stats["by_layer"][elem["layer"]] += 1
+        stats["by_type"][elem["element_type"]] += 1
         if elem["owner"]:
-            stats[domain]["owners"].add(elem["owner"])
+            stats["owners"].add(elem["owner"])
         if elem["sourcing"] == "in-house":
-            stats[domain]["in_house_count"] += 1
+            stats["in_house_count"] += 1
         elif elem["sourcing"] == "vendor":
-            stats[domain]["vendor_count"] += 1
+            stats["vendor_count"] += 1
 
-    # Convert sets to counts
-    for domain in stats:
-        stats[domain]["owner_count"] = len(stats[domain]["owners"])
-        del stats[domain]["owners"]
+        layer = layers[elem["layer"]]
+        layer["total"] += 1
+        layer["by_type"][elem["element_type"]] += 1
 
-    return dict(stats)
+        element_types[elem["domain"]].add(elem["element_type"])
 
+    return {
+        "domains": dict(domains),
+        "layers": dict(layers),
+        "element_types": dict(element_types),
+        "views": scan_views(views_dir),
+    }
 
-def calculate_layer_stats(elements):
-    """Calculate statistics per layer."""
-    stats = defaultdict(lambda: {"total": 0, "by_type": defaultdict(int)})
 
-    for elem in elements:
-        layer = elem["layer"]
-        stats[layer]["total"] += 1
-        stats[layer]["by_type"][elem["element_type"]] += 1
+def calculate_domain_stats(elements, index=None):
+    """Calculate statistics per domain."""
+    index = index or build_domain_index(elements)
+    stats = {}
+    for domain, domain_stats in index["domains"].items():
+        stats[domain] = {k: v for k, v in domain_stats.items() if k != "owners"}
+        stats[domain]["owner_count"] = len(domain_stats["owners"])
+    return stats
 
-    return dict(stats)
+
+def calculate_layer_stats(elements, index=None):
+    """Calculate statistics per layer."""
+    index = index or build_domain_index(elements)
+    return dict(index["layers"])
 
 
-def get_domain_maturity(domain, elements, validator_data):
+def get_domain_maturity(domain, elements, validator_data, index=None):
     """Calculate maturity score for a domain."""
-    domain_elements = [e for e in elements if e["domain"] == domain]
+    index = index or build_domain_index(elements)
+    element_types = index["element_types"].get(domain, set())
+    views = index["views"].get(domain, {"drawio": 0, "extracted": 0})
 
     # Check for different element types
-    has_components = any(e["element_type"] == "components" for e in domain_elements)
-    has_functions = any(e["element_type"] == "functions" for e in domain_elements)
-    has_data = any(e["element_type"] == "data-objects" for e in domain_elements)
-
-    # Check for views
-    domain_views = VIEWS_DIR / domain
-    has_views = domain_views.exists() and any(domain_views.glob("**/*.drawio"))
+    has_components = "components" in element_types
+    has_functions = "functions" in element_types
+    has_data = "data-objects" in element_types
 
-    # Check for extracted YAMLs
-    has_extracts = domain_views.exists() and any(domain_views.glob("**/*.extracted.yaml"))
+    # Check for views and extracted YAMLs
+    has_views = views["drawio"] > 0
+    has_extracts = views["extracted"] > 0
 
     # Calculate score (0-5)
     score = sum([
@@ -168,232 +198,238 @@ def get_domain_maturity(domain, elements, validator_data):
     }
 
 
-def generate_html(elements, validator_data, output_path):
-    """Generate the HTML dashboard."""
-    domain_stats = calculate_domain_stats(elements)
-    layer_stats = calculate_layer_stats(elements)
+def compile_template(path=None):
+    """Split a template into alternating literal text and slot names.
 
-    # Calculate maturity for each domain
-    maturity = {}
-    for domain in KNOWN_DOMAINS:
-        maturity[domain] = get_domain_maturity(domain, elements, validator_data)
-
-    # Get orphans and errors from validator
-    orphans = validator_data.get("orphan_elements", [])
-    errors = validator_data.get("errors", [])
-
-    # Total counts
-    total_elements = len(elements)
-    total_domains = len(set(e["domain"] for e in elements if e["domain"]))
-    total_orphans = len(orphans)
-    total_errors = len(errors)
-
-    # Generate HTML
-    html = f'''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Architecture Model Dashboard</title>
-    <style>
-        * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #f5f5f5;
-            color: #333;
-            line-height: 1.6;
-        }}
-        .container {{ max-width: 1400px; margin: 0 auto; padding: 20px; }}
-        header {{
-            background: linear-gradient(135deg, #0058a3 0%, #004f93 100%);
-            color: white;
-            padding: 30px;
-            margin-bottom: 30px;
-            border-radius: 12px;
-        }}
-        header h1 {{ font-size: 2em; margin-bottom: 10px; }}
-        header p {{ opacity: 0.9; }}
-
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            text-align: center;
-        }}
-        .stat-card .number {{
-            font-size: 3em;
-            font-weight: 700;
-            color: #0058a3;
-        }}
-        .stat-card .label {{
-            color: #666;
-            font-size: 0.9em;
-            margin-top: 5px;
-        }}
-        .stat-card.warning .number {{ color: #f0a000; }}
-        .stat-card.error .number {{ color: #d32f2f; }}
-        .stat-card.success .number {{ color: #388e3c; }}
-
-        .section {{
-            background: white;
-            padding: 25px;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-            margin-bottom: 25px;
-        }}
-        .section h2 {{
-            font-size: 1.3em;
-            margin-bottom: 20px;
-            color: #0058a3;
-            border-bottom: 2px solid #e0e0e0;
-            padding-bottom: 10px;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        th, td {{
-            padding: 12px 15px;
-            text-align: left;
-            border-bottom: 1px solid #eee;
-        }}
-        th {{
-            background: #f8f9fa;
-            font-weight: 600;
-            color: #555;
-        }}
-        tr:hover {{ background: #f8f9fa; }}
-
-        .progress-bar {{
-            height: 8px;
-            background: #e0e0e0;
-            border-radius: 4px;
-            overflow: hidden;
-        }}
-        .progress-bar .fill {{
-            height: 100%;
-            background: linear-gradient(90deg, #4caf50, #8bc34a);
-            border-radius: 4px;
-            transition: width 0.3s;
-        }}
-        .progress-bar.low .fill {{ background: linear-gradient(90deg, #f44336, #ff5722); }}
-        .progress-bar.medium .fill {{ background: linear-gradient(90deg, #ff9800, #ffc107); }}
-
-        .badge {{
-            display: inline-block;
-            padding: 4px 10px;
-            border-radius: 20px;
-            font-size: 0.8em;
-            font-weight: 500;
-        }}
-        .badge-make {{ background: #e3f2fd; color: #1976d2; }}
-        .badge-buy {{ background: #fff3e0; color: #f57c00; }}
-        .badge-mixed {{ background: #f3e5f5; color: #7b1fa2; }}
-
-        .layer-bar {{
-            display: flex;
-            height: 30px;
-            border-radius: 6px;
-            overflow: hidden;
-            margin: 10px 0;
-        }}
-        .layer-bar div {{
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-size: 0.75em;
-            font-weight: 500;
-        }}
-        .layer-strategy {{ background: #9c27b0; }}
-        .layer-motivation {{ background: #673ab7; }}
-        .layer-business {{ background: #ffeb3b; color: #333 !important; }}
-        .layer-application {{ background: #2196f3; }}
-        .layer-technology {{ background: #4caf50; }}
-        .layer-implementation {{ background: #ff9800; }}
-
-        .timestamp {{
-            text-align: center;
-            color: #999;
-            font-size: 0.85em;
-            margin-top: 30px;
-        }}
-
-        .issues-list {{
-            max-height: 300px;
-            overflow-y: auto;
-        }}
-        .issue-item {{
-            padding: 10px;
-            border-left: 3px solid #f44336;
-            background: #fff5f5;
-            margin-bottom: 8px;
-            border-radius: 0 6px 6px 0;
-        }}
-        .issue-item.warning {{
-            border-left-color: #ff9800;
-            background: #fff8e1;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>Architecture Model Dashboard</h1>
-            <p>Enterprise architecture registry health and compliance overview</p>
-        </header>
-
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="number">{total_elements}</div>
-                <div class="label">Total Elements</div>
-            </div>
-            <div class="stat-card">
-                <div class="number">{total_domains}</div>
-                <div class="label">Active Domains</div>
-            </div>
-            <div class="stat-card {'warning' if total_orphans > 0 else 'success'}">
-                <div class="number">{total_orphans}</div>
-                <div class="label">Orphan Elements</div>
-            </div>
-            <div class="stat-card {'error' if total_errors > 0 else 'success'}">
-                <div class="number">{total_errors}</div>
-                <div class="label">Validation Errors</div>
-            </div>
-        </div>
-
-        <div class="section">
-            <h2>Domain Maturity</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Domain</th>
-                        <th>Elements</th>
-                        <th>Components</th>
-                        <th>Data Objects</th>
-                        <th>Views</th>
-                        <th>Maturity</th>
-                    </tr>
-                </thead>
-                <tbody>'''
+    Templates use {{name}} slots; the split is cached per path so repeated
+    renders (tests, watchers) only read and parse the file once.
+    """
+    path = Path(path or TEMPLATE_PATH)
+    if path not in _TEMPLATES:
+        _TEMPLATES[path] = _SLOT.split(path.read_text(encoding="utf-8"))
+    return _TEMPLATES[path]
+
+
+def render_template(parts, slots, out):
+    """Write a compiled template to `out` chunk by chunk.
+
+    Scalar slot values are HTML-escaped; any other value is an iterable of
+    markup chunks (usually a generator) written as it is produced.
+    """
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            out.write(part)
+            continue
+        value = slots[part]
+        if isinstance(value, (str, int, float)):
+            out.write(html.escape(str(value)))
+        else:
+            for chunk in value:
+                out.write(chunk)
+
+
+def dashboard_data(validator_data):
+    """Orphan and error rows for the sidecar, as compact arrays."""
+    return {
+        "orphans": [[o.get("name", "Unknown"), o.get("location", "")]
+                    for o in validator_data.get("orphan_elements", [])],
+        "errors": [[e.get("element", "Unknown"), e.get("file", ""), e.get("layer", "")]
+                   for e in validator_data.get("errors", [])],
+    }
+
+
+def write_dashboard_data(data, path):
+    """Write the sidecar script that hands `data` to the page.
+
+    It is JSON wrapped in a single call rather than a bare .json file:
+    browsers block fetch() for pages opened from file://, but still load
+    a <script src> next to the page.
+    """
+    with registry_core.atomic_open(path) as f:
+        f.write("window.dashboardDataLoaded(")
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        f.write(");\n")
+    return path
 
+
+def build_summary(elements, validator_data, index, maturity, run=None):
+    """One history record: counts per layer/domain, issues and maturity."""
+    layers = index["layers"]
+    domains = index["domains"]
+    # A validator that failed to run has no counts; None keeps it off the sparklines
+    failed = validator_data.get("status") == "ERROR"
+    return {
+        "run": run or datetime.now().isoformat(timespec="seconds"),
+        "elements": len(elements),
+        "orphans": None if failed else len(validator_data.get("orphan_elements", [])),
+        "errors": None if failed else len(validator_data.get("errors", [])),
+        "status": validator_data.get("status", "UNKNOWN"),
+        "layers": {layer: layers[layer]["total"] for layer in LAYER_ORDER if layer in layers},
+        "domains": {
+            domain: {
+                "elements": domains[domain]["total"] if domain in domains else 0,
+                "maturity": maturity[domain]["score"] if domain in maturity else None,
+            }
+            for domain in sorted(set(domains) | set(maturity))
+        },
+    }
+
+
+def append_history(path, record):
+    """Append one run to the history file; O(1) apart from rare compaction.
+
+    A line torn by an interrupted run is terminated first so the new
+    record always starts on its own line. Returns True if the file was
+    compacted.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n"
+    with open(path, "ab+") as f:
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line
+        f.write(line.encode("utf-8"))
+        size = f.tell()
+    if size > HISTORY_COMPACT_BYTES:
+        compact_history(path)
+        return True
+    return False
+
+
+def _parse_history_lines(lines):
+    records = []
+    for raw in lines:
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue  # torn or hand-edited line
+        if isinstance(record, dict) and "run" in record:
+            records.append(record)
+    return records
+
+
+def read_history(path, limit=HISTORY_WINDOW, block_size=64 * 1024):
+    """The last `limit` runs, oldest first.
+
+    Reads backwards from the end of the file in blocks until enough lines
+    are found, so the cost depends on the window, not on the history size.
+    """
+    if limit <= 0:
+        return []
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return []
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        data = b""
+        # One extra line: the first one in the buffer may be partial
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]
+    return _parse_history_lines(lines[-limit:])
+
+
+def thin_history(records, full_runs=HISTORY_FULL_RUNS, weekly_days=HISTORY_WEEKLY_DAYS):
+    """Downsample old runs: the last `full_runs` stay, older ones are kept
+    as the latest run of each ISO week (or month, past `weekly_days`)."""
+    if len(records) <= full_runs:
+        return list(records)
+    recent = records[-full_runs:]
+    newest = None
+    for record in reversed(records):
+        try:
+            newest = datetime.fromisoformat(record["run"])
+            break
+        except (TypeError, ValueError):
+            continue
+    if newest is None:
+        return recent
+    kept = {}
+    for record in records[:-full_runs]:
+        try:
+            when = datetime.fromisoformat(record["run"])
+        except (TypeError, ValueError):
+            continue
+        if (newest - when).days > weekly_days:
+            bucket = ("m", when.year, when.month)
+        else:
+            bucket = ("w",) + tuple(when.isocalendar()[:2])
+        kept[bucket] = record  # later runs overwrite earlier ones
+    return list(kept.values()) + recent
+
+
+def compact_history(path):
+    """Rewrite the history with old runs thinned (see thin_history)."""
+    with open(path, "rb") as f:
+        records = _parse_history_lines(f)
+    kept = thin_history(records)
+
+    with registry_core.atomic_open(path) as out:
+        for record in kept:
+            out.write(json.dumps(record, separators=(",", ":"), sort_keys=True) + "\n")
+    return len(records) - len(kept)
+
+
+def sparkline(values, width=120, height=28):
+    """Inline SVG polyline of a numeric series; None values are skipped."""
+    points = [(i, v) for i, v in enumerate(values) if v is not None]
+    if not points:
+        return ""
+    low = min(v for _, v in points)
+    high = max(v for _, v in points)
+    span = (high - low) or 1
+    step = width / max(len(values) - 1, 1)
+    coords = " ".join(
+        f"{i * step:.1f},{height - 2 - (v - low) / span * (height - 4):.1f}" for i, v in points
+    )
+    last_x, last_y = coords.rsplit(" ", 1)[-1].split(",")
+    title = html.escape(f"{len(points)} runs: min {low}, max {high}, latest {points[-1][1]}")
+    return (
+        f'<svg class="sparkline" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f"<title>{title}</title>"
+        f'<polyline points="{coords}"/><circle cx="{last_x}" cy="{last_y}" r="2"/></svg>'
+    )
+
+
+def _trend_cards(history):
+    series = [("Total Elements", "elements"), ("Orphan Elements", "orphans"),
+              ("Validation Errors", "errors")]
+    for label, key in series:
+        values = [r.get(key) for r in history]
+        yield f'''
+                <div class="trend">
+                    <div class="label">{label}</div>
+                    {sparkline(values)}
+                </div>'''
+    for layer in LAYER_ORDER:
+        values = [r.get("layers", {}).get(layer) for r in history]
+        if any(values):
+            yield f'''
+                <div class="trend">
+                    <div class="label">{layer.title()} elements</div>
+                    {sparkline(values)}
+                </div>'''
+
+
+def _maturity_rows(domain_stats, maturity, history):
     for domain in KNOWN_DOMAINS:
+        trend = sparkline([r.get("domains", {}).get(domain, {}).get("maturity") for r in history],
+                          width=80, height=20)
         stats = domain_stats.get(domain, {"total": 0, "by_type": {}})
         mat = maturity.get(domain, {"score": 0, "max_score": 5})
         pct = (mat["score"] / mat["max_score"]) * 100
         bar_class = "low" if pct < 40 else ("medium" if pct < 70 else "")
-
-        html += f'''
+        yield f'''
                     <tr>
-                        <td><strong>{domain}</strong></td>
+                        <td><strong>{html.escape(domain)}</strong></td>
                         <td>{stats["total"]}</td>
                         <td>{"✓" if mat.get("has_components") else "—"}</td>
                         <td>{"✓" if mat.get("has_data") else "—"}</td>
@@ -404,103 +440,102 @@ def generate_html(elements, validator_data, output_path):
                             </div>
                             <small>{mat["score"]}/{mat["max_score"]}</small>
                         </td>
+                        <td>{trend}</td>
                     </tr>'''
 
-    html += '''
-                </tbody>
-            </table>
-        </div>
-
-        <div class="section">
-            <h2>Registry by Layer</h2>
-            <div class="layer-bar">'''
 
+def _layer_bar(layer_stats):
     total = sum(layer_stats.get(l, {}).get("total", 0) for l in LAYER_ORDER)
     for layer in LAYER_ORDER:
         count = layer_stats.get(layer, {}).get("total", 0)
         if count > 0:
             pct = (count / total) * 100 if total > 0 else 0
-            html += f'<div class="layer-{layer}" style="width: {pct}%">{layer.title()} ({count})</div>'
+            yield f'<div class="layer-{layer}" style="width: {pct}%">{layer.title()} ({count})</div>'
 
-    html += '''
-            </div>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Layer</th>
-                        <th>Count</th>
-                        <th>Element Types</th>
-                    </tr>
-                </thead>
-                <tbody>'''
 
+def _layer_rows(layer_stats):
     for layer in LAYER_ORDER:
         stats = layer_stats.get(layer, {"total": 0, "by_type": {}})
         if stats["total"] > 0:
             types = ", ".join(f"{t} ({c})" for t, c in sorted(stats["by_type"].items()))
-            html += f'''
+            yield f'''
                     <tr>
                         <td><strong>{layer.title()}</strong></td>
                         <td>{stats["total"]}</td>
-                        <td>{types}</td>
+                        <td>{html.escape(types)}</td>
                     </tr>'''
 
-    html += '''
-                </tbody>
-            </table>
-        </div>'''
-
-    # Orphans section
-    if orphans:
-        html += '''
-        <div class="section">
-            <h2>Orphan Elements</h2>
-            <p style="margin-bottom: 15px; color: #666;">Elements registered but not used in any diagram:</p>
-            <div class="issues-list">'''
-        for orphan in orphans[:20]:  # Limit to 20
-            html += f'''
-                <div class="issue-item warning">
-                    <strong>{orphan.get("name", "Unknown")}</strong>
-                    <br><small>{orphan.get("location", "")}</small>
-                </div>'''
-        if len(orphans) > 20:
-            html += f'<p style="color: #666; padding: 10px;">... and {len(orphans) - 20} more</p>'
-        html += '''
-            </div>
-        </div>'''
-
-    # Validation errors section
-    if errors:
-        html += '''
-        <div class="section">
-            <h2>Validation Errors</h2>
-            <p style="margin-bottom: 15px; color: #666;">Elements in diagrams but not in registry:</p>
-            <div class="issues-list">'''
-        for err in errors[:20]:
-            html += f'''
-                <div class="issue-item">
-                    <strong>{err.get("element", "Unknown")}</strong>
-                    <br><small>{err.get("file", "")} — layer: {err.get("layer", "")}</small>
-                </div>'''
-        if len(errors) > 20:
-            html += f'<p style="color: #666; padding: 10px;">... and {len(errors) - 20} more</p>'
-        html += '''
-            </div>
-        </div>'''
-
-    html += f'''
-        <p class="timestamp">Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-    </div>
-</body>
-</html>'''
-
-    output_path.write_text(html)
+
+def generate_html(elements, validator_data, output_path, history_path=None,
+                  window=HISTORY_WINDOW):
+    """Generate the HTML dashboard and its data sidecar.
+
+    The page is rendered from templates/dashboard.html straight into the
+    output file. Orphan and error lists go to DATA_FILENAME next to it and
+    are loaded and paginated by the page, so the HTML stays the same size
+    however many issues there are.
+
+    With `history_path`, this run's summary is appended to that file and
+    the last `window` runs are drawn as trend sparklines.
+    """
+    output_path = Path(output_path)
+    index = build_domain_index(elements)
+    domain_stats = calculate_domain_stats(elements, index)
+    layer_stats = calculate_layer_stats(elements, index)
+
+    # Calculate maturity for each domain
+    maturity = {}
+    for domain in KNOWN_DOMAINS:
+        maturity[domain] = get_domain_maturity(domain, elements, validator_data, index)
+
+    history = []
+    if history_path is not None:
+        append_history(Path(history_path), build_summary(elements, validator_data, index, maturity))
+        history = read_history(Path(history_path), window)
+
+    data = dashboard_data(validator_data)
+    total_orphans = len(data["orphans"])
+    total_errors = len(data["errors"])
+    write_dashboard_data(data, output_path.with_name(DATA_FILENAME))
+
+    slots = {
+        "total_elements": len(elements),
+        "total_domains": len(set(e["domain"] for e in elements if e["domain"])),
+        "total_orphans": total_orphans,
+        "total_errors": total_errors,
+        "orphan_class": "warning" if total_orphans > 0 else "success",
+        "error_class": "error" if total_errors > 0 else "success",
+        "orphans_hidden": "" if total_orphans else "hidden",
+        "errors_hidden": "" if total_errors else "hidden",
+        "maturity_rows": _maturity_rows(domain_stats, maturity, history),
+        "trends": _trend_cards(history),
+        "trends_hidden": "" if len(history) > 1 else "hidden",
+        "trend_runs": len(history),
+        "layer_bar": _layer_bar(layer_stats),
+        "layer_rows": _layer_rows(layer_stats),
+        "data_file": DATA_FILENAME,
+        "page_size": PAGE_SIZE,
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    parts = compile_template()
+    with registry_core.atomic_open(output_path) as f:
+        render_template(parts, slots, f)
     return output_path
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate architecture model dashboard")
     parser.add_argument("-o", "--output", default=".", help="Output directory")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Re-parse every registry file, ignoring .cache/registry/")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Parallel registry parser processes (default: CPU count)")
+    parser.add_argument("--history", default=None,
+                        help=f"Run history file (default: <output>/{HISTORY_FILENAME})")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Do not record this run or draw trends")
+    parser.add_argument("--window", type=int, default=HISTORY_WINDOW,
+                        help=f"Runs shown in trend sparklines (default: {HISTORY_WINDOW})")
     args = parser.parse_args()
 
     print("=" * 60)
@@ -509,11 +544,11 @@ def main():
 
     # Load data
     print("\nLoading registry...")
-    elements = load_registry()
+    elements = load_registry(use_cache=not args.no_cache, jobs=args.jobs)
     print(f"  Found {len(elements)} elements")
 
     print("\nRunning validator...")
-    validator_data = run_validator()
+    validator_data = run_validator(elements, use_cache=not args.no_cache)
     print(f"  Status: {validator_data.get('status', 'UNKNOWN')}")
 
     # Generate dashboard
@@ -521,9 +556,16 @@ def main():
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / "dashboard.html"
 
+    history_path = None
+    if not args.no_history:
+        history_path = Path(args.history) if args.history else output_dir / HISTORY_FILENAME
+
     print(f"\nGenerating dashboard...")
-    generate_html(elements, validator_data, output_file)
+    generate_html(elements, validator_data, output_file, history_path, args.window)
     print(f"  Output: {output_file}")
+    print(f"  Data:   {output_dir / DATA_FILENAME}")
+    if history_path:
+        print(f"  History: {history_path}")
 
     print("\n" + "=" * 60)
     print(f"Dashboard generated: {output_file}")
@@ -7,9 +7,16 @@ import only what they need. Each library file contains shapes with
 embedded properties (owner, domain, status, specialization) visible
 in draw.io's "Edit Data" panel.
 
+Only libraries whose member elements changed are regenerated: each
+library's inputs are hashed and recorded in libraries/.manifest.json
+together with a hash of the file written, and a library is left alone
+while both still match.
+
 Usage:
     python3 scripts/generate_library.py
     # Creates libraries/<domain>/<element-type>.xml
+    python3 scripts/generate_library.py --check    # Exit 1 if any library is stale; writes nothing
+    python3 scripts/generate_library.py --force    # Regenerate every library
 
 Output structure:
     libraries/
@@ -27,16 +34,25 @@ Output structure:
       ...
 """
 
+import argparse
+import hashlib
 import json
 import html
-import frontmatter
+import sys
 from pathlib import Path
 from collections import defaultdict
 
+import registry_core
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 REGISTRY_DIR = REPO_ROOT / "registry"
 LIBRARIES_DIR = REPO_ROOT / "libraries"
 
+# Input and output hashes of every generated library, relative to LIBRARIES_DIR
+MANIFEST_NAME = ".manifest.json"
+# Bump when the library file format changes, so every library is stale
+GENERATOR_VERSION = 1
+
 # ArchiMate layer fill colors (from real draw.io ArchiMate stencils)
 LAYER_COLORS = {
     "application": "#99ffff",
@@ -134,36 +150,9 @@ DEFAULT_HEIGHT = 80
 
 def load_registry():
     """Load all registered elements from the registry."""
-    elements = []
-    if not REGISTRY_DIR.exists():
-        return elements
-
-    for md_file in REGISTRY_DIR.rglob("*.md"):
-        if md_file.name == "_template.md":
-            continue
-        try:
-            post = frontmatter.load(md_file)
-            if "name" not in post.metadata:
-                continue
-
-            rel = md_file.relative_to(REGISTRY_DIR)
-            parts = rel.parts
-            layer = parts[0] if len(parts) > 1 else "unknown"
-            element_type = parts[1] if len(parts) > 2 else "unknown"
-
-            elements.append({
-                "name": post.metadata["name"].strip(),
-                "layer": layer,
-                "element_type": element_type,
-                "domain": post.metadata.get("domain", ""),
-                "owner": post.metadata.get("owner", ""),
-                "status": post.metadata.get("status", "active"),
-                "specialization": post.metadata.get("specialization", ""),
-            })
-        except Exception as e:
-            print(f"  WARNING: Could not parse {md_file}: {e}")
-
-    return elements
+    registry = registry_core.load_registry(REGISTRY_DIR, REPO_ROOT)
+    # Shapes default to "active" when the entry has no status field at all
+    return [{**e, "status": e["metadata"].get("status", "active")} for e in registry]
 
 
 def create_shape_xml(element):
@@ -235,15 +224,149 @@ def create_shape_xml(element):
     }
 
 
+def library_category(element):
+    """Library a shape goes in: its specialization, else its element type.
+
+    Specializations are kebab-cased for filenames (e.g. "Data Concepts"
+    -> "data-concepts").
+    """
+    spec = element.get("specialization", "").strip()
+    if spec:
+        return spec.lower().replace(" ", "-")
+    return element["element_type"]
+
+
+def group_libraries(elements):
+    """Map "<domain>/<domain>.<category>.xml" to its elements, sorted by name.
+
+    Elements without a domain go in "cross-cutting".
+    """
+    groups = defaultdict(list)
+    for elem in elements:
+        domain = elem.get("domain") or "cross-cutting"
+        # Filename encodes the full path: <domain>.<category>.xml
+        # This shows clearly in draw.io's shapes panel when multiple
+        # domain libraries are imported side by side
+        groups[f"{domain}/{domain}.{library_category(elem)}.xml"].append(elem)
+    return {rel: sorted(groups[rel], key=lambda x: x["name"]) for rel in sorted(groups)}
+
+
+def library_inputs_hash(elements):
+    """SHA-256 of everything create_shape_xml reads for these elements."""
+    fields = [
+        [
+            e["name"], e["layer"], e["element_type"], e.get("owner", ""), e.get("domain", ""),
+            e.get("status", "active"), e.get("specialization") or "",
+            ELEMENT_TYPE_SHAPES.get((e["layer"], e["element_type"])), LAYER_COLORS.get(e["layer"]),
+        ]
+        for e in elements
+    ]
+    payload = json.dumps([GENERATOR_VERSION, DEFAULT_WIDTH, DEFAULT_HEIGHT, fields],
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def render_library(library_items):
+    """Bytes of a draw.io library file."""
+    library_json = json.dumps(library_items, indent=2)
+    return f"<mxlibrary>{library_json}</mxlibrary>\n".encode("utf-8")
+
+
 def write_library(library_items, output_path):
     """Write a draw.io library file."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    library_json = json.dumps(library_items, indent=2)
-    output_path.write_text(f"<mxlibrary>{library_json}</mxlibrary>\n")
+    registry_core.write_atomically(output_path, render_library(library_items))
     return len(library_items)
 
 
+def load_manifest(libraries_dir):
+    """Recorded hashes by library path; empty if missing or unreadable."""
+    try:
+        manifest = json.loads((libraries_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    libraries = manifest.get("libraries") if isinstance(manifest, dict) else None
+    return libraries if isinstance(libraries, dict) else {}
+
+
+def save_manifest(libraries_dir, libraries):
+    data = json.dumps({"libraries": dict(sorted(libraries.items()))}, indent=2, sort_keys=True)
+    libraries_dir.mkdir(parents=True, exist_ok=True)
+    registry_core.write_atomically(libraries_dir / MANIFEST_NAME, data + "\n")
+
+
+def stale_reason(entry, inputs, path):
+    """Why a library must be regenerated, or None if it is up to date."""
+    if entry is None:
+        return "new"
+    if entry.get("inputs") != inputs:
+        return "changed"
+    if registry_core.file_sha256(path) != entry.get("output"):
+        return "missing" if not path.exists() else "edited"
+    return None
+
+
+def generate_libraries(elements, libraries_dir=None, check=False, force=False):
+    """Regenerate the libraries whose inputs changed.
+
+    Returns {"libraries": {rel_path: {"status", "shapes"}}, "removed": [...]}
+    where status is "unchanged" or the stale reason ("new", "changed",
+    "missing", "edited", "forced"). Groups with no mappable shape get no
+    file and are not listed. Libraries recorded in the manifest that no
+    longer have elements are deleted and listed in "removed". With
+    check=True nothing is written or deleted.
+    """
+    libraries_dir = Path(libraries_dir or LIBRARIES_DIR)
+    manifest = load_manifest(libraries_dir)
+    recorded = {}
+    results = {}
+
+    for rel, elems in group_libraries(elements).items():
+        path = libraries_dir / rel
+        inputs = library_inputs_hash(elems)
+        entry = manifest.get(rel)
+        reason = "forced" if force else stale_reason(entry, inputs, path)
+        if reason is None:
+            recorded[rel] = entry
+            if entry.get("output") is not None:
+                results[rel] = {"status": "unchanged", "shapes": entry.get("shapes", 0)}
+            continue
+        if check:
+            results[rel] = {"status": reason, "shapes": len(elems)}
+            continue
+
+        library_items = [shape for shape in map(create_shape_xml, elems) if shape]
+        if library_items:
+            data = render_library(library_items)
+            output = hashlib.sha256(data).hexdigest()
+            if registry_core.file_sha256(path) != output:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                registry_core.write_atomically(path, data)
+            results[rel] = {"status": reason, "shapes": len(library_items)}
+        else:
+            # No element has a shape mapping: record it so it is not
+            # retried every run, but leave no file behind
+            output = None
+            path.unlink(missing_ok=True)
+        recorded[rel] = {"inputs": inputs, "output": output, "shapes": len(library_items)}
+
+    removed = sorted(rel for rel in manifest if rel not in recorded and rel not in results)
+    if not check:
+        for rel in removed:
+            (libraries_dir / rel).unlink(missing_ok=True)
+        if recorded != manifest:
+            save_manifest(libraries_dir, recorded)
+    return {"libraries": results, "removed": removed}
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Generate draw.io libraries from the registry")
+    parser.add_argument("--check", action="store_true",
+                        help="Report stale libraries and exit 1 if any; write nothing")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate every library even if its elements did not change")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("draw.io Library Generator")
     print("=" * 60)
@@ -256,47 +379,29 @@ def main():
     if specs:
         print(f"  Including {len(specs)} specialized elements")
 
-    # Group elements by domain, then by library category
-    # Use specialization name when available (e.g., "Systems", "Data Concepts")
-    # Fall back to ArchiMate element type when no specialization exists
-    by_domain_category = defaultdict(lambda: defaultdict(list))
-    for elem in elements:
-        domain = elem.get("domain") or "cross-cutting"
-        spec = elem.get("specialization", "").strip()
-        if spec:
-            # Normalize specialization to kebab-case for filenames
-            category = spec.lower().replace(" ", "-")
-        else:
-            category = elem["element_type"]
-        by_domain_category[domain][category].append(elem)
-
-    # Generate per-domain/category libraries
-    print(f"\nGenerating per-domain libraries...")
-    total_files = 0
-    total_shapes = 0
-
-    for domain in sorted(by_domain_category.keys()):
-        categories = by_domain_category[domain]
-        for category in sorted(categories.keys()):
-            elems = sorted(categories[category], key=lambda x: x["name"])
-            library_items = []
-            for elem in elems:
-                shape = create_shape_xml(elem)
-                if shape:
-                    library_items.append(shape)
-
-            if library_items:
-                # Filename encodes the full path: <domain>.<category>.xml
-                # This shows clearly in draw.io's shapes panel when multiple
-                # domain libraries are imported side by side
-                filename = f"{domain}.{category}.xml"
-                output_path = LIBRARIES_DIR / domain / filename
-                count = write_library(library_items, output_path)
-                total_files += 1
-                total_shapes += count
-                print(f"  {domain}/{filename} — {count} shapes")
-
-    print(f"\nGenerated {total_files} library files with {total_shapes} total shapes")
+    print("\nChecking per-domain libraries..." if args.check else "\nGenerating per-domain libraries...")
+    result = generate_libraries(elements, check=args.check, force=args.force)
+    libraries = result["libraries"]
+    stale = {rel: r for rel, r in libraries.items() if r["status"] != "unchanged"}
+
+    for rel, r in stale.items():
+        print(f"  {rel} — {r['shapes']} shapes ({r['status']})")
+    for rel in result["removed"]:
+        print(f"  {rel} — {'stale' if args.check else 'removed'} (no elements left)")
+
+    unchanged = len(libraries) - len(stale)
+    total_shapes = sum(r["shapes"] for r in libraries.values())
+    if args.check:
+        if stale or result["removed"]:
+            print(f"\nFAILED - {len(stale) + len(result['removed'])} stale library file(s), "
+                  f"{unchanged} up to date")
+            print("Run: python3 scripts/generate_library.py")
+            return 1
+        print(f"\nAll {unchanged} library files are up to date")
+        return 0
+
+    print(f"\nGenerated {len(stale)} library files, {unchanged} unchanged "
+          f"({len(libraries)} files, {total_shapes} total shapes)")
     print(f"Output: {LIBRARIES_DIR}/")
 
     print("\nTo use in draw.io:")
@@ -305,7 +410,8 @@ def main():
     print("  3. Click 'Open Library from' → 'Device'")
     print("  4. Select a library from libraries/<domain>/<type>.xml")
     print("  5. Import as many domain libraries as you need")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
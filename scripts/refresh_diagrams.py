@@ -10,19 +10,24 @@ Usage:
     python scripts/refresh_diagrams.py                    # Refresh all diagrams
     python scripts/refresh_diagrams.py views/customer-management/*.drawio  # Specific files
     python scripts/refresh_diagrams.py --dry-run          # Preview changes
+    python scripts/refresh_diagrams.py --jobs 4           # Refresh across 4 processes
+    python scripts/refresh_diagrams.py --wrap-plain-cells # Also upgrade plain shapes
+
+Files are rewritten atomically (temp file + rename), so an interrupted
+run never leaves a truncated .drawio behind.
 """
 
 import argparse
-import base64
 import copy
+import io
 import sys
-import urllib.parse
+import time
 import xml.etree.ElementTree as ET
-import zlib
 from collections import defaultdict
 from pathlib import Path
 
-import frontmatter
+import registry_core
+from drawio_io import decode_diagram_content, encode_diagram_content
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 REGISTRY_DIR = REPO_ROOT / "registry"
@@ -47,61 +52,68 @@ SYNC_FIELDS = {
 }
 
 
-def load_registry():
-    """Load all registered elements with their metadata."""
+def load_registry(use_cache=True):
+    """Load all registered elements with their metadata, keyed by name.
+
+    The name index used for case-insensitive matching is built here too.
+    """
     elements = {}
-    if not REGISTRY_DIR.exists():
-        return elements
+    for elem in registry_core.load_registry(REGISTRY_DIR, REPO_ROOT, use_cache=use_cache):
+        elements[elem["name"]] = {
+            "file": elem["file"],
+            **elem["metadata"],
+        }
+    get_name_index(elements)
+    return elements
 
-    for md_file in REGISTRY_DIR.rglob("*.md"):
-        if md_file.name == "_template.md":
-            continue
-        try:
-            post = frontmatter.load(md_file)
-            if "name" not in post.metadata:
-                continue
 
-            name = post.metadata["name"].strip()
-            elements[name] = {
-                "file": str(md_file.relative_to(REPO_ROOT)),
-                **post.metadata,
-            }
-        except Exception as e:
-            print(f"  WARNING: Could not parse {md_file}: {e}")
+def normalize_name(name):
+    """Casefolded, whitespace-collapsed form of a name, for matching."""
+    return " ".join(str(name).casefold().split())
 
-    return elements
 
+def entry_aliases(entry):
+    """An entry's aliases, from a list or a comma-separated string."""
+    aliases = entry.get("aliases") or []
+    if isinstance(aliases, str):
+        aliases = aliases.split(",")
+    return [str(a).strip() for a in aliases if a is not None and str(a).strip()]
 
-def decode_diagram_content(encoded):
-    """Decode draw.io's compressed diagram content."""
-    try:
-        # URL decode
-        decoded = urllib.parse.unquote(encoded)
-        # Base64 decode
-        decoded_bytes = base64.b64decode(decoded)
-        # Decompress (deflate)
-        xml_str = zlib.decompress(decoded_bytes, -zlib.MAX_WBITS).decode("utf-8")
-        return xml_str
-    except Exception:
-        # Not encoded, return as-is
-        return encoded
-
-
-def encode_diagram_content(xml_str):
-    """Encode diagram content back to draw.io's compressed format."""
-    try:
-        # Compress (deflate)
-        compressed = zlib.compress(xml_str.encode("utf-8"), 9)
-        # Remove zlib header (first 2 bytes) and checksum (last 4 bytes)
-        deflated = compressed[2:-4]
-        # Base64 encode
-        b64 = base64.b64encode(deflated).decode("utf-8")
-        # URL encode
-        encoded = urllib.parse.quote(b64, safe="")
-        return encoded
-    except Exception as e:
-        print(f"  WARNING: Could not encode diagram: {e}")
-        return xml_str
+
+def build_name_index(registry):
+    """Map each normalized name and alias to the registry names it identifies."""
+    index = defaultdict(list)
+    for name, entry in registry.items():
+        for key in dict.fromkeys(normalize_name(n) for n in [name, *entry_aliases(entry)]):
+            index[key].append(name)
+    return dict(index)
+
+
+def name_index_key(registry):
+    """Everything the name index depends on: each name with its aliases."""
+    return tuple((name, tuple(entry_aliases(entry))) for name, entry in registry.items())
+
+
+# Name index of the registry last seen, keyed by its names and aliases, so
+# an alias edited in place (same dict, same size) rebuilds it
+_NAME_INDEX = {"key": None, "index": {}}
+
+
+def get_name_index(registry):
+    """The registry's name index, rebuilt only when a name or alias changed.
+
+    Checking the key is a pass over the registry, so callers matching many
+    labels fetch the index once and pass it to match_registry_names.
+    """
+    key = name_index_key(registry)
+    if _NAME_INDEX["key"] != key:
+        _NAME_INDEX.update(key=key, index=build_name_index(registry))
+    return _NAME_INDEX["index"]
+
+
+def ambiguous_names(registry):
+    """Normalized names/aliases shared by more than one registry entry."""
+    return {key: names for key, names in get_name_index(registry).items() if len(names) > 1}
 
 
 def get_cell_label(cell):
@@ -123,23 +135,49 @@ def clean_label(label):
     return clean.strip()
 
 
-def find_matching_registry_entry(label, registry):
-    """Find a registry entry matching the label."""
+def match_registry_names(label, registry, index=None):
+    """Registry names a label could refer to.
+
+    An exact name match is the only candidate; otherwise every entry whose
+    name or alias matches ignoring case and whitespace. More than one
+    candidate means the label is ambiguous. index is the registry's name
+    index, if the caller already has it.
+    """
     clean = clean_label(label)
     if not clean:
-        return None
+        return []
 
     # Exact match
     if clean in registry:
-        return registry[clean]
+        return [clean]
 
-    # Case-insensitive match
-    lower = clean.lower()
-    for name, entry in registry.items():
-        if name.lower() == lower:
-            return entry
+    # Case-insensitive match on names and aliases
+    if index is None:
+        index = get_name_index(registry)
+    return index.get(normalize_name(clean), [])
 
-    return None
+
+def find_matching_registry_entry(label, registry):
+    """Find a registry entry matching the label (None if none or ambiguous)."""
+    names = match_registry_names(label, registry)
+    if len(names) != 1:
+        return None
+    return registry[names[0]]
+
+
+def registry_properties(registry_entry):
+    """Diagram properties for a registry entry (diagram property -> string value)."""
+    props = {}
+    for reg_field, diagram_prop in SYNC_FIELDS.items():
+        value = registry_entry.get(reg_field)
+        if value is None:
+            continue
+        # Convert lists to comma-separated strings
+        if isinstance(value, list):
+            props[diagram_prop] = ", ".join(str(v) for v in value)
+        else:
+            props[diagram_prop] = str(value)
+    return props
 
 
 def update_cell_with_registry_data(cell, registry_entry, dry_run=False):
@@ -149,42 +187,103 @@ def update_cell_with_registry_data(cell, registry_entry, dry_run=False):
 
     changes = []
 
-    # If it's a plain mxCell, we need to wrap it in an object to add custom properties
+    # A plain mxCell has nowhere to hold custom properties; wrap_plain_cells
+    # turns matching ones into objects first (--wrap-plain-cells)
     if cell.tag == "mxCell":
-        # We can't easily wrap in-place, so we'll add properties via style
-        # For now, skip plain mxCells - only update objects
         return False
 
     # For object elements, add/update attributes
-    for reg_field, diagram_prop in SYNC_FIELDS.items():
-        if reg_field in registry_entry:
-            value = registry_entry[reg_field]
-            if value is None:
+    for diagram_prop, value in registry_properties(registry_entry).items():
+        current = cell.get(diagram_prop, "")
+        if current != value:
+            changes.append((diagram_prop, current, value))
+            if not dry_run:
+                cell.set(diagram_prop, value)
+
+    return len(changes) > 0, changes
+
+
+def wrap_cell_in_object(cell):
+    """Build an <object> around a plain mxCell.
+
+    The object takes the cell's id (so edges, children and other
+    references still resolve) and its value as label.
+    """
+    obj = ET.Element("object", {"label": cell.get("value", ""), "id": cell.get("id")})
+    inner = ET.SubElement(obj, "mxCell", {k: v for k, v in cell.attrib.items()
+                                          if k not in ("id", "value")})
+    inner.text = cell.text
+    inner.extend(list(cell))
+    obj.tail = cell.tail
+    return obj
+
+
+def wrap_plain_cells(tab_root, registry, dry_run=False):
+    """Wrap plain vertex mxCells that match the registry in <object> elements.
+
+    One pass over the children of each <root> in the tab. A wrapped cell
+    is replaced in place, so document order (z-order) is kept. Only cells
+    matching exactly one entry with something to sync are wrapped. In a
+    dry run the objects are built but not inserted.
+
+    Returns (new objects, ambiguous matches as (label, candidate names)).
+    """
+    wrapped = []
+    ambiguous = []
+    index = get_name_index(registry)
+    for container in tab_root.iter("root"):
+        for i, cell in enumerate(list(container)):
+            if (cell.tag != "mxCell" or cell.get("vertex") != "1" or not cell.get("id")
+                    or "edgeLabel" in cell.get("style", "")):
                 continue
+            label = get_cell_label(cell)
+            if not label:
+                continue
+            names = match_registry_names(label, registry, index)
+            if len(names) > 1:
+                ambiguous.append((clean_label(label), names))
+                continue
+            if not names or not registry_properties(registry[names[0]]):
+                continue
+            obj = wrap_cell_in_object(cell)
+            if not dry_run:
+                container[i] = obj
+            wrapped.append(obj)
+    return wrapped, ambiguous
 
-            # Convert lists to comma-separated strings
-            if isinstance(value, list):
-                value = ", ".join(str(v) for v in value)
-            else:
-                value = str(value)
 
-            current = cell.get(diagram_prop, "")
-            if current != value:
-                changes.append((diagram_prop, current, value))
-                if not dry_run:
-                    cell.set(diagram_prop, value)
+def display_path(path):
+    """Path relative to the repo root when inside it, for reports."""
+    path = Path(path)
+    return str(path.relative_to(REPO_ROOT)) if path.is_relative_to(REPO_ROOT) else str(path)
 
-    return len(changes) > 0, changes
 
+def serialize_tree(tree):
+    """The bytes tree.write() would put in a .drawio file."""
+    buf = io.BytesIO()
+    tree.write(buf, encoding="utf-8", xml_declaration=True)
+    return buf.getvalue()
 
-def refresh_diagram(drawio_path, registry, dry_run=False, verbose=False):
-    """Refresh a single diagram with registry data."""
-    tree = ET.parse(drawio_path)
+
+def refresh_diagram(drawio_path, registry, dry_run=False, verbose=False, wrap_cells=False):
+    """Refresh a single diagram with registry data.
+
+    With wrap_cells, matching plain mxCells are first wrapped in objects
+    so they can carry the synced properties. Only tabs with updates are
+    re-encoded; unchanged compressed tabs keep their original payload.
+    The file is rewritten only if its bytes change.
+    """
+    start = time.perf_counter()
+    original = drawio_path.read_bytes()
+    tree = ET.ElementTree(ET.fromstring(original))
     root = tree.getroot()
 
     updates = []
+    changed_tabs = []
+    ambiguous = []
     total_cells = 0
     matched_cells = 0
+    index = get_name_index(registry)
 
     # Process all diagram tabs
     for diagram in root.findall(".//diagram"):
@@ -195,48 +294,118 @@ def refresh_diagram(drawio_path, registry, dry_run=False, verbose=False):
             # Compressed content
             xml_content = decode_diagram_content(diagram.text.strip())
             inner_root = ET.fromstring(f"<root>{xml_content}</root>")
-            cells = list(inner_root.iter("object"))
+            tab_root = inner_root
             is_compressed = True
         else:
             # Uncompressed content in mxGraphModel
-            cells = list(diagram.iter("object"))
+            tab_root = diagram
             is_compressed = False
 
+        wrapped = []
+        if wrap_cells:
+            wrapped, wrap_ambiguous = wrap_plain_cells(tab_root, registry, dry_run)
+            for label, names in wrap_ambiguous:
+                ambiguous.append({"tab": tab_name, "label": label, "candidates": names})
+        # Dry-run wrapping leaves the tree alone, so add the detached objects
+        cells = list(tab_root.iter("object")) + (wrapped if dry_run else [])
+        wrapped_ids = {id(obj) for obj in wrapped}
+
+        tab_updates = []
         for cell in cells:
             total_cells += 1
             label = get_cell_label(cell)
             if not label:
                 continue
 
-            entry = find_matching_registry_entry(label, registry)
+            names = match_registry_names(label, registry, index)
+            if len(names) > 1:
+                ambiguous.append({
+                    "tab": tab_name,
+                    "label": clean_label(label),
+                    "candidates": names,
+                })
+                continue
+            entry = registry[names[0]] if names else None
             if entry:
                 matched_cells += 1
                 updated, changes = update_cell_with_registry_data(cell, entry, dry_run)
                 if updated:
-                    updates.append({
+                    tab_updates.append({
                         "tab": tab_name,
                         "label": clean_label(label),
                         "changes": changes,
+                        "wrapped": id(cell) in wrapped_ids,
                     })
 
-        # If compressed, re-encode the content
-        if is_compressed and not dry_run and updates:
-            # Rebuild the inner XML
-            inner_xml = "".join(ET.tostring(c, encoding="unicode") for c in inner_root)
-            diagram.text = encode_diagram_content(inner_xml)
+        if tab_updates:
+            updates.extend(tab_updates)
+            changed_tabs.append(tab_name)
+            # If compressed, re-encode this tab's content (others keep their payload)
+            if is_compressed and not dry_run:
+                inner_xml = "".join(ET.tostring(c, encoding="unicode") for c in inner_root)
+                diagram.text = encode_diagram_content(inner_xml)
 
-    # Write back if there were updates
+    # Write back if there were updates and the bytes actually differ
+    written = False
     if updates and not dry_run:
-        tree.write(drawio_path, encoding="utf-8", xml_declaration=True)
+        data = serialize_tree(tree)
+        if data != original:
+            registry_core.write_atomically(drawio_path, data)
+            written = True
 
     return {
-        "file": str(drawio_path.relative_to(REPO_ROOT)),
+        "file": display_path(drawio_path),
         "total_cells": total_cells,
         "matched_cells": matched_cells,
         "updates": updates,
+        "changed_tabs": changed_tabs,
+        "written": written,
+        "ambiguous": ambiguous,
+        "seconds": time.perf_counter() - start,
     }
 
 
+# Registry (and its name index) for refresh workers, set once per process
+_WORKER_REGISTRY = None
+
+
+def _init_worker(registry, index):
+    global _WORKER_REGISTRY
+    _WORKER_REGISTRY = registry
+    _NAME_INDEX.update(key=name_index_key(registry), index=index)
+
+
+def _refresh_one(job):
+    """Worker: refresh one diagram, turning failures into an error result."""
+    drawio_path, dry_run, verbose, wrap_cells = job
+    start = time.perf_counter()
+    try:
+        return refresh_diagram(drawio_path, _WORKER_REGISTRY, dry_run, verbose, wrap_cells)
+    except Exception as e:
+        return {
+            "file": display_path(drawio_path),
+            "total_cells": 0,
+            "matched_cells": 0,
+            "updates": [],
+            "changed_tabs": [],
+            "written": False,
+            "ambiguous": [],
+            "seconds": time.perf_counter() - start,
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+
+def refresh_all(drawio_files, registry, dry_run=False, verbose=False, jobs=1, wrap_cells=False):
+    """Refresh many diagrams, across jobs processes if jobs > 1.
+
+    Each worker receives the registry and its name index once. Returns one
+    result per file, in input order.
+    """
+    index = get_name_index(registry)
+    jobs_list = [(path, dry_run, verbose, wrap_cells) for path in drawio_files]
+    return registry_core.run_jobs(_refresh_one, jobs_list, jobs, _init_worker, (registry, index))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Refresh draw.io diagrams with registry metadata."
@@ -256,6 +425,22 @@ def main():
         action="store_true",
         help="Show detailed output",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every registry file, ignoring .cache/registry/",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=1,
+        help="Diagrams refreshed in parallel processes (default: 1)",
+    )
+    parser.add_argument(
+        "--wrap-plain-cells",
+        action="store_true",
+        help="Wrap plain shapes that match the registry in <object> elements so they get metadata",
+    )
     args = parser.parse_args()
 
     print("=" * 60)
@@ -263,8 +448,15 @@ def main():
     print("=" * 60)
 
     # Load registry
-    registry = load_registry()
+    registry = load_registry(use_cache=not args.no_cache)
     print(f"\nLoaded {len(registry)} registry entries")
+    clashes = ambiguous_names(registry)
+    if clashes:
+        print(f"  WARNING: {len(clashes)} name(s)/alias(es) match more than one entry "
+              f"ignoring case and whitespace")
+        if args.verbose:
+            for names in clashes.values():
+                print(f"    {' / '.join(names)}")
 
     # Find diagram files
     if args.files:
@@ -283,32 +475,62 @@ def main():
         print("DRY RUN - no files will be modified\n")
 
     # Process each diagram
+    start = time.perf_counter()
+    results = refresh_all(drawio_files, registry, args.dry_run, args.verbose, args.jobs,
+                          args.wrap_plain_cells)
+    elapsed = time.perf_counter() - start
+
     total_updates = 0
-    for drawio_path in drawio_files:
-        result = refresh_diagram(drawio_path, registry, args.dry_run, args.verbose)
+    total_wrapped = 0
+    total_ambiguous = 0
+    errors = 0
+    for result in results:
+        if "error" in result:
+            print(f"  ERROR: {result['file']}: {result['error']}")
+            errors += 1
+            continue
+
+        for match in result["ambiguous"]:
+            print(f"  WARNING: {result['file']} [{match['tab']}]: '{match['label']}' "
+                  f"is ambiguous ({', '.join(match['candidates'])}), not updated")
+        total_ambiguous += len(result["ambiguous"])
 
         if result["updates"]:
             print(f"--- {result['file']} ---")
             print(f"  Matched {result['matched_cells']}/{result['total_cells']} cells")
             for update in result["updates"]:
-                print(f"  Updated: {update['label']}")
+                print(f"  {'Wrapped' if update['wrapped'] else 'Updated'}: {update['label']}")
                 if args.verbose:
                     for prop, old, new in update["changes"]:
                         old_str = f"'{old}'" if old else "(empty)"
                         print(f"    {prop}: {old_str} -> '{new}'")
             total_updates += len(result["updates"])
+            total_wrapped += sum(1 for u in result["updates"] if u["wrapped"])
         elif args.verbose:
             print(f"--- {result['file']} ---")
             print(f"  Matched {result['matched_cells']}/{result['total_cells']} cells (no changes)")
 
     # Summary
     print("\n" + "=" * 60)
+    for result in results:
+        status = "error" if "error" in result else f"{len(result['updates'])} updated"
+        print(f"  {result['seconds'] * 1000:7.0f} ms  {status:>11s}  {result['file']}")
+    print("-" * 60)
+    changed_files = sum(1 for r in results if r["updates"])
     if args.dry_run:
-        print(f"DRY RUN complete: {total_updates} cells would be updated")
+        print(f"DRY RUN complete: {total_updates} cells would be updated in {changed_files} file(s)")
     else:
-        print(f"Refresh complete: {total_updates} cells updated")
-
-    return 0
+        print(f"Refresh complete: {total_updates} cells updated in {changed_files} file(s)")
+    if total_wrapped:
+        print(f"Wrapped {total_wrapped} plain shape(s) in <object> elements")
+    if total_ambiguous:
+        print(f"Skipped {total_ambiguous} ambiguous label(s)")
+    if errors:
+        print(f"Errors: {errors} file(s)")
+    workers = registry_core.pool_size(args.jobs, len(drawio_files))
+    print(f"Time: {elapsed:.2f}s" + (f" with {workers} worker(s)" if workers > 1 else ""))
+
+    return 1 if errors else 0
 
 
 if __name__ == "__main__":
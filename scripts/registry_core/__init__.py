@@ -0,0 +1,47 @@
+"""
+Shared building blocks for the architecture-catalog scripts.
+
+    from registry_core import load_registry
+
+    registry = load_registry(REGISTRY_DIR)
+    for elem in registry:            # element dicts, path order
+        ...
+    registry.by_name["Order Service"]  # -> [element, ...]
+"""
+
+from registry_core.cache import FrontmatterCache
+from registry_core.fsutil import atomic_open, file_sha256, write_atomically
+from registry_core.frontmatter_reader import (
+    FrontmatterDocument,
+    parse_frontmatter_bytes,
+    read_frontmatter,
+)
+from registry_core.loader import (
+    CACHE_DIR,
+    Registry,
+    cache_path,
+    clear_memo,
+    default_jobs,
+    load_registry,
+    registry_files,
+)
+from registry_core.workers import pool_size, run_jobs
+
+__all__ = [
+    "CACHE_DIR",
+    "FrontmatterCache",
+    "FrontmatterDocument",
+    "Registry",
+    "atomic_open",
+    "cache_path",
+    "clear_memo",
+    "default_jobs",
+    "file_sha256",
+    "load_registry",
+    "parse_frontmatter_bytes",
+    "pool_size",
+    "read_frontmatter",
+    "registry_files",
+    "run_jobs",
+    "write_atomically",
+]
@@ -0,0 +1,171 @@
+"""
+Persistent per-file frontmatter cache.
+
+Each registry file's parsed frontmatter is stored under its path together
+with the file's mtime, size and SHA-256. On the next run:
+
+  - mtime and size unchanged     -> cached result, file is not read
+  - mtime/size changed, same hash -> cached result, stat refreshed
+  - content changed               -> file is re-parsed
+
+The whole cache is discarded when models/registry-mapping.yaml changes or
+the cache format version is bumped.
+"""
+
+from __future__ import annotations
+
+import pickle
+import time
+from pathlib import Path
+from typing import Any
+
+from registry_core.fsutil import atomic_open, file_sha256
+
+# Bump when the cached entry layout changes
+CACHE_VERSION = 2
+
+# Files modified this close to the last cache write may have changed again
+# within the same mtime tick without changing size ("racy" entries), so
+# their content hash is always re-checked.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes (empty string if unreadable)."""
+    return file_sha256(path) or ""
+
+
+class FrontmatterCache:
+    """On-disk map of file path -> parsed frontmatter result."""
+
+    def __init__(self, path: Path, mapping_hash: str = ""):
+        self.path = path
+        self.mapping_hash = mapping_hash
+        self.entries: dict[str, dict[str, Any]] = {}
+        self.saved_at_ns = 0
+        self.dirty = False
+        self.stats = {
+            "files": 0,
+            "hits": 0,
+            "revalidated": 0,
+            "parsed": 0,
+            "removed": 0,
+            "invalidated": None,
+        }
+
+    @classmethod
+    def open(cls, path: Path, mapping_path: Path | None = None) -> "FrontmatterCache":
+        """Load the cache at path, discarding it if stale or unreadable."""
+        mapping_hash = file_digest(mapping_path) if mapping_path else ""
+        cache = cls(path, mapping_hash)
+        if not path.exists():
+            return cache
+        try:
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            cache.stats["invalidated"] = "unreadable cache file"
+            return cache
+
+        if data.get("version") != CACHE_VERSION:
+            cache.stats["invalidated"] = "cache format changed"
+        elif data.get("mapping_hash") != mapping_hash:
+            cache.stats["invalidated"] = "registry-mapping.yaml changed"
+        else:
+            cache.entries = data.get("entries", {})
+            cache.saved_at_ns = data.get("saved_at_ns", 0)
+        if cache.stats["invalidated"]:
+            cache.dirty = True
+        return cache
+
+    def lookup(self, path: Path) -> Any:
+        """Return the cached result if path's mtime and size are unchanged, else None."""
+        self.stats["files"] += 1
+        entry = self.entries.get(str(path))
+        if entry is None:
+            return None
+        st = path.stat()
+        if not self.is_racy(entry) and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            self.stats["hits"] += 1
+            return entry["result"]
+        return None
+
+    def is_racy(self, entry: dict[str, Any]) -> bool:
+        """True if entry's file was modified too close to the last save to trust its stat."""
+        return entry["mtime_ns"] >= self.saved_at_ns - RACY_WINDOW_NS
+
+    def known_digest(self, path: Path) -> str | None:
+        """Content hash recorded for path, if any."""
+        entry = self.entries.get(str(path))
+        return entry["sha256"] if entry else None
+
+    def record(self, path: Path, mtime_ns: int, size: int, digest: str, result: Any) -> Any:
+        """Store a freshly parsed result for path and return it.
+
+        A result of None means the content hash matched the cached entry:
+        only the stat fields are refreshed and the cached result returned.
+        """
+        key = str(path)
+        entry = self.entries.get(key)
+        if result is None and entry is not None:
+            self.stats["revalidated"] += 1
+            # A racy entry stays racy until a save moves saved_at_ns past
+            # its mtime, so re-checking one must trigger that save
+            if self.is_racy(entry) or entry["mtime_ns"] != mtime_ns or entry["size"] != size:
+                entry["mtime_ns"] = mtime_ns
+                entry["size"] = size
+                self.dirty = True
+            return entry["result"]
+
+        self.entries[key] = {
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "sha256": digest,
+            "result": result,
+        }
+        self.stats["parsed"] += 1
+        self.dirty = True
+        return result
+
+    def prune(self, keep: set[str]):
+        """Drop entries for files that no longer exist in the scan."""
+        stale = [k for k in self.entries if k not in keep]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.stats["removed"] += len(stale)
+            self.dirty = True
+
+    def save(self):
+        """Write the cache if anything changed.
+
+        The pickle goes to a uniquely named temp file that is renamed into
+        place, so concurrent runs (e.g. validate and a pre-commit hook)
+        never interleave writes; the last complete save wins.
+        """
+        if not self.dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_open(self.path, "wb") as f:
+                pickle.dump({
+                    "version": CACHE_VERSION,
+                    "mapping_hash": self.mapping_hash,
+                    "saved_at_ns": time.time_ns(),
+                    "entries": self.entries,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self.dirty = False
+        except OSError:
+            # This run's results are already in memory; if .cache/registry/
+            # cannot be written, the next run simply parses the files again
+            pass
+
+    def format_stats(self) -> str:
+        """One-line human summary of this run's cache behaviour."""
+        s = self.stats
+        line = (f"Registry cache: {s['files']} files, {s['hits']} hits, "
+                f"{s['revalidated']} revalidated, {s['parsed']} parsed, "
+                f"{s['removed']} removed")
+        if s["invalidated"]:
+            line += f" (invalidated: {s['invalidated']})"
+        return line
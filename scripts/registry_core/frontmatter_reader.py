@@ -0,0 +1,113 @@
+"""
+Header-only YAML frontmatter reader.
+
+python-frontmatter decodes and keeps the whole Markdown body even when
+only `metadata` is needed. This reader stops at the closing `---` fence
+and loads the body lazily, the first time `.body` is accessed.
+
+Parsing rules match python-frontmatter's YAML handler: leading blank
+lines are ignored, the first line must be a `---` fence (three or more
+dashes), the header ends at the next fence line, and a header that is not
+a mapping (or a missing closing fence) yields empty metadata.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import yaml
+
+FENCE = re.compile(rb"-{3,}\s*$")
+
+
+def yaml_loader(use_libyaml: bool = True):
+    """Return libyaml's CSafeLoader when requested and available, else SafeLoader."""
+    if use_libyaml:
+        return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return yaml.SafeLoader
+
+
+def _iter_lines(data: bytes) -> Iterator[bytes]:
+    """Yield lines (with newline) from bytes without splitting the whole buffer."""
+    pos = 0
+    size = len(data)
+    while pos < size:
+        end = data.find(b"\n", pos)
+        if end == -1:
+            yield data[pos:]
+            return
+        yield data[pos:end + 1]
+        pos = end + 1
+
+
+def _split_header(lines: Iterable[bytes]) -> tuple[bytes | None, int]:
+    """Consume lines up to the closing fence.
+
+    Returns (header bytes or None if there is no frontmatter, number of
+    bytes consumed so far — the offset where the body starts).
+    """
+    consumed = 0
+    opened = False
+    header = []
+    for line in lines:
+        consumed += len(line)
+        if not opened:
+            if not line.strip():
+                continue
+            if not FENCE.match(line.lstrip()):
+                return None, 0
+            opened = True
+            continue
+        if FENCE.match(line):
+            return b"".join(header), consumed
+        header.append(line)
+    return None, 0
+
+
+def _load_metadata(header: bytes | None, use_libyaml: bool) -> dict[str, Any]:
+    if header is None:
+        return {}
+    data = yaml.load(header.decode("utf-8"), Loader=yaml_loader(use_libyaml))
+    return data if isinstance(data, dict) else {}
+
+
+class FrontmatterDocument:
+    """Parsed frontmatter metadata with a lazily loaded body."""
+
+    def __init__(self, metadata: dict[str, Any], path: Path | None = None,
+                 body_offset: int = 0, data: bytes | None = None):
+        self.metadata = metadata
+        self.path = path
+        self.body_offset = body_offset
+        self._data = data
+        self._body: str | None = None
+
+    @property
+    def body(self) -> str:
+        """The Markdown body, read from disk on first access."""
+        if self._body is None:
+            if self._data is not None:
+                raw = self._data[self.body_offset:]
+            elif self.path is not None:
+                with open(self.path, "rb") as f:
+                    f.seek(self.body_offset)
+                    raw = f.read()
+            else:
+                raw = b""
+            self._body = raw.decode("utf-8").strip()
+        return self._body
+
+
+def read_frontmatter(path: Path, use_libyaml: bool = True) -> FrontmatterDocument:
+    """Read only the frontmatter header of a file; the body stays on disk."""
+    with open(path, "rb") as f:
+        header, offset = _split_header(f)
+    return FrontmatterDocument(_load_metadata(header, use_libyaml), path=path, body_offset=offset)
+
+
+def parse_frontmatter_bytes(data: bytes, use_libyaml: bool = True) -> FrontmatterDocument:
+    """Parse frontmatter from an in-memory file without decoding the body."""
+    header, offset = _split_header(_iter_lines(data))
+    return FrontmatterDocument(_load_metadata(header, use_libyaml), body_offset=offset, data=data)
@@ -0,0 +1,69 @@
+"""
+File helpers shared by the scripts that write generated files.
+
+Outputs are written atomically: into a uniquely named temp file beside
+the target, then renamed over it. A reader (or a crash) never sees half
+a file, and concurrent runs writing the same target never share a temp
+file; the last rename wins.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+
+def _new_file_mode() -> int:
+    """Permissions a plain open() would give a new file under the current umask."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w") -> Iterator[IO]:
+    """Open a temp file for writing that replaces path when the block exits.
+
+    mode is "w" (UTF-8 text) or "wb". If the block raises, or is
+    interrupted, the temp file is removed and path is left untouched. The
+    target keeps its permissions; a new file gets the umask default.
+    """
+    path = Path(path)
+    binary = "b" in mode
+    f = tempfile.NamedTemporaryFile(mode, dir=path.parent, prefix=f".{path.name}.",
+                                    suffix=".tmp", delete=False,
+                                    encoding=None if binary else "utf-8")
+    tmp = Path(f.name)
+    try:
+        with f:
+            yield f
+        try:
+            file_mode = path.stat().st_mode & 0o777
+        except FileNotFoundError:
+            file_mode = _new_file_mode()
+        os.chmod(tmp, file_mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def write_atomically(path: Path, data: str | bytes):
+    """Write text (UTF-8) or bytes to path atomically."""
+    with atomic_open(path, "wb" if isinstance(data, bytes) else "w") as f:
+        f.write(data)
+
+
+
+def file_sha256(path: Path | None) -> str | None:
+    """SHA-256 hex digest of a file's bytes, or None if there is no readable file."""
+    if path is None:
+        return None
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
@@ -0,0 +1,277 @@
+"""
+Registry loader shared by validate, generate_dashboard, generate_library
+and refresh_diagrams.
+
+Walks the registry once, parses every element's YAML frontmatter header
+(Markdown bodies are never decoded, see registry_core.frontmatter_reader)
+and returns a Registry: the element list plus name/slug/layer/domain
+indexes.
+Results are memoized within a process, keyed by a fingerprint of every
+file's path, mtime and size. Across processes, a per-file frontmatter cache
+under .cache/registry/ (see registry_core.cache) means only changed files
+are re-parsed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+from registry_core.cache import FrontmatterCache
+from registry_core.frontmatter_reader import parse_frontmatter_bytes, read_frontmatter
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+CACHE_DIR = REPO_ROOT / ".cache" / "registry"
+MAPPING_PATH = REPO_ROOT / "models" / "registry-mapping.yaml"
+
+# Below this many files to parse, process start-up costs more than it saves
+PARALLEL_MIN_FILES = 512
+# Smallest chunk handed to a worker, to amortise pickling overhead
+CHUNK_MIN_FILES = 64
+
+# Frontmatter fields copied onto every element (field -> default)
+ELEMENT_FIELDS = {
+    "owner": "",
+    "domain": "",
+    "status": "",
+    "specialization": "",
+    "sourcing": "",
+}
+
+# In-process memo: registry_dir -> (fingerprint, Registry)
+_MEMO: dict[str, tuple[tuple, "Registry"]] = {}
+
+
+class Registry:
+    """Parsed registry elements with lookup indexes built once.
+
+    Iterating a Registry yields element dicts in deterministic (path)
+    order, so it can be passed anywhere a list of elements is expected.
+    """
+
+    def __init__(self, elements: list[dict[str, Any]], warnings: list[str] | None = None):
+        self.elements = elements
+        self.warnings = warnings or []
+        self.cache_stats = ""
+        self.by_name: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.by_slug: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.by_layer: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.by_domain: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for elem in elements:
+            self.by_name[elem["name"]].append(elem)
+            self.by_slug[elem["slug"]].append(elem)
+            self.by_layer[elem["layer"]].append(elem)
+            self.by_domain[elem["domain"]].append(elem)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self.elements)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __getitem__(self, index):
+        return self.elements[index]
+
+
+def registry_files(registry_dir: Path) -> list[Path]:
+    """Return all registry Markdown files in sorted order, excluding templates."""
+    if not registry_dir.exists():
+        return []
+    return sorted(p for p in registry_dir.rglob("*.md") if p.name != "_template.md")
+
+
+def fingerprint(files: list[Path]) -> tuple:
+    """Cheap change detector: (path, mtime_ns, size) for every file."""
+    result = []
+    for path in files:
+        st = path.stat()
+        result.append((str(path), st.st_mtime_ns, st.st_size))
+    return tuple(result)
+
+
+def build_element(md_file: Path, metadata: dict[str, Any], registry_dir: Path,
+                  repo_root: Path) -> dict[str, Any]:
+    """Build an element dict from a file path and its parsed frontmatter."""
+    rel = md_file.relative_to(registry_dir)
+    parts = rel.parts  # e.g. ('application', 'components', 'order-service.md')
+    layer = parts[0] if len(parts) > 1 else "unknown"
+    element_type = parts[1] if len(parts) > 2 else "unknown"
+
+    try:
+        file_label = str(md_file.relative_to(repo_root))
+    except ValueError:
+        file_label = str(md_file)
+
+    element = {"name": metadata["name"].strip(), "slug": md_file.stem}
+    for field, default in ELEMENT_FIELDS.items():
+        element[field] = metadata.get(field, default)
+    element.update({
+        "layer": layer,
+        "element_type": element_type,
+        "file": file_label,
+        "metadata": metadata,
+    })
+    return element
+
+
+def parse_frontmatter(data: bytes) -> tuple[dict[str, Any] | None, str | None]:
+    """Parse a file's frontmatter header. Returns (metadata, error message)."""
+    try:
+        return parse_frontmatter_bytes(data).metadata, None
+    except Exception as e:
+        return None, str(e)
+
+
+def read_file_frontmatter(md_file: Path) -> tuple[dict[str, Any] | None, str | None]:
+    """Read only the header of md_file from disk. Returns (metadata, error message)."""
+    try:
+        return read_frontmatter(md_file).metadata, None
+    except Exception as e:
+        return None, str(e)
+
+
+def _scan_file(item: tuple[str, str | None, bool]) -> tuple[int, int, str, Any]:
+    """Stat, hash and parse one file: (mtime_ns, size, digest, (metadata, error)).
+
+    item is (path, known digest, want digest). When the content hash
+    equals the known digest the file is not parsed and the result is None.
+    Without a digest (no cache) only the header is read from disk.
+    """
+    path_str, known_digest, want_digest = item
+    path = Path(path_str)
+    st = path.stat()
+    if not want_digest:
+        return st.st_mtime_ns, st.st_size, "", read_file_frontmatter(path)
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if digest == known_digest:
+        return st.st_mtime_ns, st.st_size, digest, None
+    return st.st_mtime_ns, st.st_size, digest, parse_frontmatter(data)
+
+
+def _scan_chunk(items: list[tuple[str, str | None, bool]]) -> list[tuple[int, int, str, Any]]:
+    """Process-pool task: scan a chunk of files in order."""
+    return [_scan_file(item) for item in items]
+
+
+def default_jobs() -> int:
+    """Default worker count for parallel scans: one per CPU."""
+    return os.cpu_count() or 1
+
+
+def _scan(items: list[tuple[str, str | None, bool]], jobs: int) -> list[tuple[int, int, str, Any]]:
+    """Scan files serially or across a process pool; results keep input order."""
+    if jobs <= 1 or len(items) < PARALLEL_MIN_FILES:
+        return _scan_chunk(items)
+
+    chunk_size = max(CHUNK_MIN_FILES, -(-len(items) // (jobs * 4)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+        # map() yields chunk results in submission order
+        for chunk_results in pool.map(_scan_chunk, chunks):
+            results.extend(chunk_results)
+    return results
+
+
+def parse_registry(files: list[Path], registry_dir: Path, repo_root: Path,
+                   cache: FrontmatterCache | None = None,
+                   jobs: int = 1) -> tuple[list[dict[str, Any]], list[str]]:
+    """Parse frontmatter for each file. Returns (elements, warnings).
+
+    Cache hits are resolved in-process; the remaining files are parsed
+    serially or, with jobs > 1, in chunks across a process pool. Elements
+    and warnings always come back in file order.
+    """
+    results: list[Any] = [None] * len(files)
+    pending = []
+    for index, md_file in enumerate(files):
+        if cache is not None:
+            hit = cache.lookup(md_file)
+            if hit is not None:
+                results[index] = hit
+                continue
+        pending.append(index)
+
+    items = [
+        (str(files[i]), cache.known_digest(files[i]) if cache is not None else None, cache is not None)
+        for i in pending
+    ]
+    for index, (mtime_ns, size, digest, result) in zip(pending, _scan(items, jobs)):
+        if cache is not None:
+            result = cache.record(files[index], mtime_ns, size, digest, result)
+        results[index] = result
+
+    elements = []
+    warnings = []
+    for md_file, (metadata, error) in zip(files, results):
+        if error is not None:
+            warnings.append(f"Could not parse {md_file}: {error}")
+            continue
+        if "name" not in metadata:
+            continue
+        try:
+            elements.append(build_element(md_file, metadata, registry_dir, repo_root))
+        except Exception as e:
+            warnings.append(f"Could not parse {md_file}: {e}")
+    return elements, warnings
+
+
+def cache_path(registry_dir: Path, cache_dir: Path = CACHE_DIR) -> Path:
+    """Location of the frontmatter cache for a registry directory."""
+    key = hashlib.sha256(str(registry_dir).encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"{key}.pickle"
+
+
+def load_registry(registry_dir: Path, repo_root: Path = REPO_ROOT,
+                  use_cache: bool = True, cache_dir: Path = CACHE_DIR,
+                  mapping_path: Path | None = MAPPING_PATH,
+                  jobs: int | None = None, quiet: bool = False) -> Registry:
+    """Load all registered elements from registry_dir.
+
+    Files without a `name` in their frontmatter are skipped. Parse errors
+    are collected as warnings and printed unless quiet is set. With
+    use_cache=False nothing is read from or written to the on-disk cache
+    and the in-process memo is bypassed. jobs sets the number of parser
+    processes (default: CPU count; 1 forces a serial scan).
+    """
+    registry_dir = Path(registry_dir).resolve()
+    files = registry_files(registry_dir)
+    fp = fingerprint(files)
+    memo_key = str(registry_dir)
+
+    if use_cache:
+        memo = _MEMO.get(memo_key)
+        if memo and memo[0] == fp:
+            return memo[1]
+
+    cache = None
+    if use_cache:
+        cache = FrontmatterCache.open(cache_path(registry_dir, cache_dir), mapping_path)
+
+    if jobs is None:
+        jobs = default_jobs()
+    elements, warnings = parse_registry(files, registry_dir, repo_root, cache, jobs)
+
+    if cache is not None:
+        cache.prune({str(f) for f in files})
+        cache.save()
+
+    if not quiet:
+        for warning in warnings:
+            print(f"  WARNING: {warning}")
+
+    registry = Registry(elements, warnings)
+    registry.cache_stats = cache.format_stats() if cache else "Registry cache: disabled"
+    if use_cache:
+        _MEMO[memo_key] = (fp, registry)
+    return registry
+
+
+def clear_memo():
+    """Drop all in-process registry results (tests, long-running tools)."""
+    _MEMO.clear()
@@ -0,0 +1,33 @@
+"""
+Process-pool fan-out shared by the batch scripts.
+
+Each script keeps its per-process state in module globals set by an
+initializer (a loaded reference, a registry and its name index), so the
+state is sent to each worker once rather than with every task. When the
+batch runs serially the initializer is called in-process instead, and the
+same worker function handles both cases.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Sequence
+
+
+def pool_size(jobs: int, tasks: int) -> int:
+    """Workers a batch of tasks actually uses; 1 means it runs in-process."""
+    return max(1, min(jobs, tasks))
+
+
+def run_jobs(worker: Callable[[Any], Any], tasks: Sequence[Any], jobs: int = 1,
+             initializer: Callable[..., None] | None = None,
+             initargs: tuple = ()) -> list[Any]:
+    """Run worker over tasks on up to jobs processes; results keep input order."""
+    workers = pool_size(jobs, len(tasks))
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        return [worker(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        return list(pool.map(worker, tasks))
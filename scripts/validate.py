@@ -12,16 +12,30 @@ Features:
   - Layer statistics (elements per ArchiMate layer)
   - Orphan detection (registered elements not used in any diagram)
   - JSON output (--format json) for CI/dashboards
+  - Registry parse cache in .cache/registry/ (--no-cache, --cache-stats)
+  - Incremental runs (--changed-since REF, --files ...) that reuse the
+    previous run's per-diagram results from .cache/validate/
+  - Watch mode (--watch): debounced re-validation of changed files with a
+    delta report
+  - Library use: validate() returns a ValidationResult without printing,
+    optionally for a registry the caller already loaded
 """
 
 import argparse
 import json
+import os
+import pickle
+import subprocess
 import xml.etree.ElementTree as ET
-import frontmatter
 import sys
+import tempfile
+import time
 from collections import defaultdict
 from pathlib import Path
 
+import drawio_io
+import registry_core
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 REGISTRY_DIR = REPO_ROOT / "registry"
 VIEWS_DIR = REPO_ROOT / "views"
@@ -119,40 +133,14 @@ def get_archimate_layer(shape_name):
     return "unknown"
 
 
-def load_registry():
-    """Load all registered elements with rich metadata from the registry."""
-    elements = []
-    if not REGISTRY_DIR.exists():
-        return elements
+def load_registry(use_cache=True, jobs=None):
+    """Load all registered elements with rich metadata from the registry.
 
-    for md_file in REGISTRY_DIR.rglob("*.md"):
-        # Skip template file
-        if md_file.name == "_template.md":
-            continue
-        try:
-            post = frontmatter.load(md_file)
-            if "name" not in post.metadata:
-                continue
-
-            # Derive layer and element_type from file path
-            rel = md_file.relative_to(REGISTRY_DIR)
-            parts = rel.parts  # e.g. ('application', 'components', 'order-service.md')
-            layer = parts[0] if len(parts) > 1 else "unknown"
-            element_type = parts[1] if len(parts) > 2 else "unknown"
-
-            elements.append({
-                "name": post.metadata["name"].strip(),
-                "owner": post.metadata.get("owner", ""),
-                "domain": post.metadata.get("domain", ""),
-                "status": post.metadata.get("status", ""),
-                "layer": layer,
-                "element_type": element_type,
-                "file": str(md_file.relative_to(REPO_ROOT)),
-            })
-        except Exception as e:
-            print(f"  WARNING: Could not parse {md_file}: {e}")
-
-    return elements
+    The parse cache lives under REPO_ROOT, like the per-diagram results
+    (see state_path), so pointing REPO_ROOT elsewhere moves every cache.
+    """
+    return registry_core.load_registry(REGISTRY_DIR, REPO_ROOT, use_cache=use_cache,
+                                       cache_dir=REPO_ROOT / ".cache" / "registry", jobs=jobs)
 
 
 def build_layer_registry(registry_elements):
@@ -164,6 +152,22 @@ def build_layer_registry(registry_elements):
     return lookup
 
 
+def build_name_layers(registry_elements):
+    """Build a name lookup: {name: [layer, ...]}, layers in registry order without repeats."""
+    name_layers = defaultdict(dict)
+    for elem in registry_elements:
+        name_layers[elem["name"]][elem["layer"]] = None
+    return {name: list(layers) for name, layers in name_layers.items()}
+
+
+def find_wrong_layer(name, layer, name_layers):
+    """Return the first layer other than `layer` where `name` is registered, or None."""
+    for registered_layer in name_layers.get(name, ()):
+        if registered_layer != layer:
+            return registered_layer
+    return None
+
+
 def parse_drawio_style(style_str):
     """Parse a draw.io style string into a dict."""
     props = {}
@@ -176,6 +180,26 @@ def parse_drawio_style(style_str):
     return props
 
 
+def archimate_element(value, style_str, tab_name, cell_id):
+    """Build the element record for one cell, or None if it is not an ArchiMate shape."""
+    if not value or not style_str:
+        return None
+
+    style = parse_drawio_style(style_str)
+    shape = style.get("shape", "")
+
+    layer = get_archimate_layer(shape)
+    if not layer:
+        return None
+    clean_name = value.replace("<br>", " ").replace("<br/>", " ").strip()
+    return {
+        "name": clean_name,
+        "layer": layer,
+        "tab": tab_name,
+        "cell_id": cell_id,
+    }
+
+
 def extract_archimate_elements_from_cells(cells, tab_name):
     """Extract ArchiMate elements from a list of mxCell/object elements."""
     elements = []
@@ -192,45 +216,81 @@ def extract_archimate_elements_from_cells(cells, tab_name):
             value = cell.get("value", "")
             style_str = cell.get("style", "")
 
-        if not value or not style_str:
-            continue
-
-        style = parse_drawio_style(style_str)
-        shape = style.get("shape", "")
-
-        layer = get_archimate_layer(shape)
-        if layer:
-            clean_name = value.replace("<br>", " ").replace("<br/>", " ").strip()
-            elements.append({
-                "name": clean_name,
-                "layer": layer,
-                "tab": tab_name,
-                "cell_id": cell.get("id"),
-            })
+        elem = archimate_element(value, style_str, tab_name, cell.get("id"))
+        if elem:
+            elements.append(elem)
 
     return elements
 
 
 def extract_archimate_elements(drawio_path):
-    """Extract ArchiMate element names and their types from a .drawio file."""
-    tree = ET.parse(drawio_path)
-    root = tree.getroot()
-
-    elements = []
-
-    # Check if the file has <diagram> tabs (standard draw.io format)
-    diagrams = root.findall(".//diagram")
+    """Extract ArchiMate element names and their types from a .drawio file.
+
+    Streams the file with iterparse and drops each XML element once it has
+    been read, so memory stays bounded by nesting depth plus the extracted
+    records rather than the size of the diagram. Results are identical to
+    walking the full tree: per <diagram> tab, every mxCell in document
+    order followed by every <object> wrapper; without any <diagram> tab
+    the whole file is one "default" tab. Compressed tabs are decoded
+    through drawio_io and parsed one tab at a time.
+    """
+    stack = []          # open XML elements, root first
+    inner_styles = {}   # id(open <object>) -> style of its first child mxCell
+    tabs = []           # [name, mxCell elements, object elements] in start order
+    open_tabs = []      # tabs of the enclosing <diagram> elements
+    default_tab = ["default", [], []]
+
+    for event, node in ET.iterparse(drawio_path, events=("start", "end")):
+        if event == "start":
+            # A root <diagram> is not a tab, matching root.findall(".//diagram")
+            if node.tag == "diagram" and stack:
+                tab = [node.get("name", "unnamed"), [], []]
+                tabs.append(tab)
+                open_tabs.append(tab)
+            stack.append(node)
+            continue
 
-    if diagrams:
-        for diagram in diagrams:
-            tab_name = diagram.get("name", "unnamed")
-            cells = list(diagram.iter("mxCell")) + list(diagram.iter("object"))
-            elements.extend(extract_archimate_elements_from_cells(cells, tab_name))
-    else:
-        # Fallback: no <diagram> wrapper, just a raw <mxGraphModel>
-        cells = list(root.iter("mxCell")) + list(root.iter("object"))
-        elements.extend(extract_archimate_elements_from_cells(cells, "default"))
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        record = None
+        if node.tag == "mxCell":
+            if parent is not None and parent.tag == "object":
+                inner_styles.setdefault(id(parent), node.get("style", ""))
+            record = (1, node.get("value", ""), node.get("style", ""))
+        elif node.tag == "object":
+            inner_style = inner_styles.pop(id(node), None)
+            if inner_style is not None:
+                record = (2, node.get("label", ""), inner_style)
+        elif node.tag == "diagram" and parent is not None:
+            if drawio_io.is_compressed(node):
+                # draw.io's default compressed tab: one small tree per tab
+                model = drawio_io.tab_model(node)
+                if model is not None:
+                    cells = list(model.iter("mxCell"))
+                    objects = list(model.iter("object"))
+                    for tab in open_tabs:
+                        tab[1].extend(extract_archimate_elements_from_cells(cells, tab[0]))
+                        tab[2].extend(extract_archimate_elements_from_cells(objects, tab[0]))
+            open_tabs.pop()
+
+        if record is not None:
+            slot, value, style_str = record
+            # Cells outside every tab only count when the file has no tabs
+            for tab in open_tabs or ([] if tabs else [default_tab]):
+                elem = archimate_element(value, style_str, tab[0], node.get("id"))
+                if elem:
+                    tab[slot].append(elem)
+
+        # Each finished element is its parent's last child; dropping it
+        # keeps the in-memory tree at the depth of the current path.
+        if parent is not None:
+            del parent[-1]
 
+    elements = []
+    for _, cells, objects in tabs or [default_tab]:
+        elements.extend(cells)
+        elements.extend(objects)
     return elements
 
 
@@ -267,16 +327,283 @@ def check_domain_maturity(domain):
     return {vt: vt in existing_stems for vt in REQUIRED_VIEW_TYPES}
 
 
-def validate(output_format="text"):
-    """Run validation: check all diagram elements exist in the correct registry layer."""
-    # Load registry with rich metadata
-    registry_elements = load_registry()
+def find_drawio_files():
+    """All .drawio files in domain folders (views/*/*.drawio), excluding the template."""
+    drawio_files = sorted(VIEWS_DIR.glob("*/*.drawio"))
+    return [f for f in drawio_files if f.name != "_template.drawio"]
+
+
+def extract_diagram(drawio_path):
+    """Extract one diagram's ArchiMate elements into a per-diagram result."""
+    return {
+        "file": str(drawio_path.relative_to(REPO_ROOT)),
+        "domain": get_domain_from_path(drawio_path),
+        "view_type": get_view_type_from_path(drawio_path),
+        "elements": extract_archimate_elements(drawio_path),
+    }
+
+
+def check_diagram(result, layer_registry, name_layers):
+    """Return validation errors for one diagram's elements."""
+    errors = []
+    for elem in result["elements"]:
+        # Check if (layer, name) exists in registry
+        key = (elem["layer"], elem["name"])
+        if key not in layer_registry:
+            # Check if name exists in a DIFFERENT layer (helpful error message)
+            errors.append({
+                "file": result["file"],
+                "element": elem["name"],
+                "layer": elem["layer"],
+                "wrong_layer": find_wrong_layer(elem["name"], elem["layer"], name_layers),
+            })
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Incremental validation
+# ---------------------------------------------------------------------------
+
+# Bump when the shape of stored per-diagram results changes
+STATE_VERSION = 1
+
+# Bump when extract_archimate_elements (or the drawio_io decoding it relies
+# on) returns different elements for the same file, so results stored by
+# the old code are re-extracted rather than reused
+EXTRACTION_VERSION = 2
+
+
+def state_path():
+    """Where the previous run's per-diagram results are persisted."""
+    return REPO_ROOT / ".cache" / "validate" / "results.pickle"
+
+
+def load_state():
+    """Load the previous run's results, or None if missing or stale.
+
+    Results are stale if stored by a different STATE_VERSION or
+    EXTRACTION_VERSION.
+    """
+    try:
+        with open(state_path(), "rb") as f:
+            state = pickle.load(f)
+    except Exception:
+        return None
+    if (state.get("version"), state.get("extraction")) != (STATE_VERSION, EXTRACTION_VERSION):
+        return None
+    return state
+
+
+def save_state(state):
+    """Persist per-diagram results atomically (best effort)."""
+    path = state_path()
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp name, so concurrent runs never write the same file
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.stem, suffix=".tmp",
+                                         delete=False) as f:
+            tmp = Path(f.name)
+            pickle.dump({"version": STATE_VERSION, "extraction": EXTRACTION_VERSION, **state},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+    except OSError:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+
+
+def registry_snapshot(registry_elements):
+    """Map registry file -> (name, layer), the registry facts validation depends on."""
+    return {e["file"]: (e["name"], e["layer"]) for e in registry_elements}
+
+
+def changed_registry_names(old_snapshot, new_snapshot):
+    """Names whose registration was added, removed, renamed or moved layer."""
+    names = set()
+    for file in old_snapshot.keys() | new_snapshot.keys():
+        old = old_snapshot.get(file)
+        new = new_snapshot.get(file)
+        if old != new:
+            if old:
+                names.add(old[0])
+            if new:
+                names.add(new[0])
+    return names
+
+
+def git_changed_files(ref):
+    """Files changed relative to a git ref, plus untracked files, as absolute paths."""
+    diff = subprocess.run(
+        ["git", "diff", "--name-only", ref, "--"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    untracked = subprocess.run(
+        ["git", "ls-files", "--others", "--exclude-standard"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    lines = diff.stdout.splitlines() + untracked.stdout.splitlines()
+    return [(REPO_ROOT / line).resolve() for line in lines if line.strip()]
+
+
+def update_diagram_results(drawio_files, registry_elements, layer_registry, name_layers,
+                           previous=None, touched_files=()):
+    """Extract and check diagrams, reusing `previous` state where possible.
+
+    previous is a {"registry": snapshot, "diagrams": {...}} state from an
+    earlier pass (None processes everything). Diagrams in touched_files,
+    or whose mtime/size differs from the stored result, are re-extracted.
+    Diagrams that reference a registry name whose registration changed
+    since that pass are re-checked; the rest reuse their stored errors.
+
+    Returns (diagram_results, errors, new state, extracted, rechecked).
+    """
+    snapshot = registry_snapshot(registry_elements)
+    if previous is not None:
+        touched_names = changed_registry_names(previous["registry"], snapshot)
+        stored_diagrams = previous["diagrams"]
+    else:
+        touched_names = set()
+        stored_diagrams = {}
+    touched = {str(Path(p).resolve()) for p in touched_files}
+
+    diagram_results = []
+    errors = []
+    diagrams = {}
+    extracted = rechecked = 0
+    for drawio_path in drawio_files:
+        rel = str(drawio_path.relative_to(REPO_ROOT))
+        st = drawio_path.stat()
+        prev = stored_diagrams.get(rel)
+        if (prev is not None and str(drawio_path.resolve()) not in touched
+                and prev["mtime_ns"] == st.st_mtime_ns and prev["size"] == st.st_size):
+            result = prev["result"]
+            if touched_names.isdisjoint(e["name"] for e in result["elements"]):
+                diagram_errors = prev["errors"]
+            else:
+                diagram_errors = check_diagram(result, layer_registry, name_layers)
+                rechecked += 1
+        else:
+            result = extract_diagram(drawio_path)
+            diagram_errors = check_diagram(result, layer_registry, name_layers)
+            extracted += 1
+            rechecked += 1
+
+        diagram_results.append(result)
+        errors.extend(diagram_errors)
+        diagrams[rel] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "result": result,
+            "errors": diagram_errors,
+        }
+
+    state = {"registry": snapshot, "diagrams": diagrams}
+    return diagram_results, errors, state, extracted, rechecked
+
+
+def collect_diagram_results(drawio_files, registry_elements, layer_registry, name_layers,
+                            changed=None, use_state=True):
+    """Extract and check diagrams, reusing the previous run where possible.
+
+    changed=None extracts and checks every diagram. Otherwise `changed` is
+    the list of touched paths and the previous run's results are loaded
+    from disk (see update_diagram_results). Registry changes are found by
+    comparing against the stored registry snapshot, so they are never
+    missed even if absent from `changed`. Without a stored result
+    everything is processed.
+
+    Returns (diagram_results, errors, summary line).
+    """
+    previous = load_state() if (changed is not None and use_state) else None
+    diagram_results, errors, state, extracted, rechecked = update_diagram_results(
+        drawio_files, registry_elements, layer_registry, name_layers,
+        previous=previous, touched_files=changed or (),
+    )
+    if use_state:
+        save_state(state)
+
+    total = len(drawio_files)
+    summary = f"re-extracted {extracted}/{total} diagram(s), re-checked {rechecked}/{total}"
+    if changed is not None and previous is None:
+        summary += " (no previous result, full run)"
+    return diagram_results, errors, summary
+
+
+class ValidationResult:
+    """Outcome of a validation run.
+
+    Holds the registry and per-diagram results the run was computed from
+    plus the derived report sections; to_dict() gives the --format json
+    document.
+    """
+
+    def __init__(self, registry_elements, drawio_files, diagram_results, errors, orphans,
+                 domain_coverage, layer_stats, layer_registry, name_layers, run_stats=""):
+        self.registry_elements = registry_elements
+        self.drawio_files = drawio_files
+        self.diagram_results = diagram_results
+        self.errors = errors
+        self.orphans = orphans
+        self.domain_coverage = domain_coverage
+        self.layer_stats = layer_stats
+        self.layer_registry = layer_registry
+        self.name_layers = name_layers
+        self.run_stats = run_stats
+
+    @property
+    def passed(self):
+        return not self.errors
+
+    @property
+    def status(self):
+        return "PASSED" if self.passed else "FAILED"
+
+    @property
+    def total_elements_checked(self):
+        return sum(len(r["elements"]) for r in self.diagram_results)
+
+    def to_dict(self):
+        """The JSON report (what --format json prints)."""
+        total_checked = self.total_elements_checked
+        return {
+            "status": self.status,
+            "registry": {
+                "total_elements": len(self.registry_elements),
+                "elements": [{"name": e["name"], "layer": e["layer"]}
+                           for e in sorted(self.registry_elements, key=lambda x: x["name"])],
+            },
+            "diagrams": {
+                "total_files": len(self.drawio_files),
+                "total_elements_checked": total_checked,
+                "registered": total_checked - len(self.errors),
+                "unregistered": len(self.errors),
+            },
+            "errors": self.errors,
+            "domain_coverage": self.domain_coverage,
+            "layer_statistics": self.layer_stats,
+            "orphan_elements": [{
+                "name": o["name"],
+                "location": f"{o['layer']}/{o['element_type']}",
+            } for o in self.orphans],
+        }
+
+
+def validate(registry_elements=None, use_cache=True, jobs=None, changed=None):
+    """Check all diagram elements exist in the correct registry layer.
+
+    Library entry point: nothing is printed. registry_elements lets a
+    caller that already loaded the registry skip a second scan.
+    changed: optional list of touched file paths; enables incremental
+    validation against the previous run (see collect_diagram_results).
+    """
+    if registry_elements is None:
+        registry_elements = load_registry(use_cache=use_cache, jobs=jobs)
 
     # Build layer-scoped lookup: {(layer, name): element}
     layer_registry = build_layer_registry(registry_elements)
 
-    # Also keep a global name set for orphan detection
-    all_registered_names = {e["name"] for e in registry_elements}
+    # Name -> registered layers, for "wrong layer" hints
+    name_layers = build_name_layers(registry_elements)
 
     # Build domain -> elements mapping
     domain_elements = defaultdict(list)
@@ -289,56 +616,28 @@ def validate(output_format="text"):
         layer_elements[elem["layer"]].append(elem)
 
     # Find all .drawio files in domain folders (new structure: views/*/*.drawio)
-    drawio_files = sorted(VIEWS_DIR.glob("*/*.drawio"))
-    # Exclude template
-    drawio_files = [f for f in drawio_files if f.name != "_template.drawio"]
+    drawio_files = find_drawio_files()
+
+    # Extract elements from diagrams and check them using LAYER-SCOPED
+    # validation; in incremental mode untouched diagrams come from the
+    # previous run's results
+    diagram_results, errors, run_stats = collect_diagram_results(
+        drawio_files, registry_elements, layer_registry, name_layers,
+        changed=changed, use_state=use_cache,
+    )
 
-    # Extract elements from all diagrams
-    diagram_results = []
     all_diagram_element_keys = set()  # (layer, name) tuples
     all_diagram_element_names = set()  # just names for orphan detection
     domain_views = defaultdict(list)
     layer_in_diagrams = defaultdict(set)
 
-    for drawio_path in drawio_files:
-        rel_path = drawio_path.relative_to(REPO_ROOT)
-        domain = get_domain_from_path(drawio_path)
-        elements = extract_archimate_elements(drawio_path)
-        domain_views[domain].append(str(rel_path))
-
-        for elem in elements:
+    for result in diagram_results:
+        domain_views[result["domain"]].append(result["file"])
+        for elem in result["elements"]:
             all_diagram_element_keys.add((elem["layer"], elem["name"]))
             all_diagram_element_names.add(elem["name"])
             layer_in_diagrams[elem["layer"]].add(elem["name"])
 
-        diagram_results.append({
-            "file": str(rel_path),
-            "domain": domain,
-            "view_type": get_view_type_from_path(drawio_path),
-            "elements": elements,
-        })
-
-    # Find validation errors using LAYER-SCOPED validation
-    errors = []
-    for result in diagram_results:
-        for elem in result["elements"]:
-            # Check if (layer, name) exists in registry
-            key = (elem["layer"], elem["name"])
-            if key not in layer_registry:
-                # Check if name exists in a DIFFERENT layer (helpful error message)
-                wrong_layer = None
-                for reg_elem in registry_elements:
-                    if reg_elem["name"] == elem["name"] and reg_elem["layer"] != elem["layer"]:
-                        wrong_layer = reg_elem["layer"]
-                        break
-
-                errors.append({
-                    "file": result["file"],
-                    "element": elem["name"],
-                    "layer": elem["layer"],
-                    "wrong_layer": wrong_layer,
-                })
-
     # Find orphan elements (registered but not in any diagram)
     orphans = []
     for elem in registry_elements:
@@ -393,34 +692,23 @@ def validate(output_format="text"):
                 "in_diagrams": in_diagrams_count,
             })
 
-    # Total counts
-    total_elements_checked = sum(len(r["elements"]) for r in diagram_results)
+    return ValidationResult(registry_elements, drawio_files, diagram_results, errors, orphans,
+                            domain_coverage, layer_stats, layer_registry, name_layers, run_stats)
+
 
-    # JSON output
+def print_report(result, output_format="text"):
+    """Print a validation result as text or JSON; returns the exit code."""
     if output_format == "json":
-        output = {
-            "status": "FAILED" if errors else "PASSED",
-            "registry": {
-                "total_elements": len(registry_elements),
-                "elements": [{"name": e["name"], "layer": e["layer"]}
-                           for e in sorted(registry_elements, key=lambda x: x["name"])],
-            },
-            "diagrams": {
-                "total_files": len(drawio_files),
-                "total_elements_checked": total_elements_checked,
-                "registered": total_elements_checked - len(errors),
-                "unregistered": len(errors),
-            },
-            "errors": errors,
-            "domain_coverage": domain_coverage,
-            "layer_statistics": layer_stats,
-            "orphan_elements": [{
-                "name": o["name"],
-                "location": f"{o['layer']}/{o['element_type']}",
-            } for o in orphans],
-        }
-        print(json.dumps(output, indent=2))
-        return 1 if errors else 0
+        print(json.dumps(result.to_dict(), indent=2))
+        return 0 if result.passed else 1
+
+    registry_elements = result.registry_elements
+    drawio_files = result.drawio_files
+    errors = result.errors
+    orphans = result.orphans
+    layer_registry = result.layer_registry
+    name_layers = result.name_layers
+    total_elements_checked = result.total_elements_checked
 
     # Text output
     print("=" * 60)
@@ -439,20 +727,16 @@ def validate(output_format="text"):
     print(f"\nScanning {len(drawio_files)} diagram(s)...\n")
 
     # Per-diagram validation
-    for result in diagram_results:
-        print(f"--- {result['file']} ({len(result['elements'])} ArchiMate elements) ---")
-        for elem in result["elements"]:
+    for diagram in result.diagram_results:
+        print(f"--- {diagram['file']} ({len(diagram['elements'])} ArchiMate elements) ---")
+        for elem in diagram["elements"]:
             tab_info = f" | tab: {elem['tab']}" if elem.get("tab", "default") != "default" else ""
             key = (elem["layer"], elem["name"])
             if key in layer_registry:
                 print(f"  OK   {elem['name']} ({elem['layer']}{tab_info})")
             else:
                 # Find if it exists in wrong layer
-                wrong_layer = None
-                for reg_elem in registry_elements:
-                    if reg_elem["name"] == elem["name"]:
-                        wrong_layer = reg_elem["layer"]
-                        break
+                wrong_layer = find_wrong_layer(elem["name"], elem["layer"], name_layers)
                 if wrong_layer:
                     print(f"  FAIL {elem['name']} ({elem['layer']}{tab_info}) - WRONG LAYER (registered in {wrong_layer})")
                 else:
@@ -461,7 +745,7 @@ def validate(output_format="text"):
     # Domain coverage report with maturity
     print("\n" + "=" * 60)
     print("Domain Coverage & Maturity:")
-    for dc in domain_coverage:
+    for dc in result.domain_coverage:
         if dc["maturity_total"] > 0:
             maturity_str = f"{dc['maturity_score']}/{dc['maturity_total']} required views"
             missing = [k for k, v in dc["maturity_details"].items() if not v]
@@ -478,7 +762,7 @@ def validate(output_format="text"):
 
     # Layer statistics
     print(f"\nLayer Statistics:")
-    for ls in layer_stats:
+    for ls in result.layer_stats:
         print(f"  {ls['layer']:20s} {ls['registered']:3d} registered, "
               f"{ls['in_diagrams']:3d} in diagrams")
 
@@ -511,6 +795,244 @@ def validate(output_format="text"):
         return 0
 
 
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+# Seconds between filesystem polls. Every watched file is stat'ed on each
+# poll (a few ms for thousands of files); directory listings are cached.
+WATCH_INTERVAL = 0.04
+
+# Quiet time required after the last change before re-validating, by file
+# type. A draw.io save arrives as a burst of writes spread over a couple of
+# hundred ms, which must trigger one pass; registry Markdown is written
+# once per save, so an edit is reported within ~100 ms (one poll, this
+# quiet time and a pass over the diagrams that use the changed names).
+WATCH_DEBOUNCE = {".drawio": 0.3, ".md": 0.04}
+
+# Errors listed individually on startup; later passes only list the delta
+WATCH_LIST_LIMIT = 20
+
+
+class WatchedTree:
+    """Cheap repeated polling of the watched files under one directory.
+
+    Directory listings are cached and re-read only when a directory's
+    mtime changes, i.e. when an entry was added, removed or renamed over
+    (how most editors save). Every file is stat'ed on each poll to catch
+    in-place writes.
+    """
+
+    def __init__(self, root, include, max_depth=None):
+        self.root = root
+        self.include = include  # include(name, depth) for files
+        self.max_depth = max_depth
+        self.dirs = {}  # dir -> (mtime_ns, depth, subdirs, files)
+        self.files = {}  # path -> (mtime_ns, size)
+        if root.is_dir():
+            self._scan(root, 0, set())
+
+    def _stat(self, path):
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _scan(self, directory, depth, changed):
+        """(Re-)list one directory, descending into new subdirectories."""
+        try:
+            mtime = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except OSError:
+            self._drop(directory, changed)
+            return
+        subdirs, files = set(), set()
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir():
+                if self.max_depth is None or depth < self.max_depth:
+                    subdirs.add(path)
+            elif self.include(entry.name, depth):
+                files.add(path)
+
+        old = self.dirs.get(directory)
+        old_subdirs, old_files = (old[2], old[3]) if old else (set(), set())
+        self.dirs[directory] = (mtime, depth, subdirs, files)
+        for path in old_files - files:
+            self.files.pop(path, None)
+            changed.add(path)
+        for path in files - old_files:
+            stat = self._stat(path)
+            if stat is not None:
+                self.files[path] = stat
+                changed.add(path)
+        for sub in old_subdirs - subdirs:
+            self._drop(sub, changed)
+        for sub in subdirs - old_subdirs:
+            self._scan(sub, depth + 1, changed)
+
+    def _drop(self, directory, changed):
+        """Forget a removed directory and everything under it."""
+        entry = self.dirs.pop(directory, None)
+        if entry is None:
+            return
+        for path in entry[3]:
+            if self.files.pop(path, None) is not None:
+                changed.add(path)
+        for sub in entry[2]:
+            self._drop(sub, changed)
+
+    def poll(self):
+        """Paths added, removed or modified since the previous poll."""
+        changed = set()
+        if not self.dirs and self.root.is_dir():
+            self._scan(self.root, 0, changed)
+        for directory, (mtime, depth, _, _) in list(self.dirs.items()):
+            if directory not in self.dirs:
+                continue  # dropped with its parent during this poll
+            try:
+                current = directory.stat().st_mtime_ns
+            except OSError:
+                self._drop(directory, changed)
+                continue
+            if current != mtime:
+                self._scan(directory, depth, changed)
+
+        for path, old_stat in list(self.files.items()):
+            if path in changed:
+                continue  # just (re-)listed
+            stat = self._stat(path)
+            if stat != old_stat:
+                changed.add(path)
+                if stat is None:
+                    del self.files[path]  # its directory rescan will follow
+                else:
+                    self.files[path] = stat
+        return changed
+
+
+def watch_trees():
+    """Pollers for registry Markdown (any depth) and views/<domain>/*.drawio."""
+    return [
+        WatchedTree(REGISTRY_DIR, lambda name, depth: name.endswith(".md") and name != "_template.md"),
+        WatchedTree(VIEWS_DIR, lambda name, depth: depth == 1 and name.endswith(".drawio")
+                    and name != "_template.drawio", max_depth=1),
+    ]
+
+
+def wait_for_changes(trees, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE,
+                     sleep=time.sleep, clock=time.monotonic):
+    """Poll until files change and then stay unchanged long enough.
+
+    debounce maps file suffixes to the quiet time their changes need; a
+    burst waits for the longest among the paths it touched. Quiet time is
+    measured on the clock from the last poll that saw a change, so slow
+    polls count in full. Returns every path changed during the burst.
+    """
+    changed = set()
+    last_change = None
+    quiet = 0.0
+    while True:
+        sleep(interval)
+        delta = set()
+        for tree in trees:
+            delta |= tree.poll()
+        if delta:
+            changed |= delta
+            last_change = clock()
+            quiet = max([quiet] + [debounce.get(p.suffix, max(debounce.values())) for p in delta])
+        elif changed and clock() - last_change >= quiet:
+            return changed
+
+
+def watch_pass(registry_elements, previous=None, touched_files=()):
+    """One validation pass over in-memory state; returns the pass result."""
+    layer_registry = build_layer_registry(registry_elements)
+    name_layers = build_name_layers(registry_elements)
+    drawio_files = find_drawio_files()
+    diagram_results, errors, state, extracted, rechecked = update_diagram_results(
+        drawio_files, registry_elements, layer_registry, name_layers,
+        previous=previous, touched_files=touched_files,
+    )
+    used = {e["name"] for r in diagram_results for e in r["elements"]}
+    total = len(drawio_files)
+    return {
+        "state": state,
+        "errors": errors,
+        "orphans": {e["name"] for e in registry_elements if e["name"] not in used},
+        "summary": f"re-extracted {extracted}/{total} diagram(s), re-checked {rechecked}/{total}",
+    }
+
+
+def format_error(err):
+    """One-line description of a validation error."""
+    if err.get("wrong_layer"):
+        reason = f"WRONG LAYER (registered in {err['wrong_layer']})"
+    else:
+        reason = "NOT IN REGISTRY"
+    return f"[{err['file']}] {err['element']} ({err['layer']}) - {reason}"
+
+
+def format_delta(before, after):
+    """Report lines for errors and orphans that appeared or went away."""
+    old_errors = {format_error(e) for e in before["errors"]}
+    new_errors = {format_error(e) for e in after["errors"]}
+    lines = [f"+ FAIL  {e}" for e in sorted(new_errors - old_errors)]
+    lines += [f"- FIXED {e}" for e in sorted(old_errors - new_errors)]
+    lines += [f"+ ORPHAN {n}" for n in sorted(after["orphans"] - before["orphans"])]
+    lines += [f"- ORPHAN {n}" for n in sorted(before["orphans"] - after["orphans"])]
+    lines.append(f"{len(new_errors)} error(s) (+{len(new_errors - old_errors)}/"
+                 f"-{len(old_errors - new_errors)}), {len(after['orphans'])} orphan(s)")
+    return lines
+
+
+def watch(use_cache=True, jobs=None, interval=WATCH_INTERVAL, debounce=WATCH_DEBOUNCE):
+    """Re-validate whenever registry or diagram files change, until Ctrl-C.
+
+    The registry index and per-diagram results stay in memory; each pass
+    re-extracts only changed diagrams and re-checks only diagrams that
+    reference changed registry names, then prints what changed.
+    """
+    start = time.perf_counter()
+    trees = watch_trees()
+    registry_elements = load_registry(use_cache=use_cache, jobs=jobs)
+    current = watch_pass(registry_elements, load_state() if use_cache else None)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Watching {REGISTRY_DIR.name}/ and {VIEWS_DIR.name}/ (Ctrl-C to stop)")
+    print(f"  {len(registry_elements)} elements, {len(current['state']['diagrams'])} diagram(s), "
+          f"{len(current['errors'])} error(s), {len(current['orphans'])} orphan(s) "
+          f"[{current['summary']} in {elapsed:.0f} ms]")
+    for err in current["errors"][:WATCH_LIST_LIMIT]:
+        print(f"  FAIL  {format_error(err)}")
+    if len(current["errors"]) > WATCH_LIST_LIMIT:
+        print(f"  ... and {len(current['errors']) - WATCH_LIST_LIMIT} more")
+
+    try:
+        while True:
+            changed = wait_for_changes(trees, interval, debounce)
+            start = time.perf_counter()
+            if any(p.suffix == ".md" for p in changed):
+                # Memoized by file stats; only edited files are re-parsed
+                registry_elements = load_registry(use_cache=use_cache, jobs=jobs)
+            after = watch_pass(registry_elements, current["state"], changed)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            names = sorted(str(p.relative_to(REPO_ROOT)) for p in changed)
+            shown = ", ".join(names[:3]) + (f" (+{len(names) - 3} more)" if len(names) > 3 else "")
+            print(f"\n[{time.strftime('%H:%M:%S')}] changed: {shown}")
+            for line in format_delta(current, after):
+                print(f"  {line}")
+            print(f"  [{after['summary']} in {elapsed:.0f} ms]")
+            current = after
+    except KeyboardInterrupt:
+        print()
+
+    if use_cache:
+        save_state(current["state"])
+    return 1 if current["errors"] else 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Validate draw.io architecture diagrams against the element registry."
@@ -521,8 +1043,65 @@ def main():
         default="text",
         help="Output format (default: text)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-parse every registry file, ignoring and not updating .cache/registry/",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Report registry cache hits/misses on stderr",
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=None,
+        help="Parallel registry parser processes (default: CPU count, 1 = serial)",
+    )
+    incremental = parser.add_mutually_exclusive_group()
+    incremental.add_argument(
+        "--changed-since",
+        metavar="GIT_REF",
+        help="Only re-extract/re-check what changed since GIT_REF; reuse the previous run for the rest",
+    )
+    incremental.add_argument(
+        "--files",
+        nargs="+",
+        metavar="FILE",
+        help="Only re-extract/re-check these touched files; reuse the previous run for the rest",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-validate changed files on save (Ctrl-C to stop)",
+    )
     args = parser.parse_args()
-    sys.exit(validate(output_format=args.format))
+
+    if args.watch:
+        sys.exit(watch(use_cache=not args.no_cache, jobs=args.jobs))
+
+    changed = None
+    if args.changed_since:
+        try:
+            changed = git_changed_files(args.changed_since)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, "stderr", "") or str(e)
+            print(f"ERROR: could not list changes since {args.changed_since}: {stderr.strip()}",
+                  file=sys.stderr)
+            sys.exit(2)
+    elif args.files:
+        changed = [Path(f) for f in args.files]
+
+    registry_elements = load_registry(use_cache=not args.no_cache, jobs=args.jobs)
+    if args.cache_stats:
+        # stderr keeps --format json output parseable
+        print(registry_elements.cache_stats, file=sys.stderr)
+
+    result = validate(registry_elements, use_cache=not args.no_cache, changed=changed)
+    if changed is not None:
+        print(f"Incremental: {result.run_stats}", file=sys.stderr)
+    sys.exit(print_report(result, args.format))
 
 
 if __name__ == "__main__":
@@ -150,3 +150,29 @@ def sample_drawio_xml() -> str:
     </mxGraphModel>
   </diagram>
 </mxfile>'''
+
+
+# ── drawio_io: keep decoded-tab caches out of the repo ─────────
+
+@pytest.fixture(autouse=True)
+def drawio_cache(tmp_path, monkeypatch):
+    """Point the decoded-tab disk cache at tmp_path and start with an empty memo."""
+    import drawio_io
+
+    cache_dir = tmp_path / ".cache" / "drawio"
+    monkeypatch.setattr(drawio_io, "CACHE_DIR", cache_dir)
+    drawio_io.clear_memo()
+    yield cache_dir
+    drawio_io.clear_memo()
+
+
+# ── extract_view: keep recorded output stamps out of the repo ──
+
+@pytest.fixture(autouse=True)
+def extract_stamp_cache(tmp_path, monkeypatch):
+    """Point extract_view's stamp cache at tmp_path."""
+    import extract_view
+
+    cache_dir = tmp_path / ".cache" / "extract_view"
+    monkeypatch.setattr(extract_view, "STAMP_CACHE_DIR", cache_dir)
+    return cache_dir
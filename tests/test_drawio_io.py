@@ -0,0 +1,148 @@
+"""Tests for scripts/drawio_io.py — compressed tab decoding and its cache."""
+
+import os
+import xml.etree.ElementTree as ET
+
+import drawio_io
+import extract_view as ev
+import validate as v
+
+MODEL = (
+    '<mxGraphModel><root><mxCell id="0"/><mxCell id="1" parent="0"/>'
+    '<mxCell id="2" value="Order Service" style="shape=mxgraph.archimate3.application;appType=comp" '
+    'vertex="1" parent="1"><mxGeometry x="0" y="0" width="10" height="10" as="geometry"/></mxCell>'
+    '<object id="3" label="Ledger"><mxCell style="shape=mxgraph.archimate3.tech" vertex="1" parent="1">'
+    '<mxGeometry x="20" y="0" width="10" height="10" as="geometry"/></mxCell></object>'
+    '</root></mxGraphModel>'
+)
+
+
+def _compressed_file(path, tab_name="Packed"):
+    encoded = drawio_io.deflate(MODEL)
+    drawio_io.clear_memo()  # force a real inflate on first read
+    path.write_text(f'<mxfile><diagram name="{tab_name}" id="d1">{encoded}</diagram></mxfile>')
+    return path
+
+
+# ── inflate() / deflate() ─────────────────────────────────────
+
+
+class TestInflate:
+    """Compressed payloads decode once and are then served from cache."""
+
+    def test_roundtrip(self):
+        assert drawio_io.inflate(drawio_io.deflate(MODEL)) == MODEL
+
+    def test_plain_text_is_not_compressed(self):
+        assert drawio_io.inflate("<mxGraphModel/>") is None
+
+    def test_memory_then_disk_cache(self, drawio_cache):
+        encoded = drawio_io.deflate(MODEL)
+        drawio_io.clear_memo()
+
+        assert drawio_io.inflate(encoded) == MODEL
+        assert drawio_io.inflate(encoded) == MODEL
+        assert drawio_io.stats == {"inflated": 1, "memory_hits": 1, "disk_hits": 0}
+        assert (drawio_cache / f"{drawio_io.content_hash(encoded)}.xml").exists()
+
+        drawio_io.clear_memo()  # a new process: only the disk cache remains
+        assert drawio_io.inflate(encoded) == MODEL
+        assert drawio_io.stats == {"inflated": 0, "memory_hits": 0, "disk_hits": 1}
+
+    def test_disk_cache_disabled(self, monkeypatch):
+        monkeypatch.setattr(drawio_io, "CACHE_DIR", None)
+        encoded = drawio_io.deflate(MODEL)
+        drawio_io.clear_memo()
+        assert drawio_io.inflate(encoded) == MODEL
+        assert drawio_io.stats["inflated"] == 1
+
+    def test_memory_cache_is_capped(self, monkeypatch):
+        monkeypatch.setattr(drawio_io, "CACHE_DIR", None)
+        monkeypatch.setattr(drawio_io, "MEMO_MAX_BYTES", 3 * (64 + len(MODEL) + 2))
+        drawio_io.clear_memo()
+        encoded = [drawio_io.deflate(MODEL.replace("Ledger", f"Ledger {i}")) for i in range(6)]
+        assert len(drawio_io._DECODED) == 3
+        assert drawio_io._memo["bytes"] <= drawio_io.MEMO_MAX_BYTES
+
+        drawio_io.inflate(encoded[3])  # a hit makes the oldest entry the newest
+        drawio_io.inflate(encoded[0])  # evicts encoded[4]
+        assert drawio_io.stats == {"inflated": 1, "memory_hits": 1, "disk_hits": 0}
+        assert list(drawio_io._DECODED) == [drawio_io.content_hash(e) for e in
+                                            (encoded[5], encoded[3], encoded[0])]
+
+    def test_disk_cache_is_capped(self, drawio_cache, monkeypatch):
+        monkeypatch.setattr(drawio_io, "CACHE_MAX_BYTES", 4 * len(MODEL))
+        encoded = [drawio_io.deflate(MODEL.replace("Ledger", f"Ledger {i}")) for i in range(12)]
+        drawio_io.clear_memo()
+        for payload in encoded:
+            drawio_io.inflate(payload)
+        files = list(drawio_cache.glob("*.xml"))
+        assert 0 < sum(f.stat().st_size for f in files) <= drawio_io.CACHE_MAX_BYTES
+        assert drawio_cache / f"{drawio_io.content_hash(encoded[-1])}.xml" in files
+        assert not list(drawio_cache.glob("*.tmp"))
+
+    def test_prune_evicts_least_recently_used(self, drawio_cache):
+        encoded = [drawio_io.deflate(MODEL.replace("Ledger", f"Ledger {i}")) for i in range(4)]
+        drawio_io.clear_memo()
+        for payload in encoded:
+            drawio_io.inflate(payload)
+        paths = [drawio_cache / f"{drawio_io.content_hash(e)}.xml" for e in encoded]
+        for age, path in enumerate(reversed(paths)):
+            os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns - (age + 1) * 10**9))
+
+        drawio_io.clear_memo()
+        drawio_io.inflate(encoded[0])  # a disk hit makes the oldest file the newest
+        size = paths[0].stat().st_size
+        assert drawio_io.prune_cache(drawio_cache, max_bytes=3 * size) == 2
+        assert [p.exists() for p in paths] == [True, False, False, True]
+        assert drawio_io.prune_cache(drawio_cache, max_bytes=3 * size) == 0
+
+
+# ── tab_model() ───────────────────────────────────────────────
+
+
+class TestTabModel:
+    """tab_model returns inline and compressed models alike."""
+
+    def test_inline_model(self):
+        diagram = ET.fromstring(f'<diagram name="A">{MODEL}</diagram>')
+        assert diagram.find("mxGraphModel") is drawio_io.tab_model(diagram)
+
+    def test_compressed_model(self):
+        diagram = ET.fromstring(f'<diagram name="A">{drawio_io.deflate(MODEL)}</diagram>')
+        model = drawio_io.tab_model(diagram)
+        assert model.tag == "mxGraphModel"
+        assert len(list(model.iter("mxCell"))) == 4
+
+    def test_empty_tab(self):
+        assert drawio_io.tab_model(ET.fromstring('<diagram name="A"/>')) is None
+
+
+# ── callers read compressed tabs ──────────────────────────────
+
+
+class TestCompressedTabsInTools:
+    """extract_view and validate see the same cells in compressed and inline tabs."""
+
+    def test_extract_view_parse_drawio(self, tmp_path):
+        path = _compressed_file(tmp_path / "packed.drawio")
+        inline = tmp_path / "inline.drawio"
+        inline.write_text(f'<mxfile><diagram name="Packed" id="d1">{MODEL}</diagram></mxfile>')
+
+        packed_tabs = ev.parse_drawio(path)
+        assert [d["tab_name"] for d in packed_tabs] == ["Packed"]
+        assert packed_tabs == ev.parse_drawio(inline)
+
+    def test_validate_extracts_compressed_tab(self, tmp_path):
+        path = _compressed_file(tmp_path / "packed.drawio")
+        elements = v.extract_archimate_elements(path)
+        assert [(e["tab"], e["name"], e["layer"]) for e in elements] == [
+            ("Packed", "Order Service", "application"),
+            ("Packed", "Ledger", "technology"),
+        ]
+
+    def test_one_inflate_across_tools(self, tmp_path):
+        path = _compressed_file(tmp_path / "packed.drawio")
+        ev.parse_drawio(path)
+        v.extract_archimate_elements(path)
+        assert drawio_io.stats["inflated"] == 1
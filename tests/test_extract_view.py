@@ -199,3 +199,383 @@ class TestEnrichElement:
     def test_no_match_returns_none(self):
         ref = {"logical_components": [], "data_concept_groups": []}
         assert ev.enrich_element("Unknown Thing", ref) is None
+
+    def test_first_claim_wins_and_conflicts_are_reported(self):
+        ref = {
+            "logical_components": [
+                {"name": "Order Manager", "aliases": ["OM", "OM"], "description": "Handles orders"},
+            ],
+            "data_concept_groups": [
+                {"name": "Orders", "identifier": "OR", "data_aggregates": ["Order", "OM"]},
+            ],
+        }
+        assert ev.enrich_element("OM", ref)["type"] == "component"
+        assert ev.enrich_element("Order", ref)["group"] == "Orders"
+        issues = ev.get_reference_index(ref)["issues"]
+        assert issues == [
+            "'OM' is listed more than once for logical component 'Order Manager'",
+            "'OM' is claimed by both logical component 'Order Manager' and "
+            "data concept group 'Orders'; using logical component 'Order Manager'",
+        ]
+
+    def test_results_are_copies(self):
+        ref = {"logical_components": [{"name": "Order Manager", "description": "Handles orders"}]}
+        ev.enrich_element("Order Manager", ref)["description"] = "changed"
+        assert ev.enrich_element("Order Manager", ref)["description"] == "Handles orders"
+
+    def test_load_reports_conflicts(self, tmp_path, capsys):
+        path = tmp_path / "reference.yaml"
+        path.write_text(
+            "logical_components:\n  - name: A\n    aliases: [X]\n"
+            "integration_boundaries:\n  - name: X\n"
+        )
+        ref = ev.load_domain_reference(path)
+        assert ev.enrich_element("X", ref)["type"] == "component"
+        assert "WARNING: reference.yaml: 'X' is claimed by both" in capsys.readouterr().out
+
+    def test_index_is_not_stored_in_the_reference(self):
+        ref = {"logical_components": [{"name": "Order Manager"}]}
+        snapshot = {k: list(v) for k, v in ref.items()}
+        index = ev.get_reference_index(ref)
+        assert ev.get_reference_index(ref) is index
+        assert ref == snapshot
+
+    def test_batch_reports_conflicts_once(self, tmp_path, sample_drawio_xml, capfd):
+        path = tmp_path / "reference.yaml"
+        path.write_text("logical_components:\n  - name: A\n    aliases: [X]\n"
+                        "integration_boundaries:\n  - name: X\n")
+        files = []
+        for name in ("one", "two", "three"):
+            files.append(tmp_path / f"{name}.drawio")
+            files[-1].write_text(sample_drawio_xml)
+        for jobs in (1, 2):
+            ev.extract_all(files, path, jobs=jobs, force=True)
+            assert capfd.readouterr().out.count("'X' is claimed by both") == 1
+
+
+# ── detect_view_type() ────────────────────────────────────────
+
+
+def _cells_from(*pairs):
+    return {"cells": {str(i): {"label": label, "style": style}
+                      for i, (label, style) in enumerate(pairs)}}
+
+
+class TestDetectViewType:
+    """detect_view_type classifies tabs from a single feature vector."""
+
+    FUNC = "shape=mxgraph.archimate3.application;appType=func"
+    IFACE = "shape=mxgraph.archimate3.application;appType=interface"
+
+    def test_feature_counts(self):
+        diagram = _cells_from(("Order [DC]", self.FUNC), ("Cart (RM)", self.FUNC),
+                              ("PII Store", self.IFACE), ("", "startArrow=diamondThin;dashed=1"))
+        features = ev.view_type_features(diagram)
+        assert features["cells"] == 4
+        assert features["archimate"] == 3
+        assert features["functions"] == 2
+        assert features["interfaces"] == 1
+        assert features["composition"] == 1
+        assert features["dashed"] == 1
+        assert features["dc_markers"] == 1
+        assert features["rm_markers"] == 1
+        assert features["security_keywords"] == ["pii"]
+
+    def test_classification(self):
+        func = ("Component", self.FUNC)
+        assert ev.detect_view_type(_cells_from(("Trust Boundary", ""), func)) == "security"
+        assert ev.detect_view_type(_cells_from(("Order [dc]", self.FUNC))) == "data-aggregate"
+        assert ev.detect_view_type(_cells_from(func, ("", "startArrow=diamondThin"))) == "data-architecture"
+        assert ev.detect_view_type(_cells_from(func, func, func, ("API", self.IFACE))) == "domain-context"
+        assert ev.detect_view_type(_cells_from(("Box", "rounded=1"))) == "generic"
+
+    def test_keywords_do_not_span_labels(self):
+        assert ev.detect_view_type(_cells_from(("Trust", ""), ("Boundary", ""))) == "generic"
+
+    def test_verbose_logs_features(self, tmp_path, sample_drawio_xml):
+        drawio = tmp_path / "view.drawio"
+        drawio.write_text(sample_drawio_xml)
+        lines = []
+        ev.extract_file(drawio, None, log=lines.append, verbose=True)
+        features = [line.strip() for line in lines if line.strip().startswith("features:")]
+        assert len(features) == 1
+        assert " archimate=" in features[0] and " dc_markers=0" in features[0]
+
+
+# ── build_edge_index() / _extract_flows_for() ─────────────────
+
+
+def _cell(cid, label, source="", target=""):
+    return {"id": cid, "label": label, "style": "", "parent": "1",
+            "is_edge": bool(source or target), "is_vertex": not (source or target),
+            "source": source, "target": target}
+
+
+class TestEdgeIndex:
+    """Flow lookups read the per-diagram adjacency index."""
+
+    CELLS = {
+        "a": _cell("a", "Orders"),
+        "b": _cell("b", "Billing"),
+        "e1": _cell("e1", "OrderPlaced", "a", "b"),
+        "e2": _cell("e2", "", "a", "b"),
+        "e3": _cell("e3", "Refund", "b", "a"),
+        "e4": _cell("e4", "Retry", "a", "a"),
+        "e5": _cell("e5", "Audit", "a", "ghost"),
+    }
+
+    def _diagram(self):
+        edges = [c for c in self.CELLS.values() if c["is_edge"]]
+        return {"tab_name": "T", "cells": self.CELLS, "edges": edges}
+
+    def test_index_positions(self):
+        index = ev.get_edge_index(self._diagram())
+        assert index["outgoing"]["a"] == [0, 1, 3, 4]
+        assert index["incoming"]["a"] == [2, 3]
+        assert index["links"][4]["target_label"] is None
+
+    def test_flows_for_cell(self):
+        flows = ev._extract_flows_for("a", ev.get_edge_index(self._diagram()))
+        assert flows == {
+            "incoming": [{"from": "Billing", "data": "Refund"}],
+            "outgoing": [
+                {"to": "Billing", "data": "OrderPlaced"},
+                {"to": "Orders", "data": "Retry"},
+                {"to": "ghost", "data": "Audit"},
+            ],
+        }
+
+    def test_cross_domain_flows_skip_unknown_endpoints(self):
+        flows = ev._extract_cross_domain_flows(ev.get_edge_index(self._diagram()))
+        assert [f["data"] for f in flows] == ["OrderPlaced", "Refund", "Retry"]
+
+
+# ── _is_inside_domain() / layout index ────────────────────────
+
+
+def _vertex(cid, parent, x=0, y=0, w=10, h=10, geometry=True):
+    return {"id": cid, "label": cid, "style": "", "parent": parent, "is_edge": False,
+            "is_vertex": True, "geometry": {"x": x, "y": y, "w": w, "h": h} if geometry else None}
+
+
+class TestLayoutIndex:
+    """Containment and absolute positions come from memoized parent chains."""
+
+    def _cells(self):
+        cells = {"dom": _vertex("dom", "1", 0, 0, 1000, 1000)}
+        parent = "dom"
+        for i in range(30):  # deeply nested groups inside the domain
+            cells[f"g{i}"] = _vertex(f"g{i}", parent, 1, 2)
+            parent = f"g{i}"
+        cells["inner"] = _vertex("inner", parent, 5, 5)
+        cells["outside"] = _vertex("outside", "1", 2000, 0)
+        cells["floating"] = _vertex("floating", "bare", 3, 4)  # positioned by geometry only
+        cells["bare"] = _vertex("bare", "1", 100, 100, geometry=False)
+        cells["loop_a"] = _vertex("loop_a", "loop_b", 10, 10)
+        cells["loop_b"] = _vertex("loop_b", "loop_a", 20, 20)
+        return cells
+
+    def test_containment(self):
+        cells = self._cells()
+        layout = ev.build_layout_index(cells)
+        dom = cells["dom"]
+        assert ev._is_inside_domain(cells["inner"], dom, cells, layout)
+        assert ev._is_inside_domain(cells["g5"], dom, cells, layout)
+        assert not ev._is_inside_domain(cells["outside"], dom, cells, layout)
+        assert ev._is_inside_domain(cells["floating"], dom, cells, layout)
+        # Parent cycles end the walk; the geometry fallback still applies
+        assert ev._is_inside_domain(cells["loop_a"], dom, cells, layout)
+
+    def test_chain_offsets_match_parent_walk(self):
+        cells = self._cells()
+        layout = ev.build_layout_index(cells)
+        for cid in ("inner", "g10", "outside", "floating"):
+            cell = cells[cid]
+            offset = ev._chain_offset(cell["parent"], layout)
+            position = (cell["geometry"]["x"] + offset[0], cell["geometry"]["y"] + offset[1])
+            assert position == ev._absolute_position(cell, cells), cid
+        assert ev._chain_offset("loop_b", layout) is None
+
+    def test_chain_links_resolved_once(self):
+        cells = self._cells()
+        layout = ev.build_layout_index(cells)
+        ev._reaches("g29", "dom", layout)
+        assert len(layout["ancestors"]["dom"]) == 30
+        assert ev._reaches("g3", "dom", layout)
+
+
+# ── source stats / provenance ─────────────────────────────────
+
+
+class TestProvenance:
+    """File stats are computed once, during the parse, and reported per file."""
+
+    def test_line_count_matches_text_mode_iteration(self, tmp_path):
+        for data in (b"", b"a", b"a\n", b"a\nb", b"a\r\nb\r\n", b"a\rb\n\n"):
+            path = tmp_path / "f.txt"
+            path.write_bytes(data)
+            assert ev.source_stats(data)["lines"] == sum(1 for _ in open(path)), data
+
+    def test_provenance_block(self, tmp_path, sample_drawio_xml):
+        drawio = tmp_path / "view.drawio"
+        drawio.write_text(sample_drawio_xml)
+        stats = {}
+        result = ev.extract_file(drawio, None, stats=stats)
+        assert result["provenance"] == {
+            "file": "view.drawio",
+            "sha256": ev.file_sha256(drawio),
+            "lines": sample_drawio_xml.count("\n") + 1,
+            "bytes": drawio.stat().st_size,
+            "tabs": 1,
+        }
+        assert result["source_lines"] == stats["lines"]
+        assert stats["parse_seconds"] >= 0
+
+    def test_multi_tab_file_read_once(self, tmp_path, sample_drawio_xml, monkeypatch):
+        tab = sample_drawio_xml.split("<mxfile>")[1].split("</mxfile>")[0]
+        drawio = tmp_path / "tabs.drawio"
+        drawio.write_text(f"<mxfile>{tab}{tab}{tab}</mxfile>")
+        opened = []
+        real_open = open
+        monkeypatch.setattr("builtins.open", lambda f, *a, **k: opened.append(f) or real_open(f, *a, **k))
+        result = ev.extract_file(drawio, None)
+        assert opened == [drawio]
+        assert result["provenance"]["tabs"] == 3
+        lines = drawio.read_text().count("\n") + 1
+        assert [t["source_lines"] for t in result["tabs"]] == [lines] * 3
+
+
+# ── batch mode ────────────────────────────────────────────────
+
+
+class TestBatchExtraction:
+    """--all extracts many files with one reference load and skips unchanged outputs."""
+
+    def _tree(self, tmp_path, xml):
+        for rel in ("views/a/one.drawio", "views/b/two.drawio", "views/b/_template.drawio"):
+            path = tmp_path / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(xml)
+        return tmp_path / "views"
+
+    def test_collect_dirs_globs_and_files(self, tmp_path, sample_drawio_xml):
+        views = self._tree(tmp_path, sample_drawio_xml)
+        one = views / "a" / "one.drawio"
+        assert ev.collect_drawio_files([str(views)]) == [one, views / "b" / "two.drawio"]
+        assert ev.collect_drawio_files([str(views / "*" / "one.drawio"), str(one)]) == [one]
+
+    def test_writes_only_changed_outputs(self, tmp_path, sample_drawio_xml):
+        views = self._tree(tmp_path, sample_drawio_xml)
+        files = ev.collect_drawio_files([str(views)])
+
+        first = ev.extract_all(files, ev.DEFAULT_REFERENCE)
+        assert [s["status"] for s in first] == ["written", "written"]
+        forced = ev.extract_all(files, ev.DEFAULT_REFERENCE, force=True)
+        assert [s["status"] for s in forced] == ["unchanged", "unchanged"]
+
+        ref = ev.load_domain_reference(ev.DEFAULT_REFERENCE)
+        expected = ev.dump_yaml(ev.extract_file(files[0], ref))
+        assert ev.default_output_path(files[0]).read_text().split("\n", 1)[1] == expected
+
+    def test_errors_are_reported_not_raised(self, tmp_path):
+        bad = tmp_path / "bad.drawio"
+        bad.write_text("<mxfile><diagram>")
+        [summary] = ev.extract_all([bad], None)
+        assert summary["status"] == "error"
+        assert "ParseError" in summary["error"]
+
+    def test_reports_workers_actually_used(self, tmp_path, sample_drawio_xml, capsys):
+        views = self._tree(tmp_path, sample_drawio_xml)
+        ev.run_batch([str(views / "a")], ev.DEFAULT_REFERENCE, jobs=4)
+        assert "Extracting 1 file(s)...\n" in capsys.readouterr().out
+        ev.run_batch([str(views)], ev.DEFAULT_REFERENCE, jobs=4)
+        assert "Extracting 2 file(s) with 2 worker(s)..." in capsys.readouterr().out
+
+
+# ── output stamps ─────────────────────────────────────────────
+
+
+class TestOutputStamp:
+    """Outputs are skipped when source, extractor version and reference all match."""
+
+    def _setup(self, tmp_path, xml):
+        drawio = tmp_path / "view.drawio"
+        drawio.write_text(xml)
+        ref = tmp_path / "reference.yaml"
+        ref.write_text("logical_components: []\n")
+        return drawio, ref
+
+    def _run(self, drawio, ref, **kw):
+        [summary] = ev.extract_all([drawio], ref, **kw)
+        return summary["status"]
+
+    def test_stamp_round_trip(self, tmp_path, sample_drawio_xml):
+        drawio, ref = self._setup(tmp_path, sample_drawio_xml)
+        assert self._run(drawio, ref) == "written"
+        stamp = ev.read_stamp(ev.default_output_path(drawio))
+        assert stamp == {
+            "source": ev.file_sha256(drawio),
+            "extractor": str(ev.EXTRACTOR_VERSION),
+            "reference": ev.file_sha256(ref),
+            "type": "auto",
+            "tabs": "1",
+            "lines": str(sample_drawio_xml.count("\n") + 1),
+            "bytes": str(drawio.stat().st_size),
+        }
+        assert self._run(drawio, ref) == "skipped"
+
+    def test_any_input_change_re_extracts(self, tmp_path, sample_drawio_xml, monkeypatch):
+        drawio, ref = self._setup(tmp_path, sample_drawio_xml)
+        self._run(drawio, ref)
+
+        ref.write_text("logical_components: []\ndata_concept_groups: []\n")
+        assert self._run(drawio, ref) == "unchanged"  # re-extracted: new reference hash
+        assert self._run(drawio, ref) == "skipped"
+
+        drawio.write_text(sample_drawio_xml.replace("Order Service", "Order Hub"))
+        assert self._run(drawio, ref) == "written"
+
+        monkeypatch.setattr(ev, "EXTRACTOR_VERSION", ev.EXTRACTOR_VERSION + 1)
+        assert self._run(drawio, ref) == "unchanged"
+        assert self._run(drawio, ref, view_type="generic") == "written"
+        assert self._run(drawio, ref, view_type="generic") == "skipped"
+
+    def test_same_body_is_not_rewritten(self, tmp_path, sample_drawio_xml, monkeypatch):
+        drawio, ref = self._setup(tmp_path, sample_drawio_xml)
+        self._run(drawio, ref)
+        output = ev.default_output_path(drawio)
+        original = output.read_text()
+        monkeypatch.setattr(ev, "EXTRACTOR_VERSION", ev.EXTRACTOR_VERSION + 1)
+
+        assert self._run(drawio, ref) == "unchanged"
+        assert output.read_text() == original
+        assert ev.read_stamp(output)["extractor"] == str(ev.EXTRACTOR_VERSION)
+        assert self._run(drawio, ref) == "skipped"
+
+        # The recorded stamp only applies to the body it was recorded for
+        output.write_text(original + "# hand edit\n")
+        assert ev.read_stamp(output)["extractor"] == str(ev.EXTRACTOR_VERSION - 1)
+        assert self._run(drawio, ref) == "written"
+        assert not list(ev.STAMP_CACHE_DIR.iterdir())
+
+        # Going back to the stamped version drops the recorded stamp
+        monkeypatch.setattr(ev, "EXTRACTOR_VERSION", ev.EXTRACTOR_VERSION + 1)
+        assert self._run(drawio, ref) == "unchanged"
+        monkeypatch.setattr(ev, "EXTRACTOR_VERSION", ev.EXTRACTOR_VERSION - 1)
+        assert self._run(drawio, ref) == "unchanged"
+        assert not list(ev.STAMP_CACHE_DIR.iterdir())
+        assert self._run(drawio, ref) == "skipped"
+
+    def test_verbose_logs_features_for_current_output(self, tmp_path, sample_drawio_xml):
+        drawio, ref = self._setup(tmp_path, sample_drawio_xml)
+        self._run(drawio, ref)
+        lines = []
+        summary = ev.extract_to_file(drawio, ev.load_domain_reference(ref), ev.file_sha256(ref),
+                                     log=lines.append, verbose=True)
+        assert summary["status"] == "unchanged"
+        assert any(line.strip().startswith("features:") for line in lines)
+
+    def test_unstamped_output_is_regenerated(self, tmp_path, sample_drawio_xml):
+        drawio, ref = self._setup(tmp_path, sample_drawio_xml)
+        ev.default_output_path(drawio).write_text("view_type: generic\n")
+        assert self._run(drawio, ref) == "written"
@@ -1,9 +1,16 @@
 """Tests for scripts/generate_dashboard.py — pure function tests.
 
 Tests cover domain stats and layer stats calculation using
-the sample_registry_elements fixture from conftest.py.
+the sample_registry_elements fixture from conftest.py, template
+rendering with its data sidecar, run history and the in-process
+validator call.
 """
 
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
 import generate_dashboard as gd
 
 
@@ -67,3 +74,278 @@ class TestCalculateLayerStats:
     def test_empty_list(self):
         stats = gd.calculate_layer_stats([])
         assert stats == {}
+
+
+# ── build_domain_index() / get_domain_maturity() ──────────────
+
+
+class TestDomainIndex:
+    """One pass over elements and one walk of views/ feed stats and maturity."""
+
+    def _views(self, tmp_path):
+        views = tmp_path / "views"
+        (views / "customer-management" / "context").mkdir(parents=True)
+        (views / "customer-management" / "context" / "landscape.drawio").write_text("")
+        (views / "customer-management" / "landscape.extracted.yaml").write_text("")
+        (views / "billing-and-payments").mkdir()
+        (views / "billing-and-payments" / "notes.md").write_text("")
+        (views / "stray.drawio").write_text("")
+        return views
+
+    def test_scan_views(self, tmp_path):
+        assert gd.scan_views(self._views(tmp_path)) == {
+            "customer-management": {"drawio": 1, "extracted": 1},
+            "billing-and-payments": {"drawio": 0, "extracted": 0},
+        }
+
+    def test_maturity_from_index(self, tmp_path, sample_registry_elements):
+        index = gd.build_domain_index(sample_registry_elements, self._views(tmp_path))
+        assert index["element_types"]["customer-management"] == {"components", "functions", "nodes"}
+
+        cm = gd.get_domain_maturity("customer-management", sample_registry_elements, {}, index)
+        assert cm["score"] == 4
+        assert (cm["has_components"], cm["has_functions"], cm["has_data"]) == (True, True, False)
+        assert cm["has_views"] and cm["has_extracts"]
+
+        bp = gd.get_domain_maturity("billing-and-payments", sample_registry_elements, {}, index)
+        assert bp["score"] == 1 and not bp["has_views"]
+        assert gd.get_domain_maturity("unknown", [], {}, index)["score"] == 0
+
+    def test_generate_html_walks_views_once(self, tmp_path, monkeypatch, sample_registry_elements):
+        monkeypatch.setattr(gd, "VIEWS_DIR", self._views(tmp_path))
+        walks = []
+        real_walk = gd.os.walk
+        monkeypatch.setattr(gd.os, "walk", lambda top, *a, **kw: walks.append(top) or real_walk(top, *a, **kw))
+        output = gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html")
+        assert walks == [gd.VIEWS_DIR]
+        assert "customer-management" in output.read_text()
+
+    def test_stats_match_index(self, sample_registry_elements):
+        index = gd.build_domain_index(sample_registry_elements)
+        assert gd.calculate_domain_stats(sample_registry_elements, index) == \
+            gd.calculate_domain_stats(sample_registry_elements)
+        assert gd.calculate_layer_stats(sample_registry_elements, index)["application"]["total"] == 4
+
+
+# ── generate_html() ───────────────────────────────────────────
+
+
+class TestGenerateHtml:
+    """The page is rendered from the template; issue lists go to the sidecar."""
+
+    def _validator_data(self, count):
+        return {
+            "orphan_elements": [{"name": f"Orphan <{i}>", "location": f"registry/o-{i}.md"}
+                                for i in range(count)],
+            "errors": [{"element": f"Missing & {i}", "file": "views/x.drawio", "layer": "application"}
+                       for i in range(count)],
+        }
+
+    def _sidecar(self, tmp_path):
+        text = (tmp_path / gd.DATA_FILENAME).read_text(encoding="utf-8")
+        assert text.startswith("window.dashboardDataLoaded(") and text.endswith(");\n")
+        return json.loads(text[len("window.dashboardDataLoaded("):-3])
+
+    def test_sidecar_holds_every_issue(self, tmp_path, sample_registry_elements):
+        gd.generate_html(sample_registry_elements, self._validator_data(3), tmp_path / "dashboard.html")
+        data = self._sidecar(tmp_path)
+        assert data["orphans"][2] == ["Orphan <2>", "registry/o-2.md"]
+        assert data["errors"][0] == ["Missing & 0", "views/x.drawio", "application"]
+        assert len(data["orphans"]) == len(data["errors"]) == 3
+
+    def test_page_references_sidecar_and_pages(self, tmp_path, sample_registry_elements):
+        output = gd.generate_html(sample_registry_elements, self._validator_data(3), tmp_path / "dashboard.html")
+        page = output.read_text(encoding="utf-8")
+        assert "{{" not in page
+        assert f'script.src = "{gd.DATA_FILENAME}"' in page
+        assert f"var PAGE_SIZE = {gd.PAGE_SIZE};" in page
+        assert 'id="orphans" data-list="orphans" >' in page
+        # Issue rows are never rendered into the page itself
+        assert "Orphan" not in page.split("<body>")[1].split("<script>")[0].replace("Orphan Elements", "")
+
+    def test_empty_lists_are_hidden(self, tmp_path, sample_registry_elements):
+        page = gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html").read_text()
+        assert 'data-list="orphans" hidden>' in page and 'data-list="errors" hidden>' in page
+        assert self._sidecar(tmp_path) == {"orphans": [], "errors": []}
+
+    def test_page_size_independent_of_issue_count(self, tmp_path, sample_registry_elements):
+        # Same digit count in the stat cards, so only the issue rows could differ
+        small = gd.generate_html(sample_registry_elements, self._validator_data(1000), tmp_path / "dashboard.html")
+        small_size = small.stat().st_size
+        large = gd.generate_html(sample_registry_elements, self._validator_data(5000), tmp_path / "dashboard.html")
+        assert large.stat().st_size == small_size
+        assert len(self._sidecar(tmp_path)["orphans"]) == 5000
+
+    def test_registry_values_are_escaped(self, tmp_path, sample_registry_elements):
+        elements = sample_registry_elements + [
+            dict(sample_registry_elements[0], name="x", element_type="<script>")
+        ]
+        page = gd.generate_html(elements, {}, tmp_path / "dashboard.html").read_text()
+        assert "&lt;script&gt; (1)" in page
+        assert "<script> (1)" not in page
+
+    def test_failed_render_keeps_previous_page(self, tmp_path, monkeypatch, sample_registry_elements):
+        output = gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html")
+        before = output.read_text()
+
+        def broken_rows(*args):
+            yield "<tr>"
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(gd, "_layer_rows", broken_rows)
+        with pytest.raises(RuntimeError):
+            gd.generate_html(sample_registry_elements, {}, output)
+        assert output.read_text() == before
+        assert sorted(p.name for p in tmp_path.iterdir()) == [gd.DATA_FILENAME, "dashboard.html"]
+
+    def test_template_compiled_once(self, tmp_path, monkeypatch, sample_registry_elements):
+        reads = []
+        real_read = gd.Path.read_text
+        monkeypatch.setattr(gd, "_TEMPLATES", {})
+        monkeypatch.setattr(gd.Path, "read_text",
+                            lambda self, *a, **kw: reads.append(self) or real_read(self, *a, **kw))
+        gd.generate_html(sample_registry_elements, {}, tmp_path / "a.html")
+        gd.generate_html(sample_registry_elements, {}, tmp_path / "b.html")
+        assert reads.count(gd.TEMPLATE_PATH) == 1
+
+
+# ── run history ───────────────────────────────────────────────
+
+
+class TestHistory:
+    """Runs are appended to a JSON-lines file and drawn as sparklines."""
+
+    def _record(self, run, elements=10, **extra):
+        return dict({"run": run, "elements": elements, "orphans": 0, "errors": 0}, **extra)
+
+    def test_append_and_read_window(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        for day in range(1, 11):
+            gd.append_history(path, self._record(f"2026-01-{day:02d}T02:00:00", elements=day))
+        assert len(path.read_text().splitlines()) == 10
+        window = gd.read_history(path, 3)
+        assert [r["elements"] for r in window] == [8, 9, 10]
+        assert gd.read_history(path, 50) == gd.read_history(path, 10)
+        assert gd.read_history(tmp_path / "missing.jsonl") == []
+
+    def test_read_window_does_not_scan_whole_file(self, tmp_path, monkeypatch):
+        path = tmp_path / "history.jsonl"
+        with open(path, "w") as f:
+            for i in range(20000):
+                f.write(json.dumps(self._record(f"2026-01-01T00:00:00.{i:06d}", elements=i)) + "\n")
+        parsed = []
+        real_loads = gd.json.loads
+        monkeypatch.setattr(gd.json, "loads", lambda raw: parsed.append(raw) or real_loads(raw))
+        window = gd.read_history(path, 5, block_size=4096)
+        assert [r["elements"] for r in window] == list(range(19995, 20000))
+        assert len(parsed) == 5
+
+    def test_torn_line_is_skipped_and_terminated(self, tmp_path):
+        path = tmp_path / "history.jsonl"
+        gd.append_history(path, self._record("2026-01-01T02:00:00", elements=1))
+        with open(path, "a") as f:
+            f.write('{"run": "2026-01-02T0')  # interrupted run
+        gd.append_history(path, self._record("2026-01-03T02:00:00", elements=3))
+        assert [r["elements"] for r in gd.read_history(path, 10)] == [1, 3]
+
+    def test_thin_history(self):
+        runs = [self._record(f"2024-{m:02d}-{d:02d}T02:00:00", elements=m * 100 + d)
+                for m in range(1, 13) for d in range(1, 29)]
+        thinned = gd.thin_history(runs, full_runs=28, weekly_days=60)
+        assert thinned[-28:] == runs[-28:]
+        older = thinned[:-28]
+        # Weekly buckets within 60 days of the newest run, monthly before that
+        assert older[0]["elements"] == 128
+        assert 10 < len(older) < 30
+        assert [r["run"] for r in thinned] == sorted(r["run"] for r in thinned)
+
+    def test_thin_history_skips_malformed_newest(self):
+        runs = [self._record(f"2024-{m:02d}-01T02:00:00", elements=m) for m in range(1, 13)]
+        runs.append(self._record("not a date", elements=99))
+        thinned = gd.thin_history(runs, full_runs=2, weekly_days=60)
+        assert thinned[-2:] == runs[-2:]
+        assert [r["elements"] for r in thinned[:-2]] == list(range(1, 12))
+
+    def test_compaction_when_file_grows(self, tmp_path, monkeypatch):
+        path = tmp_path / "history.jsonl"
+        monkeypatch.setattr(gd, "HISTORY_COMPACT_BYTES", 20000)
+        monkeypatch.setattr(gd, "HISTORY_FULL_RUNS", 30)
+        compacted = []
+        for day in range(400):
+            when = datetime(2025, 1, 1) + timedelta(days=day)
+            compacted.append(gd.append_history(path, self._record(when.isoformat(), elements=day)))
+        assert any(compacted)
+        assert path.stat().st_size <= 20000
+        window = gd.read_history(path, 30)
+        assert [r["elements"] for r in window] == list(range(370, 400))
+
+    def test_build_summary(self, sample_registry_elements):
+        index = gd.build_domain_index(sample_registry_elements)
+        maturity = {d: gd.get_domain_maturity(d, sample_registry_elements, {}, index)
+                    for d in gd.KNOWN_DOMAINS}
+        record = gd.build_summary(sample_registry_elements, {"errors": [{}], "status": "FAILED"},
+                                  index, maturity, run="2026-01-01T02:00:00")
+        assert record["elements"] == len(sample_registry_elements)
+        assert (record["orphans"], record["errors"], record["status"]) == (0, 1, "FAILED")
+        assert record["layers"]["application"] == 4
+        assert record["domains"]["customer-management"]["maturity"] == maturity["customer-management"]["score"]
+
+    def test_validator_error_is_not_a_clean_run(self, sample_registry_elements):
+        index = gd.build_domain_index(sample_registry_elements)
+        record = gd.build_summary(sample_registry_elements, {"status": "ERROR", "error": "boom"},
+                                  index, {}, run="2026-01-01T02:00:00")
+        assert (record["orphans"], record["errors"], record["status"]) == (None, None, "ERROR")
+        assert "1 runs" in gd.sparkline([3, record["errors"]])
+
+    def test_sparkline(self):
+        assert gd.sparkline([]) == gd.sparkline([None]) == ""
+        svg = gd.sparkline([1, None, 3], width=100, height=20)
+        assert svg.startswith('<svg class="sparkline"')
+        assert 'points="0.0,18.0 100.0,2.0"' in svg
+        assert "2 runs: min 1, max 3, latest 3" in svg
+
+    def test_generate_html_records_run(self, tmp_path, sample_registry_elements):
+        path = tmp_path / "history.jsonl"
+        page = gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html", path).read_text()
+        assert len(gd.read_history(path)) == 1
+        assert '<div class="section" hidden>\n            <h2>Trends</h2>' in page
+
+        page = gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html", path).read_text()
+        assert "Last 2 recorded runs" in page
+        assert page.count('<svg class="sparkline"') >= 3 + len(gd.KNOWN_DOMAINS)
+
+    def test_no_history_by_default(self, tmp_path, sample_registry_elements):
+        gd.generate_html(sample_registry_elements, {}, tmp_path / "dashboard.html")
+        assert not (tmp_path / gd.HISTORY_FILENAME).exists()
+
+
+# ── run_validator() ───────────────────────────────────────────
+
+
+class TestRunValidator:
+    """run_validator validates the loaded registry in-process."""
+
+    def test_in_process_report(self, tmp_path, monkeypatch, sample_registry_elements):
+        import subprocess
+
+        import validate
+
+        monkeypatch.setattr(validate, "REPO_ROOT", tmp_path)
+        monkeypatch.setattr(validate, "VIEWS_DIR", tmp_path / "views")
+        monkeypatch.setattr(subprocess, "run", lambda *a, **kw: pytest.fail("subprocess spawned"))
+        monkeypatch.setattr(validate, "load_registry", lambda **kw: pytest.fail("registry scanned again"))
+
+        data = gd.run_validator([dict(e, file=f"{e['name']}.md") for e in sample_registry_elements],
+                                use_cache=False)
+        assert data["status"] == "PASSED"
+        assert data["registry"]["total_elements"] == len(sample_registry_elements)
+        assert len(data["orphan_elements"]) == len(sample_registry_elements)
+
+    def test_errors_become_error_status(self, monkeypatch):
+        import validate
+
+        def boom(*args, **kwargs):
+            raise RuntimeError("no views")
+
+        monkeypatch.setattr(validate, "validate", boom)
+        assert gd.run_validator([]) == {"status": "ERROR", "error": "no views"}
@@ -1,9 +1,15 @@
 """Tests for scripts/generate_library.py — pure function tests.
 
 Tests cover create_shape_xml which converts an element dict into
-a draw.io library shape dict (xml, w, h, title, aspect).
+a draw.io library shape dict (xml, w, h, title, aspect), and
+incremental regeneration against the library manifest.
 """
 
+import json
+import sys
+
+import pytest
+
 import generate_library as gl
 
 
@@ -125,3 +131,126 @@ class TestCreateShapeXml:
         }
         result = gl.create_shape_xml(elem)
         assert result["aspect"] == "fixed"
+
+
+# ── generate_libraries() ──────────────────────────────────────
+
+
+def _element(name, element_type="components", domain="customer-management", **extra):
+    return dict({
+        "name": name,
+        "layer": "application",
+        "element_type": element_type,
+        "domain": domain,
+        "owner": "Team A",
+        "status": "active",
+        "specialization": "",
+    }, **extra)
+
+
+class TestGenerateLibraries:
+    """Only libraries whose elements changed are regenerated."""
+
+    LIB = "customer-management/customer-management.components.xml"
+
+    def _elements(self):
+        return [
+            _element("Order Service"),
+            _element("Billing Engine"),
+            _element("Customer Record", "data-objects"),
+            _element("Invoice", "data-objects", domain="", specialization="Data Concepts"),
+        ]
+
+    def test_first_run_writes_every_library(self, tmp_path):
+        result = gl.generate_libraries(self._elements(), tmp_path)
+        assert result["libraries"] == {
+            self.LIB: {"status": "new", "shapes": 2},
+            "customer-management/customer-management.data-objects.xml": {"status": "new", "shapes": 1},
+            "cross-cutting/cross-cutting.data-concepts.xml": {"status": "new", "shapes": 1},
+        }
+        text = (tmp_path / self.LIB).read_text()
+        assert text.startswith("<mxlibrary>[\n  {") and text.endswith("]</mxlibrary>\n")
+        assert text.index("Billing Engine") < text.index("Order Service")
+        manifest = json.loads((tmp_path / gl.MANIFEST_NAME).read_text())
+        assert set(manifest["libraries"]) == set(result["libraries"])
+
+    def test_only_changed_library_is_rewritten(self, tmp_path, monkeypatch):
+        elements = self._elements()
+        gl.generate_libraries(elements, tmp_path)
+        writes = []
+        real_write = gl.registry_core.write_atomically
+        monkeypatch.setattr(gl.registry_core, "write_atomically",
+                            lambda path, data: writes.append(path.name) or real_write(path, data))
+
+        result = gl.generate_libraries(elements, tmp_path)
+        assert {r["status"] for r in result["libraries"].values()} == {"unchanged"}
+        assert writes == []
+
+        elements[0]["owner"] = "Team B"
+        result = gl.generate_libraries(elements, tmp_path)
+        assert result["libraries"][self.LIB]["status"] == "changed"
+        assert writes == ["customer-management.components.xml", gl.MANIFEST_NAME]
+
+    def test_unchanged_libraries_are_not_rendered(self, tmp_path, monkeypatch):
+        gl.generate_libraries(self._elements(), tmp_path)
+        monkeypatch.setattr(gl, "create_shape_xml", lambda e: pytest.fail("rendered an unchanged library"))
+        gl.generate_libraries(self._elements(), tmp_path)
+
+    def test_check_reports_stale_without_writing(self, tmp_path):
+        elements = self._elements()
+        gl.generate_libraries(elements, tmp_path)
+        before = {p: p.read_bytes() for p in tmp_path.rglob("*") if p.is_file()}
+
+        elements[1]["status"] = "retired"
+        (tmp_path / "customer-management" / "customer-management.data-objects.xml").write_text("edited")
+        result = gl.generate_libraries(elements[1:], tmp_path, check=True)
+        statuses = {rel: r["status"] for rel, r in result["libraries"].items()}
+        assert statuses[self.LIB] == "changed"
+        assert statuses["customer-management/customer-management.data-objects.xml"] == "edited"
+        assert statuses["cross-cutting/cross-cutting.data-concepts.xml"] == "unchanged"
+        assert {p: p.read_bytes() for p in tmp_path.rglob("*") if p.is_file()} == {
+            **before, tmp_path / "customer-management" / "customer-management.data-objects.xml": b"edited"}
+
+    def test_removed_library_is_deleted(self, tmp_path):
+        gl.generate_libraries(self._elements(), tmp_path)
+        remaining = [e for e in self._elements() if e["domain"]]
+        assert gl.generate_libraries(remaining, tmp_path, check=True)["removed"] == [
+            "cross-cutting/cross-cutting.data-concepts.xml"]
+        assert (tmp_path / "cross-cutting" / "cross-cutting.data-concepts.xml").exists()
+
+        gl.generate_libraries(remaining, tmp_path)
+        assert not (tmp_path / "cross-cutting" / "cross-cutting.data-concepts.xml").exists()
+        assert gl.generate_libraries(remaining, tmp_path, check=True) == {
+            "libraries": {
+                self.LIB: {"status": "unchanged", "shapes": 2},
+                "customer-management/customer-management.data-objects.xml": {"status": "unchanged", "shapes": 1},
+            },
+            "removed": [],
+        }
+
+    def test_unmapped_group_is_recorded_once(self, tmp_path, capsys):
+        elements = self._elements() + [_element("Mystery", "widgets")]
+        gl.generate_libraries(elements, tmp_path)
+        assert "No shape mapping" in capsys.readouterr().out
+        assert not (tmp_path / "customer-management" / "customer-management.widgets.xml").exists()
+
+        result = gl.generate_libraries(elements, tmp_path, check=True)
+        assert "customer-management/customer-management.widgets.xml" not in result["libraries"]
+        assert {r["status"] for r in result["libraries"].values()} == {"unchanged"}
+
+    def test_force_regenerates(self, tmp_path):
+        gl.generate_libraries(self._elements(), tmp_path)
+        result = gl.generate_libraries(self._elements(), tmp_path, force=True)
+        assert {r["status"] for r in result["libraries"].values()} == {"forced"}
+
+    def test_main_check_exit_code(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(gl, "LIBRARIES_DIR", tmp_path)
+        monkeypatch.setattr(gl, "load_registry", self._elements)
+        monkeypatch.setattr(sys, "argv", ["generate_library.py", "--check"])
+        assert gl.main() == 1
+        assert not any(tmp_path.iterdir())
+
+        monkeypatch.setattr(sys, "argv", ["generate_library.py"])
+        assert gl.main() == 0
+        monkeypatch.setattr(sys, "argv", ["generate_library.py", "--check"])
+        assert gl.main() == 0
@@ -1,11 +1,14 @@
-"""Tests for scripts/refresh_diagrams.py — pure function tests.
+"""Tests for scripts/refresh_diagrams.py.
 
 Tests cover the encode/decode roundtrip, label cleaning,
-registry matching, and cell label extraction.
+registry matching, cell label extraction, and refreshing
+diagram files (serially, in parallel, atomically).
 """
 
 import xml.etree.ElementTree as ET
 
+import pytest
+
 import refresh_diagrams as rd
 
 
@@ -102,3 +105,245 @@ class TestFindMatchingRegistryEntry:
     def test_empty_label(self):
         registry = {"Order Service": {"name": "Order Service"}}
         assert rd.find_matching_registry_entry("", registry) is None
+
+    def test_whitespace_and_case_insensitive(self):
+        registry = {"Order  Service": {"name": "Order  Service"}}
+        assert rd.find_matching_registry_entry("ORDER service", registry)["name"] == "Order  Service"
+
+    def test_alias_match(self):
+        registry = {"Order Service": {"name": "Order Service", "aliases": ["OS", "Orders"]},
+                    "Billing": {"name": "Billing", "aliases": "Invoicing, Billing Engine"}}
+        assert rd.find_matching_registry_entry("os", registry)["name"] == "Order Service"
+        assert rd.find_matching_registry_entry("billing engine", registry)["name"] == "Billing"
+
+    def test_ambiguous_match_is_not_resolved(self):
+        registry = {"Order Service": {"name": "Order Service"},
+                    "ORDER SERVICE": {"name": "ORDER SERVICE"},
+                    "Orders": {"name": "Orders", "aliases": ["order service"]}}
+        assert rd.find_matching_registry_entry("order service", registry) is None
+        assert rd.match_registry_names("order service", registry) == [
+            "Order Service", "ORDER SERVICE", "Orders"]
+        # An exact name is never ambiguous
+        assert rd.find_matching_registry_entry("Order Service", registry)["name"] == "Order Service"
+        assert rd.ambiguous_names(registry) == {
+            "order service": ["Order Service", "ORDER SERVICE", "Orders"]}
+
+    def test_index_follows_registry_changes(self):
+        registry = {"Order Service": {"name": "Order Service"}}
+        assert rd.find_matching_registry_entry("payments", registry) is None
+        registry["Payments"] = {"name": "Payments"}
+        assert rd.find_matching_registry_entry("payments", registry)["name"] == "Payments"
+
+    def test_index_follows_alias_edits(self):
+        registry = {"Order Service": {"name": "Order Service", "aliases": ["OS"]}}
+        assert rd.find_matching_registry_entry("os", registry)["name"] == "Order Service"
+        registry["Order Service"]["aliases"] = ["Orders"]  # same dict, same size
+        assert rd.find_matching_registry_entry("os", registry) is None
+        assert rd.find_matching_registry_entry("orders", registry)["name"] == "Order Service"
+
+
+# ── refresh_diagram() ─────────────────────────────────────────
+
+
+class TestRefreshDiagram:
+    """refresh_diagram updates matched objects and reports ambiguous labels."""
+
+    def test_ambiguous_label_is_reported_not_updated(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = tmp_path / "view.drawio"
+        drawio.write_text(
+            '<mxfile><diagram name="Tab"><mxGraphModel><root>'
+            '<object id="2" label="order service"><mxCell vertex="1" parent="1"/></object>'
+            '<object id="3" label="Billing"><mxCell vertex="1" parent="1"/></object>'
+            '</root></mxGraphModel></diagram></mxfile>'
+        )
+        registry = {"Order Service": {"owner": "A"}, "Orders": {"owner": "B", "aliases": ["Order Service"]},
+                    "Billing": {"owner": "C"}}
+        result = rd.refresh_diagram(drawio, registry)
+        assert result["ambiguous"] == [
+            {"tab": "Tab", "label": "order service", "candidates": ["Order Service", "Orders"]}]
+        assert [u["label"] for u in result["updates"]] == ["Billing"]
+        assert 'owner="C"' in drawio.read_text() and 'owner="A"' not in drawio.read_text()
+
+
+# ── refresh_all() / atomic writes ─────────────────────────────
+
+
+def _object_diagram(path, *labels):
+    objects = "".join(f'<object id="{i + 2}" label="{label}"><mxCell vertex="1" parent="1"/></object>'
+                      for i, label in enumerate(labels))
+    path.write_text(f'<mxfile><diagram name="Tab"><mxGraphModel><root>{objects}'
+                    f'</root></mxGraphModel></diagram></mxfile>')
+    return path
+
+
+class TestRefreshAll:
+    """refresh_all fans files out to workers and writes each file atomically."""
+
+    REGISTRY = {"Billing": {"owner": "C"}, "Orders": {"owner": "D"}}
+
+    def test_parallel_matches_serial(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        serial = [_object_diagram(tmp_path / f"s{i}.drawio", "Billing", "orders", "Other") for i in range(3)]
+        parallel = [_object_diagram(tmp_path / f"p{i}.drawio", "Billing", "orders", "Other") for i in range(3)]
+
+        expected = rd.refresh_all(serial, self.REGISTRY, jobs=1)
+        results = rd.refresh_all(parallel, self.REGISTRY, jobs=2)
+        assert [r["file"] for r in results] == ["p0.drawio", "p1.drawio", "p2.drawio"]
+        assert [r["updates"] for r in results] == [r["updates"] for r in expected]
+        assert all(p.read_text() == s.read_text() for p, s in zip(parallel, serial))
+        assert sorted(f.name for f in tmp_path.iterdir()) == sorted(
+            [p.name for p in serial] + [p.name for p in parallel])
+
+    def test_errors_are_reported_not_raised(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        broken = tmp_path / "broken.drawio"
+        broken.write_text("<mxfile><diagram>")
+        good = _object_diagram(tmp_path / "good.drawio", "Billing")
+        results = rd.refresh_all([broken, good], self.REGISTRY)
+        assert "ParseError" in results[0]["error"]
+        assert len(results[1]["updates"]) == 1
+
+    def test_interrupted_write_keeps_original(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = _object_diagram(tmp_path / "view.drawio", "Billing")
+        original = drawio.read_text()
+
+        def interrupted(src, dst):
+            raise KeyboardInterrupt
+
+        monkeypatch.setattr(rd.registry_core.fsutil.os, "replace", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            rd.refresh_diagram(drawio, self.REGISTRY)
+        assert drawio.read_text() == original
+        assert [f.name for f in tmp_path.iterdir()] == ["view.drawio"]
+
+
+# ── per-tab re-encoding ───────────────────────────────────────
+
+
+class TestPerTabRewrite:
+    """Only tabs with updates are re-encoded; untouched files are not rewritten."""
+
+    REGISTRY = {"Billing": {"owner": "C"}}
+
+    def _compressed_tab(self, name, label):
+        model = (f'<mxGraphModel><root><object id="2" label="{label}">'
+                 f'<mxCell vertex="1" parent="1"/></object></root></mxGraphModel>')
+        return f'<diagram name="{name}">{rd.encode_diagram_content(model)}</diagram>'
+
+    def _payloads(self, path):
+        return {d.get("name"): d.text for d in ET.parse(path).getroot().iter("diagram")}
+
+    def test_unchanged_tabs_keep_their_payload(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = tmp_path / "tabs.drawio"
+        drawio.write_text("<mxfile>" + self._compressed_tab("A", "Other")
+                          + self._compressed_tab("B", "Billing")
+                          + self._compressed_tab("C", "Unknown") + "</mxfile>")
+        before = self._payloads(drawio)
+
+        encoded = []
+        real_encode = rd.encode_diagram_content
+        monkeypatch.setattr(rd, "encode_diagram_content", lambda xml: encoded.append(xml) or real_encode(xml))
+        result = rd.refresh_diagram(drawio, self.REGISTRY)
+
+        assert result["changed_tabs"] == ["B"] and result["written"]
+        assert len(encoded) == 1
+        after = self._payloads(drawio)
+        assert after["A"] == before["A"] and after["C"] == before["C"]
+        assert after["B"] != before["B"]
+        assert 'owner="C"' in rd.decode_diagram_content(after["B"])
+
+    def test_no_updates_leaves_file_untouched(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = _object_diagram(tmp_path / "view.drawio", "Other")
+        stat = drawio.stat()
+        result = rd.refresh_diagram(drawio, self.REGISTRY)
+        assert not result["written"] and result["changed_tabs"] == []
+        assert drawio.stat().st_mtime_ns == stat.st_mtime_ns
+
+    def test_identical_bytes_are_not_rewritten(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = _object_diagram(tmp_path / "view.drawio", "Billing")
+        original = drawio.read_bytes()
+        monkeypatch.setattr(rd, "serialize_tree", lambda tree: original)
+        monkeypatch.setattr(rd.registry_core, "write_atomically", lambda *a: pytest.fail("rewritten"))
+        result = rd.refresh_diagram(drawio, self.REGISTRY)
+        assert len(result["updates"]) == 1 and not result["written"]
+
+
+# ── wrap_plain_cells() ────────────────────────────────────────
+
+
+class TestWrapPlainCells:
+    """--wrap-plain-cells upgrades matching plain shapes to objects in place."""
+
+    REGISTRY = {"Billing": {"owner": "C", "sourcing": "buy"}, "Orders": {"file": "orders.md"}}
+    XML = (
+        '<mxfile><diagram name="Tab"><mxGraphModel><root>'
+        '<mxCell id="0"/><mxCell id="1" parent="0"/>'
+        '<mxCell id="a" value="&lt;b&gt;Billing&lt;/b&gt;" style="rounded=1" vertex="1" parent="1">'
+        '<mxGeometry x="10" y="20" width="100" height="50" as="geometry"/></mxCell>'
+        '<mxCell id="b" value="Orders" style="rounded=1" vertex="1" parent="1"/>'
+        '<mxCell id="c" value="Other" style="rounded=1" vertex="1" parent="1"/>'
+        '<mxCell id="e" value="Billing" style="endArrow=block" edge="1" parent="1" source="a" target="c"/>'
+        '<mxCell id="l" value="Billing" style="edgeLabel" vertex="1" parent="e"/>'
+        '</root></mxGraphModel></diagram></mxfile>'
+    )
+
+    def _refresh(self, tmp_path, monkeypatch, xml=None, **kwargs):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = tmp_path / "legacy.drawio"
+        drawio.write_text(xml or self.XML)
+        return drawio, rd.refresh_diagram(drawio, self.REGISTRY, wrap_cells=True, **kwargs)
+
+    def test_wraps_matching_vertices_preserving_ids_and_order(self, tmp_path, monkeypatch):
+        drawio, result = self._refresh(tmp_path, monkeypatch)
+        assert [(u["label"], u["wrapped"]) for u in result["updates"]] == [("Billing", True)]
+
+        root = ET.parse(drawio).getroot().find(".//root")
+        assert [(c.tag, c.get("id")) for c in root] == [
+            ("mxCell", "0"), ("mxCell", "1"), ("object", "a"), ("mxCell", "b"),
+            ("mxCell", "c"), ("mxCell", "e"), ("mxCell", "l")]
+        obj = root[2]
+        assert obj.get("label") == "<b>Billing</b>"
+        assert obj.get("owner") == "C" and obj.get("sourcing") == "buy"
+        inner = obj.find("mxCell")
+        assert inner.attrib == {"style": "rounded=1", "vertex": "1", "parent": "1"}
+        assert inner.find("mxGeometry").get("width") == "100"
+        # The edge still points at the same id
+        assert root[5].get("source") == "a"
+
+    def test_second_run_is_a_no_op(self, tmp_path, monkeypatch):
+        drawio, _ = self._refresh(tmp_path, monkeypatch)
+        content = drawio.read_text()
+        result = rd.refresh_diagram(drawio, self.REGISTRY, wrap_cells=True)
+        assert result["updates"] == [] and not result["written"]
+        assert drawio.read_text() == content
+
+    def test_dry_run_reports_without_wrapping(self, tmp_path, monkeypatch):
+        drawio, result = self._refresh(tmp_path, monkeypatch, dry_run=True)
+        assert [u["label"] for u in result["updates"]] == ["Billing"]
+        assert drawio.read_text() == self.XML
+
+    def test_off_by_default(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rd, "REPO_ROOT", tmp_path)
+        drawio = tmp_path / "legacy.drawio"
+        drawio.write_text(self.XML)
+        assert rd.refresh_diagram(drawio, self.REGISTRY)["updates"] == []
+
+    def test_compressed_tab(self, tmp_path, monkeypatch):
+        model = self.XML.split('<diagram name="Tab">')[1].split("</diagram>")[0]
+        xml = f'<mxfile><diagram name="Tab">{rd.encode_diagram_content(model)}</diagram></mxfile>'
+        drawio, result = self._refresh(tmp_path, monkeypatch, xml=xml)
+        assert result["changed_tabs"] == ["Tab"]
+        decoded = rd.decode_diagram_content(ET.parse(drawio).getroot().find("diagram").text)
+        assert '<object label="&lt;b&gt;Billing&lt;/b&gt;" id="a" sourcing="buy" owner="C">' in decoded
+
+    def test_ambiguous_cells_are_not_wrapped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(self, "REGISTRY", {"billing": {"owner": "C"}, "BILLING": {"owner": "D"}})
+        drawio, result = self._refresh(tmp_path, monkeypatch)
+        assert result["updates"] == []
+        assert [a["candidates"] for a in result["ambiguous"]] == [["billing", "BILLING"]]
+        assert drawio.read_text() == self.XML
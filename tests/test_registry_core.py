@@ -0,0 +1,380 @@
+"""Tests for scripts/registry_core — the shared registry loader, file helpers and worker pool.
+
+Tests build a small registry under tmp_path and check element fields,
+indexes, warnings, and in-process / on-disk result reuse.
+"""
+
+import os
+
+import pytest
+
+import registry_core
+from registry_core import loader
+
+
+def write_entry(registry_dir, rel_path, body):
+    path = registry_dir / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(body)
+    return path
+
+
+@pytest.fixture
+def registry_dir(tmp_path):
+    """A registry with two components, one node, a template and a nameless file."""
+    reg = tmp_path / "registry"
+    write_entry(reg, "application/components/order-service.md",
+                "---\nname: Order Service \nowner: Team A\ndomain: customer-management\n"
+                "status: active\nsourcing: in-house\n---\n\nBody text.\n")
+    write_entry(reg, "application/components/payment-gateway.md",
+                "---\nname: Payment Gateway\ndomain: billing-and-payments\n---\n")
+    write_entry(reg, "technology/nodes/order-service.md",
+                "---\nname: Order Service\ndomain: customer-management\n---\n")
+    write_entry(reg, "application/components/_template.md", "---\nname: Template\n---\n")
+    write_entry(reg, "README.md", "# Registry\n")
+    return reg
+
+
+@pytest.fixture(autouse=True)
+def fresh_memo():
+    registry_core.clear_memo()
+    yield
+    registry_core.clear_memo()
+
+
+def load(registry_dir, tmp_path, **kwargs):
+    return registry_core.load_registry(registry_dir, tmp_path,
+                                       cache_dir=tmp_path / ".cache", **kwargs)
+
+
+# ── load_registry() ───────────────────────────────────────────
+
+
+class TestLoadRegistry:
+    """load_registry parses frontmatter into element dicts."""
+
+    def test_skips_templates_and_nameless_files(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path)
+        assert len(registry) == 3
+
+    def test_element_fields(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path)
+        elem = registry.by_slug["payment-gateway"][0]
+        assert elem["name"] == "Payment Gateway"
+        assert elem["layer"] == "application"
+        assert elem["element_type"] == "components"
+        assert elem["domain"] == "billing-and-payments"
+        assert elem["owner"] == ""
+        assert elem["file"] == "registry/application/components/payment-gateway.md"
+
+    def test_name_is_stripped(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path)
+        assert "Order Service" in registry.by_name
+
+    def test_deterministic_order(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path)
+        assert [e["file"] for e in registry] == sorted(e["file"] for e in registry)
+
+    def test_indexes(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path)
+        assert len(registry.by_name["Order Service"]) == 2
+        assert {e["layer"] for e in registry.by_name["Order Service"]} == {"application", "technology"}
+        assert len(registry.by_layer["application"]) == 2
+        assert len(registry.by_domain["customer-management"]) == 2
+
+    def test_missing_dir_returns_empty(self, tmp_path):
+        registry = load(tmp_path / "nope", tmp_path)
+        assert len(registry) == 0
+
+    def test_parse_error_becomes_warning(self, registry_dir, tmp_path, capsys):
+        write_entry(registry_dir, "application/components/broken.md", "---\nname: [unclosed\n---\n")
+        registry = load(registry_dir, tmp_path)
+        assert len(registry) == 3
+        assert len(registry.warnings) == 1
+        assert "WARNING: Could not parse" in capsys.readouterr().out
+
+    def test_quiet_suppresses_warnings(self, registry_dir, tmp_path, capsys):
+        write_entry(registry_dir, "application/components/broken.md", "---\nname: [unclosed\n---\n")
+        load(registry_dir, tmp_path, quiet=True)
+        assert capsys.readouterr().out == ""
+
+
+# ── result reuse ──────────────────────────────────────────────
+
+
+class TestRegistryReuse:
+    """Repeated scans reuse parsed results until a file changes."""
+
+    def test_memoized_within_process(self, registry_dir, tmp_path):
+        first = load(registry_dir, tmp_path)
+        assert load(registry_dir, tmp_path) is first
+
+    def test_cache_reused_across_processes(self, registry_dir, tmp_path, monkeypatch):
+        load(registry_dir, tmp_path)
+        registry_core.clear_memo()
+
+        def fail(data):
+            raise AssertionError("registry file was re-parsed")
+
+        monkeypatch.setattr(loader, "parse_frontmatter", fail)
+        assert len(load(registry_dir, tmp_path)) == 3
+
+    def test_change_invalidates(self, registry_dir, tmp_path):
+        first = load(registry_dir, tmp_path)
+        write_entry(registry_dir, "application/components/new-thing.md", "---\nname: New Thing\n---\n")
+        second = load(registry_dir, tmp_path)
+        assert second is not first
+        assert len(second) == 4
+
+    def test_use_cache_false_writes_nothing(self, registry_dir, tmp_path):
+        load(registry_dir, tmp_path, use_cache=False)
+        assert not (tmp_path / ".cache").exists()
+
+
+# ── FrontmatterCache ──────────────────────────────────────────
+
+
+class TestFrontmatterCache:
+    """The on-disk cache only re-parses files whose content changed."""
+
+    def warm(self, registry_dir, tmp_path, **kwargs):
+        load(registry_dir, tmp_path, **kwargs)
+        registry_core.clear_memo()
+        return load(registry_dir, tmp_path, **kwargs)
+
+    def test_warm_run_parses_nothing(self, registry_dir, tmp_path):
+        registry = self.warm(registry_dir, tmp_path)
+        assert "0 parsed" in registry.cache_stats
+
+    def test_only_changed_file_is_parsed(self, registry_dir, tmp_path):
+        load(registry_dir, tmp_path)
+        registry_core.clear_memo()
+        write_entry(registry_dir, "application/components/payment-gateway.md",
+                    "---\nname: Payment Hub\n---\n")
+        registry = load(registry_dir, tmp_path)
+        assert "1 parsed" in registry.cache_stats
+        assert "Payment Hub" in registry.by_name
+
+    def test_touch_without_edit_is_revalidated(self, registry_dir, tmp_path):
+        load(registry_dir, tmp_path)
+        registry_core.clear_memo()
+        path = registry_dir / "application/components/payment-gateway.md"
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        registry = load(registry_dir, tmp_path)
+        assert "0 parsed" in registry.cache_stats
+
+    def test_racy_entries_settle_after_window(self, registry_dir, tmp_path, monkeypatch):
+        from registry_core import cache
+
+        load(registry_dir, tmp_path)  # files were just written: every entry is racy
+        registry_core.clear_memo()
+        real_time_ns = cache.time.time_ns
+        monkeypatch.setattr(cache.time, "time_ns", lambda: real_time_ns() + 2 * cache.RACY_WINDOW_NS)
+        registry = load(registry_dir, tmp_path)
+        assert "4 revalidated" in registry.cache_stats
+        registry_core.clear_memo()
+        registry = load(registry_dir, tmp_path)
+        assert "4 hits, 0 revalidated, 0 parsed" in registry.cache_stats
+
+    def test_removed_file_is_pruned(self, registry_dir, tmp_path):
+        load(registry_dir, tmp_path)
+        registry_core.clear_memo()
+        (registry_dir / "technology/nodes/order-service.md").unlink()
+        registry = load(registry_dir, tmp_path)
+        assert "1 removed" in registry.cache_stats
+        assert len(registry) == 2
+
+    def test_mapping_change_invalidates(self, registry_dir, tmp_path):
+        mapping = tmp_path / "registry-mapping.yaml"
+        mapping.write_text("version: '1.0'\n")
+        load(registry_dir, tmp_path, mapping_path=mapping)
+        registry_core.clear_memo()
+        mapping.write_text("version: '2.0'\n")
+        registry = load(registry_dir, tmp_path, mapping_path=mapping)
+        assert "4 parsed" in registry.cache_stats  # 3 elements + README.md
+        assert "registry-mapping.yaml changed" in registry.cache_stats
+
+    def test_parse_errors_are_cached(self, registry_dir, tmp_path, capsys):
+        write_entry(registry_dir, "application/components/broken.md", "---\nname: [unclosed\n---\n")
+        registry = self.warm(registry_dir, tmp_path)
+        assert "0 parsed" in registry.cache_stats
+        assert len(registry.warnings) == 1
+
+    def test_concurrent_saves_do_not_share_a_temp_file(self, registry_dir, tmp_path):
+        from registry_core.cache import FrontmatterCache
+
+        path = tmp_path / ".cache" / "frontmatter.pickle"
+        first, second = FrontmatterCache(path), FrontmatterCache(path)
+        first.dirty = second.dirty = True
+        path.parent.mkdir(parents=True)
+        path.with_suffix(".tmp").mkdir()  # the old fixed temp path, held by another run
+        first.save()
+        second.save()
+        assert not first.dirty and not second.dirty
+        assert sorted(p.name for p in path.parent.iterdir()) == [path.name, path.with_suffix(".tmp").name]
+
+    def test_no_cache_reports_disabled(self, registry_dir, tmp_path):
+        registry = load(registry_dir, tmp_path, use_cache=False)
+        assert registry.cache_stats == "Registry cache: disabled"
+
+
+# ── frontmatter_reader ────────────────────────────────────────
+
+
+class TestFrontmatterReader:
+    """read_frontmatter matches python-frontmatter without reading the body."""
+
+    CASES = [
+        "---\nname: Order Service\ntags: [a, b]\n---\n\n# Body\n\nProse.\n",
+        "\n\n---\nname: Leading blank lines\n---\nBody\n",
+        "---\r\nname: CRLF\r\n---\r\nBody\r\n",
+        "----\nname: Four dashes\n----\n",
+        "---\n---\nEmpty header\n",
+        "---\n- just\n- a list\n---\nBody\n",
+        "No frontmatter at all\n",
+        "---\nname: Unclosed\n",
+        "---\nname: Dashes in body\n---\nText\n---\nMore\n",
+    ]
+
+    @pytest.mark.parametrize("text", CASES)
+    def test_matches_python_frontmatter(self, tmp_path, text):
+        import frontmatter
+
+        path = tmp_path / "entry.md"
+        path.write_bytes(text.encode("utf-8"))
+        expected = frontmatter.load(path)
+        doc = registry_core.read_frontmatter(path)
+        assert doc.metadata == expected.metadata
+        assert doc.body == expected.content
+
+    @pytest.mark.parametrize("text", CASES)
+    def test_bytes_and_file_agree(self, tmp_path, text):
+        path = tmp_path / "entry.md"
+        path.write_bytes(text.encode("utf-8"))
+        from_bytes = registry_core.parse_frontmatter_bytes(text.encode("utf-8"))
+        from_file = registry_core.read_frontmatter(path)
+        assert from_bytes.metadata == from_file.metadata
+        assert from_bytes.body == from_file.body
+
+    def test_body_is_lazy(self, tmp_path):
+        path = tmp_path / "entry.md"
+        path.write_text("---\nname: Lazy\n---\nOriginal body\n")
+        doc = registry_core.read_frontmatter(path)
+        path.write_text("---\nname: Lazy\n---\nEdited body\n")
+        assert doc.body == "Edited body"
+
+    def test_pure_python_loader(self, tmp_path):
+        path = tmp_path / "entry.md"
+        path.write_text("---\nname: Slow Path\n---\n")
+        doc = registry_core.read_frontmatter(path, use_libyaml=False)
+        assert doc.metadata == {"name": "Slow Path"}
+
+    def test_invalid_yaml_raises(self, tmp_path):
+        import yaml
+
+        path = tmp_path / "entry.md"
+        path.write_text("---\nname: [unclosed\n---\n")
+        with pytest.raises(yaml.YAMLError):
+            registry_core.read_frontmatter(path)
+
+
+# ── parallel scan ─────────────────────────────────────────────
+
+
+class TestParallelScan:
+    """A process-pool scan returns exactly what the serial scan does."""
+
+    @pytest.fixture
+    def big_registry(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(loader, "PARALLEL_MIN_FILES", 1)
+        monkeypatch.setattr(loader, "CHUNK_MIN_FILES", 3)
+        reg = tmp_path / "registry"
+        for i in range(20):
+            write_entry(reg, f"application/components/c{i:02d}.md", f"---\nname: Component {i}\n---\n")
+        write_entry(reg, "application/components/c05-broken.md", "---\nname: [one\n---\n")
+        write_entry(reg, "application/components/c15-broken.md", "---\nname: [two\n---\n")
+        return reg
+
+    @pytest.mark.parametrize("use_cache", [True, False])
+    def test_matches_serial(self, big_registry, tmp_path, use_cache):
+        serial = load(big_registry, tmp_path / "serial", use_cache=use_cache, jobs=1, quiet=True)
+        registry_core.clear_memo()
+        parallel = load(big_registry, tmp_path / "parallel", use_cache=use_cache, jobs=3, quiet=True)
+        assert [e["name"] for e in parallel] == [e["name"] for e in serial]
+        assert parallel.warnings == serial.warnings
+        assert "c05-broken" in parallel.warnings[0] and "c15-broken" in parallel.warnings[1]
+
+    def test_parallel_results_are_cached(self, big_registry, tmp_path):
+        load(big_registry, tmp_path, jobs=3, quiet=True)
+        registry_core.clear_memo()
+        registry = load(big_registry, tmp_path, jobs=3, quiet=True)
+        assert "0 parsed" in registry.cache_stats
+        assert len(registry.warnings) == 2
+
+
+# ── fsutil ────────────────────────────────────────────────────
+
+
+class TestFsutil:
+    """Atomic writes keep the target whole; file_sha256 has one sentinel."""
+
+    def test_write_replaces_and_keeps_mode(self, tmp_path):
+        target = tmp_path / "out.txt"
+        target.write_text("old")
+        target.chmod(0o640)
+        registry_core.write_atomically(target, "new")
+        assert target.read_text() == "new"
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert [f.name for f in tmp_path.iterdir()] == ["out.txt"]
+
+    def test_failed_write_leaves_target(self, tmp_path):
+        target = tmp_path / "out.txt"
+        target.write_text("old")
+        with pytest.raises(RuntimeError):
+            with registry_core.atomic_open(target) as f:
+                f.write("half")
+                raise RuntimeError
+        assert target.read_text() == "old"
+        assert [f.name for f in tmp_path.iterdir()] == ["out.txt"]
+
+    def test_file_sha256(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"abc")
+        assert registry_core.file_sha256(path) == (
+            "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad")
+        assert registry_core.file_sha256(tmp_path / "missing") is None
+        assert registry_core.file_sha256(tmp_path) is None
+        assert registry_core.file_sha256(None) is None
+
+
+# ── workers ───────────────────────────────────────────────────
+
+_SEEN = []
+
+
+def _remember(value):
+    _SEEN.append(value)
+
+
+def _double(value):
+    return value * 2
+
+
+class TestWorkers:
+    """run_jobs fans tasks out only when more than one worker would be used."""
+
+    def test_pool_size(self):
+        assert registry_core.pool_size(4, 10) == 4
+        assert registry_core.pool_size(4, 2) == 2
+        assert registry_core.pool_size(4, 0) == 1
+        assert registry_core.pool_size(0, 5) == 1
+
+    def test_serial_runs_initializer_in_process(self):
+        _SEEN.clear()
+        assert registry_core.run_jobs(_double, [1, 2], jobs=1, initializer=_remember,
+                                      initargs=("ready",)) == [2, 4]
+        assert _SEEN == ["ready"]
+
+    def test_pool_keeps_input_order(self):
+        assert registry_core.run_jobs(_double, list(range(6)), jobs=2) == [0, 2, 4, 6, 8, 10]
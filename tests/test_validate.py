@@ -1,11 +1,19 @@
-"""Tests for scripts/validate.py — pure function tests.
+"""Tests for scripts/validate.py.
 
-Tests cover layer mapping, style parsing, path extraction, and registry
-lookup without requiring any real filesystem or .drawio files.
+Tests cover layer mapping, style parsing, path extraction and registry
+lookup as pure functions. Incremental validation, the library API, watch
+mode and streaming extraction work on small registries and .drawio files
+written under tmp_path.
 """
 
+import json
+import os
+import shutil
+import time
 from pathlib import Path
 
+import pytest
+
 import validate as v
 
 
@@ -138,3 +146,386 @@ class TestGetViewTypeFromPath:
     def test_complex_name(self):
         path = Path("/views/analytics/data-model.drawio")
         assert v.get_view_type_from_path(path) == "data-model"
+
+
+# ── build_name_layers() / find_wrong_layer() ──────────────────
+
+
+class TestWrongLayerLookup:
+    """find_wrong_layer reports where a mis-layered name is registered."""
+
+    ELEMS = [
+        {"name": "Auth", "layer": "application"},
+        {"name": "Auth", "layer": "business"},
+        {"name": "Auth", "layer": "application"},
+        {"name": "Ledger", "layer": "technology"},
+    ]
+
+    def test_layers_in_registry_order_without_repeats(self):
+        name_layers = v.build_name_layers(self.ELEMS)
+        assert name_layers["Auth"] == ["application", "business"]
+
+    def test_wrong_layer_found(self):
+        name_layers = v.build_name_layers(self.ELEMS)
+        assert v.find_wrong_layer("Ledger", "application", name_layers) == "technology"
+
+    def test_first_other_layer_wins(self):
+        name_layers = v.build_name_layers(self.ELEMS)
+        assert v.find_wrong_layer("Auth", "technology", name_layers) == "application"
+        assert v.find_wrong_layer("Auth", "application", name_layers) == "business"
+
+    def test_unregistered_name(self):
+        name_layers = v.build_name_layers(self.ELEMS)
+        assert v.find_wrong_layer("Unknown", "application", name_layers) is None
+
+
+# ── changed_registry_names() / collect_diagram_results() ──────
+
+
+def _diagram(names):
+    cells = "".join(
+        f'<mxCell id="c{i}" value="{name}" style="shape=mxgraph.archimate3.application;appType=comp" '
+        f'vertex="1" parent="1"><mxGeometry x="0" y="0" width="10" height="10" as="geometry"/></mxCell>'
+        for i, name in enumerate(names)
+    )
+    return ('<mxfile><diagram name="Tab"><mxGraphModel><root><mxCell id="0"/>'
+            f'<mxCell id="1" parent="0"/>{cells}</root></mxGraphModel></diagram></mxfile>')
+
+
+class TestIncrementalValidation:
+    """Incremental runs reuse stored results and match a full run."""
+
+    def test_changed_registry_names(self):
+        old = {"a.md": ("Auth", "application"), "b.md": ("Ledger", "technology"), "c.md": ("Gone", "business")}
+        new = {"a.md": ("Auth", "application"), "b.md": ("Ledger", "application"), "d.md": ("New", "business")}
+        assert v.changed_registry_names(old, new) == {"Ledger", "Gone", "New"}
+
+    def _setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        monkeypatch.setattr(v, "VIEWS_DIR", tmp_path / "views")
+        views = tmp_path / "views" / "sales"
+        views.mkdir(parents=True)
+        (views / "a.drawio").write_text(_diagram(["Auth", "Billing"]))
+        (views / "b.drawio").write_text(_diagram(["Ledger"]))
+        return views
+
+    def _run(self, registry, changed):
+        layer_registry = v.build_layer_registry(registry)
+        name_layers = v.build_name_layers(registry)
+        return v.collect_diagram_results(v.find_drawio_files(), registry, layer_registry,
+                                         name_layers, changed=changed)
+
+    def test_untouched_diagrams_reused(self, tmp_path, monkeypatch):
+        views = self._setup(tmp_path, monkeypatch)
+        registry = [{"name": "Auth", "layer": "application", "file": "auth.md"}]
+        full_results, full_errors, _ = self._run(registry, None)
+        results, errors, summary = self._run(registry, [])
+        assert summary.startswith("re-extracted 0/2 diagram(s), re-checked 0/2")
+        assert results == full_results
+        assert errors == full_errors
+
+        (views / "b.drawio").write_text(_diagram(["Ledger", "Auth"]))
+        _, _, summary = self._run(registry, [views / "b.drawio"])
+        assert summary.startswith("re-extracted 1/2")
+
+    def test_registry_change_rechecks_referencing_diagrams(self, tmp_path, monkeypatch):
+        self._setup(tmp_path, monkeypatch)
+        registry = [{"name": "Auth", "layer": "application", "file": "auth.md"}]
+        self._run(registry, None)
+
+        registry.append({"name": "Ledger", "layer": "application", "file": "ledger.md"})
+        results, errors, summary = self._run(registry, [])
+        assert summary == "re-extracted 0/2 diagram(s), re-checked 1/2"
+        assert [e["element"] for e in errors] == ["Billing"]
+
+    def test_no_previous_result_is_full_run(self, tmp_path, monkeypatch):
+        self._setup(tmp_path, monkeypatch)
+        _, errors, summary = self._run([], [])
+        assert summary.endswith("(no previous result, full run)")
+        assert len(errors) == 3
+
+    def test_concurrent_saves_use_separate_temp_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        temp_names = []
+        real_named = v.tempfile.NamedTemporaryFile
+
+        def recording(*args, **kwargs):
+            f = real_named(*args, **kwargs)
+            temp_names.append(f.name)
+            return f
+
+        monkeypatch.setattr(v.tempfile, "NamedTemporaryFile", recording)
+        v.save_state({"diagrams": {"a": 1}})
+        v.save_state({"diagrams": {"b": 2}})
+        assert len(set(temp_names)) == 2
+        assert v.load_state()["diagrams"] == {"b": 2}
+        assert [p.name for p in v.state_path().parent.iterdir()] == ["results.pickle"]
+
+    def test_extraction_change_discards_state(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        v.save_state({"diagrams": {"a": 1}})
+        assert v.load_state()["diagrams"] == {"a": 1}
+        monkeypatch.setattr(v, "EXTRACTION_VERSION", v.EXTRACTION_VERSION + 1)
+        assert v.load_state() is None
+
+    def test_registry_cache_follows_repo_root(self, tmp_path, monkeypatch):
+        import registry_core
+        from registry_core import loader
+
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        monkeypatch.setattr(v, "REGISTRY_DIR", tmp_path / "registry")
+        entry = tmp_path / "registry" / "application" / "components" / "auth.md"
+        entry.parent.mkdir(parents=True)
+        entry.write_text("---\nname: Auth\n---\n")
+        shared_cache = loader.cache_path(v.REGISTRY_DIR.resolve())
+
+        registry_core.clear_memo()
+        assert [e["name"] for e in v.load_registry(jobs=1)] == ["Auth"]
+        registry_core.clear_memo()
+        assert list((tmp_path / ".cache" / "registry").glob("*.pickle"))
+        assert not shared_cache.exists()
+
+
+# ── validate() / print_report() ───────────────────────────────
+
+
+def _with_files(elements):
+    return [dict(e, file=f"{e['name']}.md") for e in elements]
+
+
+class TestValidateApi:
+    """validate() returns a structured result and prints nothing."""
+
+    def _setup(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        monkeypatch.setattr(v, "VIEWS_DIR", tmp_path / "views")
+        views = tmp_path / "views" / "customer-management"
+        views.mkdir(parents=True)
+        (views / "landscape.drawio").write_text(_diagram(["Order Service", "Ghost"]))
+
+    def test_result_on_loaded_registry(self, tmp_path, monkeypatch, capsys, sample_registry_elements):
+        self._setup(tmp_path, monkeypatch)
+        monkeypatch.setattr(v, "load_registry", lambda **kw: pytest.fail("registry scanned again"))
+        result = v.validate(_with_files(sample_registry_elements), use_cache=False)
+
+        assert capsys.readouterr().out == ""
+        assert not result.passed and result.status == "FAILED"
+        assert [e["element"] for e in result.errors] == ["Ghost"]
+        assert result.total_elements_checked == 2
+        report = result.to_dict()
+        assert report["diagrams"] == {"total_files": 1, "total_elements_checked": 2,
+                                      "registered": 1, "unregistered": 1}
+        assert "Order Service" not in {o["name"] for o in report["orphan_elements"]}
+        assert "Payment Gateway" in {o["name"] for o in report["orphan_elements"]}
+
+    def test_caches_stay_under_repo_root(self, tmp_path, monkeypatch, sample_registry_elements):
+        import registry_core
+        from registry_core import loader
+
+        self._setup(tmp_path, monkeypatch)
+        monkeypatch.setattr(v, "REGISTRY_DIR", tmp_path / "registry")
+        entry = tmp_path / "registry" / "application" / "components" / "order-service.md"
+        entry.parent.mkdir(parents=True)
+        entry.write_text("---\nname: Order Service\n---\n")
+
+        registry_core.clear_memo()
+        result = v.validate(use_cache=True, jobs=1)
+        registry_core.clear_memo()
+        assert [e["element"] for e in result.errors] == ["Ghost"]
+        assert v.state_path().is_relative_to(tmp_path) and v.state_path().exists()
+        assert list((tmp_path / ".cache" / "registry").glob("*.pickle"))
+        assert not loader.cache_path(v.REGISTRY_DIR.resolve()).exists()
+
+    def test_print_report_json(self, tmp_path, monkeypatch, capsys, sample_registry_elements):
+        self._setup(tmp_path, monkeypatch)
+        result = v.validate(_with_files(sample_registry_elements), use_cache=False)
+        assert v.print_report(result, "json") == 1
+        assert json.loads(capsys.readouterr().out) == result.to_dict()
+
+
+# ── watch mode ────────────────────────────────────────────────
+
+
+class TestWatchMode:
+    """Debounced polling and delta reporting for --watch."""
+
+    def _trees(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(v, "REPO_ROOT", tmp_path)
+        monkeypatch.setattr(v, "REGISTRY_DIR", tmp_path / "registry")
+        monkeypatch.setattr(v, "VIEWS_DIR", tmp_path / "views")
+        diagram = tmp_path / "views" / "sales" / "a.drawio"
+        diagram.parent.mkdir(parents=True)
+        diagram.write_text(_diagram(["Auth"]))
+        entry = tmp_path / "registry" / "application" / "components" / "auth.md"
+        entry.parent.mkdir(parents=True)
+        entry.write_text("---\nname: Auth\n---\n")
+        return v.watch_trees(), diagram, entry
+
+    def test_trees_list_watched_files(self, tmp_path, monkeypatch):
+        trees, diagram, entry = self._trees(tmp_path, monkeypatch)
+        (tmp_path / "views" / "sales" / "_template.drawio").write_text("")
+        (tmp_path / "views" / "sales" / "old").mkdir()
+        (tmp_path / "views" / "sales" / "old" / "b.drawio").write_text("")
+        (tmp_path / "registry" / "application" / "components" / "_template.md").write_text("")
+        trees = v.watch_trees()
+        assert set(trees[0].files) == {entry}
+        assert set(trees[1].files) == {diagram}
+
+    def test_poll_sees_edits_additions_and_removals(self, tmp_path, monkeypatch):
+        trees, diagram, entry = self._trees(tmp_path, monkeypatch)
+        registry, views = trees
+        assert views.poll() == set() and registry.poll() == set()
+
+        diagram.write_text(_diagram(["Auth", "Billing"]))
+        added = tmp_path / "views" / "billing" / "b.drawio"
+        added.parent.mkdir()
+        added.write_text(_diagram(["Billing"]))
+        assert views.poll() == {diagram, added}
+
+        shutil.rmtree(tmp_path / "registry" / "application")
+        assert registry.poll() == {entry}
+        assert registry.files == {}
+
+    def test_in_place_registry_edit_is_seen_on_next_poll(self, tmp_path, monkeypatch):
+        trees, _, entry = self._trees(tmp_path, monkeypatch)
+        registry = trees[0]
+        folder = entry.parent
+        folder_mtime = folder.stat().st_mtime_ns
+        st = entry.stat()
+        entry.write_text("---\nname: Auto\n---\n")  # same size, directory untouched
+        os.utime(entry, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert folder.stat().st_mtime_ns == folder_mtime
+        assert registry.poll() == {entry}
+        assert registry.poll() == set()
+
+    def test_burst_of_saves_is_one_change(self, tmp_path, monkeypatch):
+        trees, diagram, _ = self._trees(tmp_path, monkeypatch)
+        polls = []
+        now = [0.0]
+
+        def fake_sleep(seconds):
+            polls.append(seconds)
+            now[0] += seconds
+            if len(polls) <= 3:  # three saves on consecutive polls
+                diagram.write_text(_diagram(["Auth"] * (len(polls) + 1)))
+
+        changed = v.wait_for_changes(trees, interval=0.25, debounce={".drawio": 0.75, ".md": 0.25},
+                                     sleep=fake_sleep, clock=lambda: now[0])
+        assert changed == {diagram}
+        assert len(polls) == 6  # 3 changing polls + 3 quiet polls
+
+    def test_default_debounce_merges_a_drawio_save_burst(self, tmp_path, monkeypatch):
+        trees, diagram, entry = self._trees(tmp_path, monkeypatch)
+        now = [0.0]
+        saves = {0.04: diagram, 0.2: diagram, 0.28: diagram}  # writes 80-160 ms apart
+
+        def fake_sleep(seconds):
+            now[0] = round(now[0] + seconds, 3)
+            if now[0] in saves:
+                st = diagram.stat()
+                os.utime(diagram, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+        changed = v.wait_for_changes(trees, sleep=fake_sleep, clock=lambda: now[0])
+        assert changed == {diagram}
+        assert now[0] == pytest.approx(0.28 + v.WATCH_DEBOUNCE[".drawio"], abs=v.WATCH_INTERVAL)
+
+        # A registry edit alone is reported after its own, short quiet time
+        start = now[0]
+        st = entry.stat()
+        os.utime(entry, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert v.wait_for_changes(trees, sleep=fake_sleep, clock=lambda: now[0]) == {entry}
+        assert now[0] - start <= 0.1
+
+    def test_debounce_counts_slow_polls(self, tmp_path, monkeypatch):
+        trees, diagram, _ = self._trees(tmp_path, monkeypatch)
+        views = trees[1]
+        real_poll = views.poll
+        polls = []
+
+        def slow_poll():
+            time.sleep(0.1)  # e.g. a large tree
+            polls.append(1)
+            if len(polls) == 1:
+                diagram.write_text(_diagram(["Auth", "Auth"]))
+            return real_poll()
+
+        monkeypatch.setattr(views, "poll", slow_poll)
+        start = time.monotonic()
+        changed = v.wait_for_changes([views], interval=0.0, debounce={".drawio": 0.15})
+        assert changed == {diagram}
+        # 0.15 s of quiet is two 0.1 s polls, not debounce / interval polls
+        assert len(polls) == 3
+        assert time.monotonic() - start < 0.5
+
+    def test_format_delta(self):
+        err = {"file": "views/s/a.drawio", "element": "Auth", "layer": "application", "wrong_layer": None}
+        before = {"errors": [err], "orphans": {"Ledger"}}
+        after = {"errors": [], "orphans": {"Ledger", "Billing"}}
+        assert v.format_delta(before, after) == [
+            "- FIXED [views/s/a.drawio] Auth (application) - NOT IN REGISTRY",
+            "+ ORPHAN Billing",
+            "0 error(s) (+0/-1), 2 orphan(s)",
+        ]
+
+
+# ── extract_archimate_elements() ──────────────────────────────
+
+
+def _tree_extract(path):
+    """Reference: the whole-tree walk the streaming extractor replaces."""
+    import xml.etree.ElementTree as ET
+    root = ET.parse(path).getroot()
+    diagrams = root.findall(".//diagram")
+    if not diagrams:
+        cells = list(root.iter("mxCell")) + list(root.iter("object"))
+        return v.extract_archimate_elements_from_cells(cells, "default")
+    elements = []
+    for diagram in diagrams:
+        cells = list(diagram.iter("mxCell")) + list(diagram.iter("object"))
+        elements.extend(v.extract_archimate_elements_from_cells(cells, diagram.get("name", "unnamed")))
+    return elements
+
+
+APP = 'style="shape=mxgraph.archimate3.application;appType=comp"'
+TECH = 'style="shape=mxgraph.archimate3.tech"'
+
+STREAMING_CASES = {
+    "tabs_objects_and_cells": (
+        f'<mxfile><diagram name="A"><mxGraphModel><root>'
+        f'<object label="Wrapped" id="o1"><mxCell {APP} id="i1"/><mxCell {TECH} id="i2"/></object>'
+        f'<mxCell id="c1" value="Line&lt;br&gt;Break" {TECH}/>'
+        f'<object label="No inner cell" id="o2"/>'
+        f'</root></mxGraphModel></diagram>'
+        f'<diagram><mxCell id="c2" value="Second tab" {APP}/></diagram></mxfile>'
+    ),
+    "no_diagram_wrapper": (
+        f'<mxGraphModel><root><mxCell id="c1" value="Plain" {TECH}/>'
+        f'<object label="Wrapped" id="o1"><mxCell {APP}/></object></root></mxGraphModel>'
+    ),
+    "cells_outside_tabs_ignored": (
+        f'<mxfile><mxCell id="p" value="Before" {TECH}/><diagram name="A">'
+        f'<mxCell id="a" value="Inside" {TECH}/></diagram>'
+        f'<mxCell id="q" value="After" {TECH}/></mxfile>'
+    ),
+    "root_diagram_is_not_a_tab": f'<diagram name="R"><mxCell id="c" value="Root" {TECH}/></diagram>',
+}
+
+
+class TestStreamingExtraction:
+    """The iterparse extractor matches a whole-tree walk."""
+
+    def test_matches_tree_walk(self, tmp_path):
+        for name, xml in STREAMING_CASES.items():
+            path = tmp_path / f"{name}.drawio"
+            path.write_text(xml)
+            assert v.extract_archimate_elements(path) == _tree_extract(path), name
+
+    def test_tab_order_and_names(self, tmp_path):
+        path = tmp_path / "d.drawio"
+        path.write_text(STREAMING_CASES["tabs_objects_and_cells"])
+        elements = v.extract_archimate_elements(path)
+        assert [(e["tab"], e["name"]) for e in elements] == [
+            ("A", "Line Break"),
+            ("A", "Wrapped"),
+            ("unnamed", "Second tab"),
+        ]